@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.api.auth import get_current_user
 from app.db.session import SessionLocal
-from app.db.models.transcript import Transcript
 from app.db.models.meeting import Meeting
-from app.db.models.decision import Decision
-from app.db.models.action_item import ActionItem
-from app.db.models.risk import Risk
+from app.db.models.transcript import Transcript
+from app.db.models.extraction_job import ExtractionJob
 from app.db.models.user import User
-from app.workers.extract_from_transcript import process_transcript
 from app.services.openai_client import get_llm
-from app.services.email_notifier import send_meeting_summary, send_action_item_assigned
+from app.services.ai_extractor import get_cache_stats
+from app.services.extraction_queue import (
+    FINISHED_STATUSES,
+    cancel,
+    enqueue,
+    job_to_dict,
+)
 from app.api.schemas import ExtractRequest
 
 router = APIRouter(prefix="/extract", tags=["ai"])
@@ -24,86 +28,75 @@ def get_db():
         db.close()
 
 
-def send_post_extraction_notifications(db: Session, meeting_id: str):
-    """Send email notifications after extraction completes."""
+def _check_meeting_owner(db: Session, meeting_id: str, current_user: User) -> None:
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not meeting:
-        return
-
-    action_items = db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).all()
-
-    for item in action_items:
-        if item.owner_id:
-            owner = db.query(User).filter(User.id == item.owner_id).first()
-            if owner:
-                due_date_str = item.due_date.strftime("%Y-%m-%d") if item.due_date else None
-                send_action_item_assigned(
-                    to_email=owner.email,
-                    to_name=owner.name,
-                    action_description=item.description,
-                    meeting_title=meeting.title,
-                    due_date=due_date_str,
-                )
-
-
-def index_meeting_for_rag(db: Session, meeting_id: str):
-    """Index meeting transcript for RAG after extraction."""
-    try:
-        from app.services.rag import index_transcript
-
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if not meeting:
-            return
-
-        transcript = db.query(Transcript).filter(Transcript.meeting_id == meeting_id).first()
-        if not transcript:
-            return
-
-        index_transcript(
-            meeting_id=meeting.id,
-            transcript_text=transcript.content,
-            meeting_title=meeting.title,
-            meeting_date=str(meeting.created_at),
-        )
-        print(f"✅ Auto-indexed meeting for RAG: {meeting.title}")
-    except Exception as e:
-        print(f"⚠️ RAG indexing failed (non-fatal): {e}")
-
-
-# ...existing code...
-
-@router.post("/")
-def extract(payload: ExtractRequest, db: Session = Depends(get_db)):
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if meeting.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+
+def _get_job(db: Session, job_id: str, current_user: User) -> ExtractionJob:
+    job = db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    _check_meeting_owner(db, job.meeting_id, current_user)
+    return job
+
+
+@router.post("/", status_code=202)
+def extract(
+    payload: ExtractRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Queue an extraction; poll ``status_url`` for progress and stage timings."""
     transcript = db.query(Transcript).filter(Transcript.id == payload.transcript_id).first()
 
     if not transcript:
         raise HTTPException(status_code=404, detail="Transcript not found")
+    _check_meeting_owner(db, transcript.meeting_id, current_user)
 
     # get_llm() returns None when USE_OLLAMA=true
     try:
-        llm = get_llm()
+        get_llm()
     except Exception as e:
-        # If no OpenAI key and not using Ollama, fail
+        # If no OpenAI key and not using Ollama, fail now rather than in the worker
         raise HTTPException(status_code=503, detail=str(e))
 
-    try:
-        process_transcript(db, llm, transcript)
-
-        # ...existing code (notifications, RAG indexing)...
-        try:
-            send_post_extraction_notifications(db, transcript.meeting_id)
-        except Exception as notify_err:
-            print(f"⚠️ Notification error (non-fatal): {notify_err}")
-
-        try:
-            index_meeting_for_rag(db, transcript.meeting_id)
-        except Exception as rag_err:
-            print(f"⚠️ RAG indexing error (non-fatal): {rag_err}")
-
-    except Exception as e:
-        import traceback
-        tb = traceback.format_exc()
-        print("Error during extract:", tb)
-        raise HTTPException(status_code=500, detail=str(e))
-
-    return {"status": "extracted"}
\ No newline at end of file
+    job = enqueue(db, transcript, refresh=payload.refresh)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/extract/jobs/{job.id}",
+    }
+
+
+@router.get("/jobs/{job_id}")
+def extraction_job_status(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Status, current stage, error and per-stage timings (seconds) of a job."""
+    return job_to_dict(_get_job(db, job_id, current_user))
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_extraction_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Cancel a queued job, or stop a running one before it writes results."""
+    job = _get_job(db, job_id, current_user)
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    return job_to_dict(cancel(db, job))
+
+
+@router.get("/cache")
+def extraction_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss/eviction counters of the extraction result cache."""
+    stats = get_cache_stats()
+    return {"enabled": stats is not None, "stats": stats}
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 from app.db.models.user import User
 from app.api.auth import get_current_user
+from app.services import llm_client
 
 router = APIRouter(prefix="/live", tags=["live"])
 
@@ -55,25 +56,21 @@ async def live_assist(
 
 async def _call_llm(prompt: str) -> dict:
     if OPENAI_API_KEY:
-        import openai
-        client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
-        resp = await client.chat.completions.create(
+        text = await llm_client.openai_chat(
+            [{"role": "user", "content": prompt}],
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=400,
+            timeout=30.0,
         )
-        text = resp.choices[0].message.content.strip()
+        text = text.strip()
     elif USE_OLLAMA:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            r = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False},
-                timeout=30.0,
-            )
-            r.raise_for_status()
-            text = r.json().get("response", "")
+        text = await llm_client.ollama_generate(
+            prompt,
+            model=OLLAMA_MODEL,
+            base_url=OLLAMA_BASE_URL,
+            timeout=30.0,
+        )
     else:
         raise RuntimeError("No LLM configured")
 
@@ -1,23 +1,35 @@
 """RAG API endpoints for querying meeting history."""
 
+import json
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.models.user import User
+from app.api.auth import get_current_user
 from app.services.rag import (
-    index_all_transcripts,
+    start_background_index,
     index_transcript,
+    load_meeting_transcript,
+    mark_indexed,
+    clear_index_state,
     delete_meeting_chunks,
     clear_all_chunks,
-    query_rag,
-    search_chunks,
+    count_chunks,
+    answer_question,
+    stream_question,
     get_stats,
+    get_index_progress,
     health_check,
     is_rag_available,
     OLLAMA_MODEL,
 )
+from app.services.chunking import CHUNKERS
+from app.services.structured_query import route_question
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
@@ -29,7 +41,7 @@ router = APIRouter(prefix="/rag", tags=["rag"])
 class RAGQuery(BaseModel):
     query: str  # Frontend sends "query", not "question"
     top_k: Optional[int] = 5
-    meeting_id: Optional[int] = None
+    meeting_id: Optional[str] = None
     use_local_llm: Optional[bool] = True
 
 
@@ -44,13 +56,20 @@ class RAGResponse(BaseModel):
     answer: str
     sources: List[RAGSource] = []
     model: str = ""
+    timings: Optional[Dict[str, float]] = None  # per-stage latency in ms
+    cached: bool = False  # served from the semantic answer cache
+    route: str = "rag"  # "structured" when answered from the database
 
 
 class RAGIndexResponse(BaseModel):
     status: str
+    mode: Optional[str] = None
+    chunker: Optional[str] = None
     indexed_meetings: int
+    unchanged_meetings: Optional[int] = 0
     skipped_meetings: Optional[int] = 0
     failed_meetings: Optional[int] = 0
+    removed_meetings: Optional[int] = 0
     total_chunks: int
     total_meetings: int
     errors: Optional[List[str]] = None
@@ -62,129 +81,276 @@ class RAGStatsResponse(BaseModel):
     indexed: bool
 
 
+def _to_source(result: Dict[str, Any]) -> RAGSource:
+    """Map a search result to the source shape the frontend renders."""
+    meta = result.get("metadata", {})
+    return RAGSource(
+        meeting_title=meta.get("meeting_title", "Unknown Meeting"),
+        meeting_id=meta.get("meeting_id", ""),
+        excerpt=result.get("document", "")[:200],  # First 200 chars
+        score=result.get("similarity", 0.0),
+    )
+
+
+def _check_chunker(chunker: Optional[str]) -> None:
+    if chunker is not None and chunker not in CHUNKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown chunker '{chunker}'. Expected one of: {', '.join(CHUNKERS)}",
+        )
+
+
+def _get_owned_meeting(db: Session, meeting_id: str, current_user: User):
+    from app.db.models.meeting import Meeting
+
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if meeting.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return meeting
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
 
-@router.post("/index-all")
-def index_all(db: Session = Depends(get_db)):
-    """Index all meeting transcripts for RAG."""
-    try:
-        result = index_all_transcripts(db)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Indexing failed: {str(e)}")
+@router.post("/index-all", status_code=202)
+def index_all(
+    full: bool = False,
+    batch_size: Optional[int] = None,
+    chunker: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Start indexing the current user's new or changed meeting transcripts.
+
+    The run happens in the background; poll ``progress_url`` until
+    ``running`` is false, then read its ``result``. Pass ``?full=true`` to
+    re-index every meeting regardless of the watermark, ``?batch_size=N`` to
+    override the number of chunks per encode batch, and
+    ``?chunker=turns|words`` to pick the chunking strategy (meetings indexed
+    with another strategy are re-chunked).
+    """
+    _check_chunker(chunker)
+    if not is_rag_available():
+        raise HTTPException(status_code=503, detail="RAG is not available. Install sentence-transformers.")
+    started = start_background_index(
+        owner_id=current_user.id,
+        full=full,
+        batch_size=batch_size,
+        chunker=chunker,
+    )
+    if not started:
+        raise HTTPException(status_code=409, detail="Indexing is already running; try again when it finishes")
+    return {"status": "started", "progress_url": "/rag/index-all/progress"}
+
+
+@router.get("/index-all/progress")
+def index_all_progress(current_user: User = Depends(get_current_user)):
+    """Progress of the running (or last) bulk index in this worker.
+
+    Another user's run only shows whether it is still running.
+    """
+    progress = get_index_progress()
+    if progress.get("owner_id") not in (None, current_user.id):
+        return {"running": progress.get("running", False)}
+    return progress
 
 
 @router.post("/index/{meeting_id}")
-def index_meeting(meeting_id: int, db: Session = Depends(get_db)):
+def index_meeting(
+    meeting_id: str,
+    chunker: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """Index a specific meeting's transcript."""
-    from app.db.models.meeting import Meeting
+    _check_chunker(chunker)
 
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
+    meeting = _get_owned_meeting(db, meeting_id, current_user)
 
-    transcript = meeting.transcript or ""
-    if not transcript.strip():
+    transcript = load_meeting_transcript(db, meeting.id)
+    if not transcript:
         raise HTTPException(status_code=400, detail="Meeting has no transcript")
 
     try:
         count = index_transcript(
             meeting.id,
-            transcript,
+            transcript["text"],
             meeting_title=meeting.title or "",
+            meeting_date=str(meeting.created_at or ""),
+            owner_id=meeting.owner_id,
+            chunker=chunker,
         )
+        if count > 0:
+            mark_indexed(
+                db,
+                meeting.id,
+                transcript["text"],
+                count,
+                transcript_id=transcript["transcript_id"],
+                chunker=chunker,
+            )
         return {"meeting_id": meeting_id, "chunks_indexed": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Indexing failed: {str(e)}")
 
 
 @router.post("/query", response_model=RAGResponse)
-def rag_query(payload: RAGQuery):
-    """Query meeting history using RAG."""
+def rag_query(
+    payload: RAGQuery,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Query the current user's meeting history using RAG.
+
+    Status questions ("what's overdue?", "how many decisions last week?")
+    are answered straight from the database; everything else goes to RAG.
+    """
+    routed = route_question(db, payload.query, owner_id=current_user.id, meeting_id=payload.meeting_id)
+    if routed is not None:
+        return RAGResponse(
+            answer=routed["answer"],
+            sources=[_to_source(source) for source in routed["sources"]],
+            model="sql",
+            timings=routed["timings"],
+            route="structured",
+        )
+
     if not is_rag_available():
         raise HTTPException(
             status_code=503,
-            detail="RAG is not available. Install sentence-transformers and chromadb.",
+            detail="RAG is not available. Install sentence-transformers.",
         )
     try:
-        # 1. Search for relevant chunks
-        search_results = search_chunks(
+        # One retrieval feeds both the prompt and the sources
+        result = answer_question(
             payload.query,
             top_k=payload.top_k,
             meeting_id=payload.meeting_id,
+            owner_id=current_user.id,
         )
 
-        # 2. Build sources for the frontend
-        sources = []
-        for result in search_results:
-            meta = result.get("metadata", {})
-            sources.append(RAGSource(
-                meeting_title=meta.get("meeting_title", "Unknown Meeting"),
-                meeting_id=meta.get("meeting_id", ""),
-                excerpt=result.get("document", "")[:200],  # First 200 chars
-                score=result.get("similarity", 0.0),
-            ))
-
-        # 3. Generate answer
-        answer = query_rag(
-            payload.query,
-            top_k=payload.top_k,
-            meeting_id=payload.meeting_id,
-        )
+        # Build sources for the frontend
+        sources = [_to_source(source) for source in result["sources"]]
 
         return RAGResponse(
-            answer=answer,
+            answer=result["answer"],
             sources=sources,
             model=f"ollama/{OLLAMA_MODEL}",
+            timings=result["timings"],
+            cached=result["cached"],
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"RAG query failed: {str(e)}")
 
 
+@router.post("/query/stream")
+def rag_query_stream(
+    payload: RAGQuery,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Query meeting history using RAG, streaming the answer as Server-Sent Events.
+
+    Events: ``sources`` (sent right after retrieval), ``token`` (answer
+    fragments relayed from Ollama), ``done`` (per-stage timings) or ``error``.
+    Status questions answered from the database arrive as a single ``token``.
+    """
+    routed = route_question(db, payload.query, owner_id=current_user.id, meeting_id=payload.meeting_id)
+    if routed is None and not is_rag_available():
+        raise HTTPException(
+            status_code=503,
+            detail="RAG is not available. Install sentence-transformers.",
+        )
+
+    def _events():
+        if routed is not None:
+            yield {"event": "sources", "data": routed["sources"]}
+            yield {"event": "token", "data": routed["answer"]}
+            yield {"event": "done", "data": {"timings": routed["timings"], "cached": False, "route": "structured"}}
+            return
+        yield from stream_question(
+            payload.query,
+            top_k=payload.top_k,
+            meeting_id=payload.meeting_id,
+            owner_id=current_user.id,
+        )
+
+    def event_stream():
+        for event in _events():
+            data = event["data"]
+            if event["event"] == "sources":
+                data = [_to_source(r).model_dump() for r in data]
+            yield f"event: {event['event']}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/meeting/{meeting_id}")
-def delete_meeting_index(meeting_id: int):
+def delete_meeting_index(
+    meeting_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """Delete indexed chunks for a specific meeting."""
+    _get_owned_meeting(db, meeting_id, current_user)
     try:
         count = delete_meeting_chunks(meeting_id)
+        clear_index_state(db, meeting_id)
         return {"meeting_id": meeting_id, "chunks_deleted": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
 
 
 @router.delete("/clear")
-def clear_index():
-    """Clear all indexed chunks."""
+def clear_index(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Clear all of the current user's indexed chunks."""
     try:
-        count = clear_all_chunks()
+        count = clear_all_chunks(owner_id=current_user.id)
+        clear_index_state(db, owner_id=current_user.id)
         return {"chunks_deleted": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Clear failed: {str(e)}")
 
 
 @router.get("/stats")
-def rag_stats(db: Session = Depends(get_db)):
-    """Get RAG index statistics — returns format expected by frontend."""
+def rag_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's RAG index statistics — returns format expected by frontend."""
     from app.db.models.meeting import Meeting
 
     raw_stats = get_stats()
     total_meetings = 0
     try:
-        total_meetings = db.query(Meeting).count()
+        total_meetings = db.query(Meeting).filter(Meeting.owner_id == current_user.id).count()
     except Exception:
         pass
 
-    total_chunks = raw_stats.get("total_chunks", 0)
+    try:
+        total_chunks = count_chunks(owner_id=current_user.id)
+    except Exception:
+        total_chunks = 0
 
     return {
         "total_chunks": total_chunks,
         "total_meetings": total_meetings,
         "indexed": total_chunks > 0,
+        "embedding_cache": raw_stats.get("embedding_cache"),
+        "answer_cache": raw_stats.get("answer_cache"),
     }
 
 
 @router.get("/health")
-def rag_health():
+def rag_health(current_user: User = Depends(get_current_user)):
     """Check health of RAG components."""
     return health_check()
\ No newline at end of file
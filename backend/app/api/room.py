@@ -110,19 +110,16 @@ def end_room(
     db.commit()
     db.refresh(t)
 
-    # Run AI extraction + RAG indexing asynchronously (non-blocking best-effort)
+    # Queue AI extraction + RAG indexing (non-blocking best-effort)
+    job_id = None
     try:
-        from app.services.openai_client import get_llm
-        from app.workers.extract_from_transcript import process_transcript
-        from app.api.extract import index_meeting_for_rag
+        from app.services.extraction_queue import enqueue
 
-        llm = get_llm()
-        process_transcript(db, llm, t)
-        index_meeting_for_rag(db, meeting.id)
+        job_id = enqueue(db, t).id
     except Exception as e:
-        print(f"⚠️ Extraction failed (non-fatal): {e}")
+        print(f"⚠️ Failed to queue extraction (non-fatal): {e}")
 
-    return {"meeting_id": meeting.id, "status": "saved"}
+    return {"meeting_id": meeting.id, "status": "saved", "extraction_job_id": job_id}
 
 
 @ws_router.websocket("/ws/room/{room_id}")
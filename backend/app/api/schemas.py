@@ -2,3 +2,4 @@ from pydantic import BaseModel
 
 class ExtractRequest(BaseModel):
     transcript_id: str
+    refresh: bool = False  # bypass the extraction cache
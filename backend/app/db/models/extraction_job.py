@@ -0,0 +1,25 @@
+import uuid
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+class ExtractionJob(Base):
+    """A queued extraction run (process_transcript, then notify + RAG index)."""
+    __tablename__ = "extraction_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    transcript_id = Column(String(36), ForeignKey("transcripts.id", ondelete="CASCADE"), nullable=False, index=True)
+    meeting_id = Column(String(36), ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued | running | succeeded | failed | cancelled
+    stage = Column(String(20), nullable=True)  # current / last stage
+    refresh = Column(Boolean, default=False)  # bypass the extraction cache
+    cancel_requested = Column(Boolean, default=False)
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+    timings = Column(Text, nullable=True)  # JSON {stage: seconds}
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
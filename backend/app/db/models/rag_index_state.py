@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+class RagIndexState(Base):
+    """Watermark of what was last indexed into the RAG store for a meeting."""
+    __tablename__ = "rag_index_state"
+
+    meeting_id = Column(String(36), ForeignKey("meetings.id", ondelete="CASCADE"), primary_key=True)
+    transcript_id = Column(String(36), nullable=True)
+    content_hash = Column(String(64), nullable=False)
+    chunk_count = Column(Integer, default=0)
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -14,6 +14,8 @@ from app.db.models.alert import Alert  # noqa
 from app.db.models.risk import Risk  # noqa
 from app.db.models.colleague import Colleague  # noqa
 from app.db.models.message import Message  # noqa
+from app.db.models.rag_index_state import RagIndexState  # noqa
+from app.db.models.extraction_job import ExtractionJob  # noqa
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./data/ledger.db")
 
@@ -86,6 +86,31 @@ app.include_router(room_router)
 app.include_router(room_ws_router)
 
 
+@app.on_event("startup")
+async def warm_up_rag():
+    """Load the embedding model in the background so startup isn't blocked."""
+    if os.getenv("RAG_WARMUP", "true").lower() != "true":
+        return
+    import threading
+    from app.services.rag import warm_up
+    threading.Thread(target=warm_up, name="rag-warmup", daemon=True).start()
+
+
+@app.on_event("startup")
+async def start_extraction_worker():
+    """Run queued extractions in this process unless EXTRACTION_INLINE_WORKER=false."""
+    from app.workers.extraction_worker import start_inline_worker
+    start_inline_worker()
+
+
+@app.on_event("startup")
+async def migrate_rag_embeddings():
+    """Re-embed the RAG index in the background after RAG_EMBEDDING_MODEL changes."""
+    from app.services.rag import RAG_AUTO_MIGRATE, start_background_migration
+    if RAG_AUTO_MIGRATE:
+        start_background_migration()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Ledger API"}
@@ -1,7 +1,15 @@
 import json
 import os
+import re
 import httpx
+import hashlib
 import logging
+import difflib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.services import llm_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -9,6 +17,27 @@ logger = logging.getLogger(__name__)
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 USE_OLLAMA = os.getenv("USE_OLLAMA", "false").lower() == "true"
+OPENAI_EXTRACT_MODEL = "gpt-4o-mini"
+
+# Chunked (map-reduce) extraction for long transcripts: windows of
+# EXTRACT_CHUNK_CHARS with EXTRACT_CHUNK_OVERLAP characters of overlap are
+# extracted concurrently (at most EXTRACT_MAX_PARALLEL at a time), then
+# merged; items whose text is at least EXTRACT_DEDUPE_THRESHOLD similar are
+# treated as duplicates. Shorter transcripts still go in a single prompt.
+EXTRACT_CHUNK_CHARS = int(os.getenv("EXTRACT_CHUNK_CHARS", "12000"))
+EXTRACT_CHUNK_OVERLAP = int(os.getenv("EXTRACT_CHUNK_OVERLAP", "1000"))
+EXTRACT_MAX_PARALLEL = int(os.getenv("EXTRACT_MAX_PARALLEL", "4"))
+EXTRACT_DEDUPE_THRESHOLD = float(os.getenv("EXTRACT_DEDUPE_THRESHOLD", "0.85"))
+
+# Persistent result cache (app/services/extraction_cache.py), keyed by
+# transcript hash, provider/model and prompt version
+EXTRACT_CACHE = os.getenv("EXTRACT_CACHE", "true").lower() == "true"
+EXTRACT_CACHE_PATH = os.getenv(
+    "EXTRACT_CACHE_PATH",
+    os.path.join(os.getenv("CHROMA_PERSIST_DIR", "./chroma_db"), "extraction_cache.sqlite3"),
+)
+EXTRACT_CACHE_SIZE = int(os.getenv("EXTRACT_CACHE_SIZE", "5000"))
+EXTRACT_CACHE_TTL = float(os.getenv("EXTRACT_CACHE_TTL", str(30 * 86400)))
 
 SYSTEM_PROMPT = """
 You are an assistant that extracts structured information from meeting transcripts.
@@ -53,6 +82,13 @@ Rules for owner:
 IMPORTANT: Return ONLY valid JSON, no other text.
 """
 
+class ExtractionFailed(Exception):
+    """Every LLM call of an extraction failed; there is nothing to save."""
+
+
+# Changes whenever SYSTEM_PROMPT is edited, invalidating cached extractions
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
 
 def extract_with_ollama(transcript_text: str, model: str = None) -> dict:
     """Extract decisions, action items, and risks using local Ollama model."""
@@ -72,45 +108,40 @@ Extract decisions, action items, and risks from the transcript above. Return ONL
         logger.info(f"🦙 Sending transcript to Ollama ({model})...")
         logger.info(f"Transcript preview: {transcript_text[:200]}...")
 
-        with httpx.Client(timeout=120) as client:
-            response = client.post(
-                f"{OLLAMA_URL}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json",
-                },
-            )
-            response.raise_for_status()
-            result = response.json()["response"]
-            logger.info(f"Ollama raw response: {result[:300]}...")
-
-            # Parse JSON from response
-            start = result.find("{")
-            end = result.rfind("}") + 1
-            if start != -1 and end > start:
-                json_str = result[start:end]
-                parsed = json.loads(json_str)
-            else:
-                parsed = json.loads(result)
-
-            # Validate structure
-            if not isinstance(parsed, dict):
-                logger.error("Ollama returned non-dict response")
-                return None
-
-            # Ensure all required keys exist
-            parsed.setdefault("decisions", [])
-            parsed.setdefault("action_items", [])
-            parsed.setdefault("risks", [])
-
-            logger.info(
-                f"✅ Ollama extracted: {len(parsed['decisions'])} decisions, "
-                f"{len(parsed['action_items'])} action items, "
-                f"{len(parsed['risks'])} risks"
-            )
-            return parsed
+        result = llm_client.ollama_generate_sync(
+            prompt,
+            model=model,
+            base_url=OLLAMA_URL,
+            timeout=120,
+            format="json",
+        )
+        logger.info(f"Ollama raw response: {result[:300]}...")
+
+        # Parse JSON from response
+        start = result.find("{")
+        end = result.rfind("}") + 1
+        if start != -1 and end > start:
+            json_str = result[start:end]
+            parsed = json.loads(json_str)
+        else:
+            parsed = json.loads(result)
+
+        # Validate structure
+        if not isinstance(parsed, dict):
+            logger.error("Ollama returned non-dict response")
+            return None
+
+        # Ensure all required keys exist
+        parsed.setdefault("decisions", [])
+        parsed.setdefault("action_items", [])
+        parsed.setdefault("risks", [])
+
+        logger.info(
+            f"✅ Ollama extracted: {len(parsed['decisions'])} decisions, "
+            f"{len(parsed['action_items'])} action items, "
+            f"{len(parsed['risks'])} risks"
+        )
+        return parsed
 
     except httpx.ConnectError:
         logger.error("❌ Cannot connect to Ollama. Is it running? Run: ollama serve")
@@ -123,21 +154,20 @@ Extract decisions, action items, and risks from the transcript above. Return ONL
         return None
 
 
-def extract_with_openai(llm, transcript_text: str) -> dict:
-    """Extract using OpenAI API."""
+def extract_with_openai(transcript_text: str) -> dict:
+    """Extract using OpenAI API, through the pooled llm_client layer."""
     from openai import OpenAIError
 
     try:
         logger.info("🤖 Sending transcript to OpenAI for extraction...")
-        response = llm.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        content = llm_client.openai_chat_sync(
+            [
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": transcript_text},
             ],
+            model=OPENAI_EXTRACT_MODEL,
             temperature=0,
         )
-        content = response.choices[0].message.content
         logger.info(f"OpenAI response: {content[:200]}...")
         parsed = json.loads(content)
         parsed.setdefault("decisions", [])
@@ -150,37 +180,276 @@ def extract_with_openai(llm, transcript_text: str) -> dict:
         return None
 
 
-def extract_decisions_and_actions(llm, transcript_text: str) -> dict:
+def _extract_single(llm, transcript_text: str) -> Optional[dict]:
+    """One prompt: Ollama only with USE_OLLAMA, else OpenAI with Ollama fallback."""
+    # If USE_OLLAMA is set, skip OpenAI entirely
+    if USE_OLLAMA:
+        logger.info("🦙 USE_OLLAMA=true, using Ollama directly")
+        return extract_with_ollama(transcript_text)
+
+    # Otherwise try OpenAI first, then Ollama fallback
+    if llm is not None:
+        result = extract_with_openai(transcript_text)
+        if result:
+            return result
+        logger.info("🔄 OpenAI failed, trying Ollama fallback...")
+
+    return extract_with_ollama(transcript_text)
+
+
+# ============================================================================
+# Chunked (map-reduce) extraction
+# ============================================================================
+
+def split_transcript(text: str, max_chars: int = None, overlap: int = None) -> List[str]:
+    """Split a transcript into overlapping windows on line boundaries.
+
+    Each window holds whole lines (speaker turns) up to ``max_chars`` and
+    starts with the last ``overlap`` characters' worth of lines of the
+    previous one, so a decision discussed across a boundary is seen whole
+    by at least one window. A single line longer than a window is cut at
+    word boundaries.
+    """
+    max_chars = max_chars or EXTRACT_CHUNK_CHARS
+    overlap = EXTRACT_CHUNK_OVERLAP if overlap is None else overlap
+    overlap = min(overlap, max_chars // 2)
+
+    lines = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+        lines.append(line)
+
+    windows: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        if current and size + len(line) + 1 > max_chars:
+            windows.append("\n".join(current))
+            # Carry the tail of this window into the next one
+            carried, carried_size = [], 0
+            for previous in reversed(current):
+                if carried_size + len(previous) + 1 > overlap:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 1
+            current, size = carried, carried_size
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        windows.append("\n".join(current))
+    return windows
+
+
+def _normalize(text) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", str(text or "").lower())).strip()
+
+
+def _item_text(item: dict) -> str:
+    return item.get("summary") or item.get("description") or item.get("text") or ""
+
+
+def merge_extractions(results: List[dict]) -> dict:
+    """Merge per-window results into one, dropping near-duplicate items.
+
+    Two items of the same kind are duplicates when their normalized text is
+    at least EXTRACT_DEDUPE_THRESHOLD similar. The more confident one is
+    kept, and an owner, due date or source sentence missing from it is
+    taken from the other.
+    """
+    merged = {"decisions": [], "action_items": [], "risks": []}
+    keys = {kind: [] for kind in merged}
+
+    for result in results:
+        for kind in merged:
+            for item in result.get(kind) or []:
+                if not isinstance(item, dict):
+                    item = {"summary" if kind == "decisions" else "description": str(item)}
+                key = _normalize(_item_text(item))
+                if not key:
+                    continue
+                match = None
+                for i, existing in enumerate(keys[kind]):
+                    if key == existing or difflib.SequenceMatcher(None, key, existing).ratio() >= EXTRACT_DEDUPE_THRESHOLD:
+                        match = i
+                        break
+                if match is None:
+                    merged[kind].append(dict(item))
+                    keys[kind].append(key)
+                    continue
+
+                kept = merged[kind][match]
+                if (item.get("confidence") or 0) > (kept.get("confidence") or 0):
+                    kept, item = dict(item), kept
+                    merged[kind][match] = kept
+                    keys[kind][match] = key
+                for field in ("owner", "due_date", "source_sentence"):
+                    if not kept.get(field) and item.get(field):
+                        kept[field] = item[field]
+    return merged
+
+
+def extract_chunked(llm, transcript_text: str) -> Tuple[Optional[dict], bool]:
+    """Map-reduce extraction for transcripts too long for one prompt.
+
+    Windows are extracted concurrently (EXTRACT_MAX_PARALLEL at a time, and
+    within the llm_client per-provider limits), so latency follows the
+    slowest window rather than the transcript length. A failed window is
+    logged and skipped.
+
+    Returns (merged result, complete): the result is None only if every
+    window failed, and ``complete`` is False whenever any window did —
+    the merge then misses that window's items.
     """
-    Main extraction function.
+    windows = split_transcript(transcript_text)
+    total = len(windows)
+    logger.info(f"🧩 Chunked extraction: {total} windows, up to {EXTRACT_MAX_PARALLEL} in parallel")
+
+    def extract_window(indexed) -> Optional[dict]:
+        i, window = indexed
+        return _extract_single(llm, f"[Part {i} of {total} of a longer meeting transcript]\n{window}")
+
+    with ThreadPoolExecutor(max_workers=max(min(EXTRACT_MAX_PARALLEL, total), 1)) as pool:
+        results = list(pool.map(extract_window, enumerate(windows, start=1)))
+
+    succeeded = [r for r in results if r]
+    if not succeeded:
+        return None, False
+    if len(succeeded) < total:
+        logger.warning(f"⚠️ {total - len(succeeded)} of {total} windows failed; merging the rest")
+
+    merged = merge_extractions(succeeded)
+    logger.info(
+        f"✅ Merged {total} windows: {len(merged['decisions'])} decisions, "
+        f"{len(merged['action_items'])} action items, {len(merged['risks'])} risks"
+    )
+    return merged, len(succeeded) == total
+
+
+# ============================================================================
+# Result cache
+# ============================================================================
+
+_cache = None
+_cache_lock = threading.Lock()
+_cache_failed = False
+
+
+def _get_cache():
+    """The shared ExtractionCache, opened on first use; None if disabled."""
+    global _cache, _cache_failed
+    if not EXTRACT_CACHE or _cache_failed:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                from app.services.extraction_cache import ExtractionCache
+                _cache = ExtractionCache(EXTRACT_CACHE_PATH, EXTRACT_CACHE_SIZE, EXTRACT_CACHE_TTL)
+            except Exception as e:
+                _cache_failed = True
+                logger.error(f"⚠️ Failed to open extraction cache, continuing without it: {e}")
+    return _cache
+
+
+def _cache_key(llm, transcript_text: str) -> Tuple[str, str, str, str]:
+    """(content hash, provider chain, model(s), prompt version) for a transcript."""
+    content_hash = hashlib.sha256(transcript_text.encode("utf-8")).hexdigest()
+    if USE_OLLAMA or llm is None:
+        provider, model = "ollama", OLLAMA_MODEL
+    else:
+        provider, model = "openai+ollama", f"{OPENAI_EXTRACT_MODEL}+{OLLAMA_MODEL}"
+    version = PROMPT_VERSION
+    if len(transcript_text) > EXTRACT_CHUNK_CHARS:
+        version += f":w{EXTRACT_CHUNK_CHARS}-{EXTRACT_CHUNK_OVERLAP}-{EXTRACT_DEDUPE_THRESHOLD}"
+    return content_hash, provider, model, version
+
+
+def get_cache_stats() -> Optional[dict]:
+    """Extraction cache counters, or None when the cache is disabled."""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.stats()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def extract_with_status(
+    llm,
+    transcript_text: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+) -> Tuple[Optional[dict], bool]:
+    """Extract decisions, action items and risks; returns (result, complete).
+
     - If USE_OLLAMA=true, use Ollama directly (skip OpenAI).
     - Otherwise, try OpenAI first, then Ollama fallback.
+    - Transcripts longer than EXTRACT_CHUNK_CHARS are split into windows
+      that are extracted in parallel and merged (extract_chunked).
+    - Results are cached (EXTRACT_CACHE); ``refresh=True`` skips the lookup
+      but stores the new result, ``use_cache=False`` bypasses the cache.
+      Failed or partial extractions are never cached.
+
+    The result is None when every LLM call failed, and ``complete`` is
+    False when it is None or some windows of a chunked run failed. Callers
+    that write results over earlier ones must check both.
     """
     if not transcript_text or not transcript_text.strip():
         logger.warning("Empty transcript provided, returning empty results")
-        return {"decisions": [], "action_items": [], "risks": []}
+        return {"decisions": [], "action_items": [], "risks": []}, True
+
+    cache = _get_cache() if use_cache else None
+    key = _cache_key(llm, transcript_text) if cache is not None else None
+    if cache is not None:
+        if refresh:
+            cache.record_bypass()
+        else:
+            try:
+                cached = cache.get(*key)
+            except Exception as e:
+                logger.error(f"Extraction cache lookup failed: {e}")
+                cached = None
+            if cached is not None:
+                logger.info(f"⚡ Extraction cache hit ({len(transcript_text)} chars, {key[1]})")
+                return cached, True
 
     logger.info(f"📝 Extracting from transcript ({len(transcript_text)} chars)...")
 
-    # If USE_OLLAMA is set, skip OpenAI entirely
-    if USE_OLLAMA:
-        logger.info("🦙 USE_OLLAMA=true, using Ollama directly")
-        result = extract_with_ollama(transcript_text)
-        if result:
-            return result
-        logger.error("❌ Ollama extraction failed, returning empty results")
-        return {"decisions": [], "action_items": [], "risks": []}
+    if len(transcript_text) > EXTRACT_CHUNK_CHARS:
+        result, complete = extract_chunked(llm, transcript_text)
+    else:
+        result = _extract_single(llm, transcript_text)
+        complete = bool(result)
+    if not result:
+        logger.error("❌ All extraction methods failed")
+        return None, False
 
-    # Otherwise try OpenAI first, then Ollama fallback
-    if llm is not None:
-        result = extract_with_openai(llm, transcript_text)
-        if result:
-            return result
-        logger.info("🔄 OpenAI failed, trying Ollama fallback...")
+    if cache is not None and complete:
+        try:
+            cache.put(*key, result)
+        except Exception as e:
+            logger.error(f"Extraction cache write failed: {e}")
+    return result, complete
 
-    result = extract_with_ollama(transcript_text)
-    if result:
-        return result
 
-    logger.error("❌ All extraction methods failed, returning empty results")
-    return {"decisions": [], "action_items": [], "risks": []}
\ No newline at end of file
+def extract_decisions_and_actions(
+    llm,
+    transcript_text: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+) -> dict:
+    """
+    Main extraction function (see extract_with_status).
+    Returns empty results when every extraction method failed.
+    """
+    result, _ = extract_with_status(llm, transcript_text, use_cache=use_cache, refresh=refresh)
+    if result is None:
+        logger.error("❌ All extraction methods failed, returning empty results")
+        return {"decisions": [], "action_items": [], "risks": []}
+    return result
@@ -0,0 +1,117 @@
+"""Semantic answer cache for Ask-AI.
+
+Stores generated answers keyed by (a) the set of retrieved chunks and
+(b) the question embedding. A new question hits the cache when it retrieves
+exactly the same chunks *and* its embedding is close enough to a cached
+question — "what did we decide about pricing?" and "what was decided on
+pricing?" then share one Ollama generation.
+
+Chunk keys include each chunk's ``indexed_at`` so any re-index changes the
+key, even when it happened in another worker. Entries are additionally
+dropped explicitly when one of their meetings is re-indexed or deleted.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+
+def _normalize(vector: List[float]) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else arr
+
+
+class AnswerCache:
+    """Bounded LRU + TTL cache of answers, matched by embedding similarity."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._by_key: Dict[Hashable, List[int]] = {}
+        self._next_id = 0
+
+    def lookup(self, embedding: List[float], key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``key`` whose question is most similar, if any."""
+        query = _normalize(embedding)
+        now = time.monotonic()
+        with self._lock:
+            best_id, best_score = None, self.threshold
+            for entry_id in list(self._by_key.get(key, [])):
+                entry = self._entries[entry_id]
+                if now - entry["created"] > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                score = float(entry["embedding"] @ query)
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_id)
+            entry = self._entries[best_id]
+            return {"answer": entry["answer"], "similarity": best_score}
+
+    def put(self, embedding: List[float], key: Hashable, meeting_ids: Iterable[str], answer: str) -> None:
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "embedding": _normalize(embedding),
+                "key": key,
+                "meeting_ids": frozenset(str(m) for m in meeting_ids),
+                "answer": answer,
+                "created": time.monotonic(),
+            }
+            self._by_key.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_meetings(self, meeting_ids: Iterable[str]) -> int:
+        """Drop every entry whose answer drew on one of these meetings."""
+        targets: FrozenSet[str] = frozenset(str(m) for m in meeting_ids)
+        with self._lock:
+            stale = [i for i, e in self._entries.items() if e["meeting_ids"] & targets]
+            for entry_id in stale:
+                self._remove(entry_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_key.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        ids = self._by_key.get(entry["key"])
+        if ids is not None:
+            ids.remove(entry_id)
+            if not ids:
+                del self._by_key[entry["key"]]
@@ -0,0 +1,173 @@
+"""Transcript chunkers for RAG indexing.
+
+Two strategies, selected per index (``RAG_CHUNKER`` or ``?chunker=`` on
+``/rag/index-all``):
+
+- ``words`` — the original fixed 500-word windows with 50-word overlap
+- ``turns`` — splits on speaker turns (``Alice: ...``, ``[MM:SS] Alice: ...``
+  as produced by ``format_transcript_with_timestamps``) and sentences, and
+  packs them into chunks sized in embedding-model tokens. Turns are never
+  cut mid-sentence, and a chunk that continues a turn repeats its
+  ``[MM:SS] Speaker:`` header so every chunk stands on its own.
+
+The MiniLM encoder truncates input at 256 tokens, so 500-word chunks lose
+most of their text at embedding time; token-sized chunks use the whole
+window without wasting it.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional
+
+CHUNKERS = ("words", "turns")
+
+# Speaker labels are 1-4 capitalised words ("Alice", "Bob Smith", "Speaker 2"),
+# so a sentence like "We agreed on: X" isn't mistaken for one
+_TURN_RE = re.compile(
+    r"^\s*(?:\[(?P<ts>\d{1,2}:\d{2}(?::\d{2})?)\]\s*)?"
+    r"(?:(?P<speaker>[A-Z][\w.'\-]*(?: [A-Z0-9][\w.'\-]*){0,3})\s*:\s+)?"
+    r"(?P<text>.*)$"
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def chunk_words(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
+    """Split text into overlapping chunks by word count."""
+    words = text.split()
+    if not words:
+        return []
+
+    chunks = []
+    step = max(chunk_size - overlap, 1)
+    for i in range(0, len(words), step):
+        chunk = " ".join(words[i : i + chunk_size])
+        if chunk.strip():
+            chunks.append(chunk.strip())
+    return chunks
+
+
+def parse_turns(text: str) -> List[Dict[str, Optional[str]]]:
+    """Group transcript lines into speaker turns.
+
+    A line starting with a ``[MM:SS]`` timestamp or a ``Speaker:`` label
+    opens a new turn; other lines continue the current one. A timestamp
+    without a label keeps the previous speaker.
+
+    Returns:
+        List of {"timestamp", "speaker", "text"} dicts
+    """
+    turns: List[Dict[str, Optional[str]]] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = _TURN_RE.match(line)
+        timestamp, speaker, body = match.group("ts"), match.group("speaker"), match.group("text").strip()
+        if (timestamp or speaker) or not turns:
+            if speaker is None and timestamp and turns:
+                speaker = turns[-1]["speaker"]
+            turns.append({"timestamp": timestamp, "speaker": speaker, "text": body})
+        else:
+            turns[-1]["text"] = f"{turns[-1]['text']} {body}".strip()
+    return [t for t in turns if t["text"]]
+
+
+def _header(turn: Dict[str, Optional[str]]) -> str:
+    parts = []
+    if turn["timestamp"]:
+        parts.append(f"[{turn['timestamp']}]")
+    if turn["speaker"]:
+        parts.append(f"{turn['speaker']}:")
+    return " ".join(parts)
+
+
+def _split_long(sentence: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Split a sentence that alone exceeds the budget into word windows."""
+    words = sentence.split()
+    pieces, current = [], []
+    for word in words:
+        if current and count_tokens(" ".join(current + [word])) > max_tokens:
+            pieces.append(" ".join(current))
+            current = []
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_turns(
+    text: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+) -> List[Dict[str, object]]:
+    """Pack speaker turns and sentences into chunks of at most ``max_tokens``.
+
+    Returns:
+        List of {"text", "start", "speakers"} dicts, where ``start`` is the
+        first timestamp in the chunk (or "") and ``speakers`` the distinct
+        speaker labels in order of appearance
+    """
+    chunks: List[Dict[str, object]] = []
+    lines: List[str] = []
+    speakers: List[str] = []
+    start = ""
+    used = 0
+
+    def flush() -> None:
+        nonlocal lines, speakers, start, used
+        if lines:
+            chunks.append({"text": "\n".join(lines), "start": start, "speakers": list(speakers)})
+        lines, speakers, start, used = [], [], "", 0
+
+    for turn in parse_turns(text):
+        header = _header(turn)
+        header_tokens = count_tokens(header) if header else 0
+        budget = max(max_tokens - header_tokens, 1)
+
+        sentences = []
+        for sentence in _SENTENCE_RE.split(turn["text"]):
+            if not sentence.strip():
+                continue
+            if count_tokens(sentence) > budget:
+                sentences.extend(_split_long(sentence, budget, count_tokens))
+            else:
+                sentences.append(sentence.strip())
+
+        current: List[str] = []
+        for sentence in sentences:
+            cost = count_tokens(" ".join(current + [sentence])) + header_tokens
+            if used + cost > max_tokens and (lines or current):
+                if current:
+                    lines.append(f"{header} {' '.join(current)}".strip())
+                flush()
+                current = []
+            current.append(sentence)
+            if not start and turn["timestamp"]:
+                start = turn["timestamp"]
+            if turn["speaker"] and turn["speaker"] not in speakers:
+                speakers.append(turn["speaker"])
+        if current:
+            line = f"{header} {' '.join(current)}".strip()
+            lines.append(line)
+            used += count_tokens(line)
+    flush()
+    return chunks
+
+
+def chunk_transcript(
+    text: str,
+    strategy: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+    chunk_size: int = 500,
+    overlap: int = 50,
+) -> List[Dict[str, object]]:
+    """Chunk a transcript with the named strategy.
+
+    Returns:
+        List of {"text", "start", "speakers"} dicts (``start``/``speakers``
+        are empty for the ``words`` strategy)
+    """
+    if strategy == "words":
+        return [{"text": c, "start": "", "speakers": []} for c in chunk_words(text, chunk_size, overlap)]
+    if strategy == "turns":
+        return chunk_turns(text, max_tokens, count_tokens)
+    raise ValueError(f"Unknown chunker {strategy!r}; expected one of {', '.join(CHUNKERS)}")
@@ -0,0 +1,175 @@
+"""Lazily loaded sentence-transformers model.
+
+Importing this module is cheap: the model is only loaded on first use or by
+an explicit ``warm_up()``. The module has no other side effects (no DB,
+vector store or sockets), so the gunicorn master can load the model before
+forking (see ``gunicorn.conf.py``) and every worker shares its weights
+copy-on-write instead of holding a private copy.
+
+Models come from the ``MODELS`` registry, which records each model's output
+dimension and input limit. ``RAG_EMBEDDING_MODEL`` picks the model new
+collections are built with. Several models can be loaded side by side, so
+queries keep using the active collection's model while a migration
+re-embeds the corpus with a new one.
+"""
+
+import gc
+import os
+import re
+import time
+import logging
+import threading
+import importlib.util
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# name → sentence-transformers path, output dimension, input limit in
+# tokens, and optional dynamic int8 quantization of the Linear layers
+MODELS: Dict[str, Dict[str, Any]] = {
+    "all-MiniLM-L6-v2": {"path": "all-MiniLM-L6-v2", "dim": 384, "max_seq_tokens": 256},
+    "all-MiniLM-L6-v2-int8": {"path": "all-MiniLM-L6-v2", "dim": 384, "max_seq_tokens": 256, "quantize": "int8"},
+    "paraphrase-MiniLM-L3-v2": {"path": "paraphrase-MiniLM-L3-v2", "dim": 384, "max_seq_tokens": 128},
+    "all-MiniLM-L12-v2": {"path": "all-MiniLM-L12-v2", "dim": 384, "max_seq_tokens": 256},
+    "bge-small-en-v1.5": {"path": "BAAI/bge-small-en-v1.5", "dim": 384, "max_seq_tokens": 512},
+    "all-mpnet-base-v2": {"path": "all-mpnet-base-v2", "dim": 768, "max_seq_tokens": 384},
+}
+# Every index built before the registry existed used this model
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+MODEL_NAME = os.getenv("RAG_EMBEDDING_MODEL", DEFAULT_MODEL)
+if MODEL_NAME not in MODELS:
+    logger.error(f"⚠️ Unknown RAG_EMBEDDING_MODEL {MODEL_NAME!r}; using {DEFAULT_MODEL}")
+    MODEL_NAME = DEFAULT_MODEL
+EMBEDDING_DIM = MODELS[MODEL_NAME]["dim"]
+MAX_SEQ_TOKENS = MODELS[MODEL_NAME]["max_seq_tokens"]
+
+_models: Dict[str, Any] = {}
+_load_errors: Dict[str, str] = {}
+_load_seconds: Dict[str, float] = {}
+_loaded_in_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def model_info(name: Optional[str] = None) -> Dict[str, Any]:
+    """Registry entry for a model (default: RAG_EMBEDDING_MODEL)."""
+    name = name or MODEL_NAME
+    if name not in MODELS:
+        raise ValueError(f"Unknown embedding model {name!r}; expected one of {', '.join(MODELS)}")
+    return {"name": name, **MODELS[name]}
+
+
+def _quantize(model):
+    """Dynamic int8 quantization of the Linear layers (CPU inference)."""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def is_installed() -> bool:
+    """Whether sentence-transformers can be imported (without importing it)."""
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+
+def is_available(name: Optional[str] = None) -> bool:
+    """True if the model is loaded or can still be loaded."""
+    name = name or MODEL_NAME
+    return name in _models or (name not in _load_errors and is_installed())
+
+
+def get_model(name: Optional[str] = None):
+    """Return the named model (default RAG_EMBEDDING_MODEL), loading it on first call.
+
+    None if unavailable.
+    """
+    global _loaded_in_pid
+    name = name or MODEL_NAME
+    if name in _models or name in _load_errors:
+        return _models.get(name)
+    with _lock:
+        if name in _models or name in _load_errors:
+            return _models.get(name)
+        started = time.perf_counter()
+        try:
+            info = model_info(name)
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(info["path"])
+            if info.get("quantize") == "int8":
+                model = _quantize(model)
+            _models[name] = model
+            _load_seconds[name] = time.perf_counter() - started
+            _loaded_in_pid = os.getpid()
+            logger.info(f"✅ Loaded local embedding model: {name} ({_load_seconds[name]:.1f}s)")
+        except ImportError:
+            _load_errors[name] = "sentence-transformers not installed"
+            logger.warning("⚠️ sentence-transformers not installed. RAG will be disabled.")
+        except Exception as e:
+            _load_errors[name] = str(e)
+            logger.error(f"⚠️ Failed to load embedding model {name}: {e}")
+    return _models.get(name)
+
+
+def warm_up(encode: bool = True, name: Optional[str] = None) -> bool:
+    """Load the model ahead of the first request.
+
+    Args:
+        encode: Also run one tiny encode so lazy kernels are initialised.
+            Pass False when pre-loading in a process that will fork.
+
+        name: Model to load (default RAG_EMBEDDING_MODEL)
+
+    Returns:
+        True if the model is ready
+    """
+    model = get_model(name)
+    if model is None:
+        return False
+    if encode:
+        try:
+            model.encode(["warm up"])
+        except Exception as e:
+            logger.error(f"Embedding warm-up encode failed: {e}")
+    return True
+
+
+def preload_for_fork() -> bool:
+    """Load the model in a parent process that is about to fork workers.
+
+    Skips the warm-up encode (thread pools started before fork don't carry
+    over) and freezes the GC so collections in the children don't touch —
+    and therefore copy — the shared model pages.
+    """
+    ready = warm_up(encode=False)
+    gc.collect()
+    gc.freeze()
+    return ready
+
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str, name: Optional[str] = None) -> int:
+    """Number of model tokens in ``text`` (without [CLS]/[SEP]).
+
+    Uses the model's own tokenizer when the model is loaded in this process;
+    otherwise (e.g. workers using the embedding server) a WordPiece-style
+    estimate: one token per punctuation mark and per ~6 characters of a word.
+    """
+    model = _models.get(name or MODEL_NAME)
+    if model is not None:
+        try:
+            return len(model.tokenizer(text, add_special_tokens=False)["input_ids"])
+        except Exception:
+            pass
+    return sum(1 + (len(w) - 1) // 6 for w in _WORD_RE.findall(text))
+
+
+def status() -> dict:
+    """Load state, timing and whether the weights were inherited from a parent."""
+    return {
+        "model": MODEL_NAME,
+        "loaded": MODEL_NAME in _models,
+        "load_seconds": round(_load_seconds.get(MODEL_NAME, 0.0), 2),
+        "shared_from_parent": bool(_models) and _loaded_in_pid != os.getpid(),
+        "error": _load_errors.get(MODEL_NAME),
+        "loaded_models": sorted(_models),
+    }
@@ -0,0 +1,326 @@
+"""Local embedding server shared by all API workers.
+
+One process owns the sentence-transformers model and serves embeddings over
+a Unix socket. Requests arriving from any gunicorn worker within a short
+window (EMBEDDING_BATCH_WINDOW_MS) are micro-batched into a single
+``encode`` call, so workers stop competing for the same cores and small
+requests ride along in larger, more efficient batches.
+
+Run with: python -m app.services.embedding_server [--socket PATH]
+(gunicorn.conf.py starts it automatically when EMBEDDING_SERVER_SOCKET is set)
+
+Wire protocol: 4-byte big-endian length + payload frames. Requests are JSON
+(``{"op": "embed", "texts": [...], "model": "..."}`` or ``{"op": "stats"}``);
+responses are a JSON header frame, followed for ``embed`` by one frame of
+float32 vectors. ``model`` is optional (default RAG_EMBEDDING_MODEL); each
+model gets its own batcher, loaded on first request.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = os.getenv("EMBEDDING_SERVER_SOCKET", "/tmp/ledger-embeddings.sock")
+BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "128"))
+
+_HEADER = struct.Struct(">I")
+
+
+def _frame(payload: bytes) -> bytes:
+    return _HEADER.pack(len(payload)) + payload
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class MicroBatcher:
+    """Collects concurrent embed requests and encodes them in one call."""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ):
+        self.encode = encode
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(max_batch_size, 1)
+        self.queue: "asyncio.Queue[Tuple[List[str], asyncio.Future]]" = asyncio.Queue()
+        # One encode at a time — the model already uses every core
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.histogram: Dict[str, int] = {}
+
+    async def submit(self, texts: List[str]) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        self.texts += len(texts)
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.window
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [t for item_texts, _ in batch for t in item_texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self.encode, texts)
+            except Exception as e:
+                logger.error(f"Batch encode of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            bucket = str(1 << max(len(texts) - 1, 0).bit_length())
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset : offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "avg_batch_size": round(self.texts / self.batches, 1) if self.batches else 0.0,
+            # bucket "N" counts batches with size in (N/2, N]
+            "batch_size_histogram": dict(sorted(self.histogram.items(), key=lambda kv: int(kv[0]))),
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
+
+
+class BatcherPool:
+    """One MicroBatcher per embedding model, each loaded on first request."""
+
+    def __init__(self, default_model: str):
+        self.default_model = default_model
+        self.batchers: Dict[str, MicroBatcher] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._load_lock = asyncio.Lock()
+
+    async def get(self, name: Optional[str] = None) -> MicroBatcher:
+        from app.services import embedding_model
+
+        name = name or self.default_model
+        if name not in self.batchers:
+            async with self._load_lock:
+                if name not in self.batchers:
+                    # Loading takes seconds; keep serving the loaded models meanwhile
+                    loop = asyncio.get_running_loop()
+                    if not await loop.run_in_executor(None, lambda: embedding_model.warm_up(name=name)):
+                        raise RuntimeError(f"Embedding model {name} could not be loaded")
+                    model = embedding_model.get_model(name)
+                    batcher = MicroBatcher(lambda texts: model.encode(texts))
+                    self._tasks.append(asyncio.create_task(batcher.run()))
+                    self.batchers[name] = batcher
+        return self.batchers[name]
+
+    def stats(self) -> dict:
+        default = self.batchers.get(self.default_model)
+        return {**(default.stats() if default else {}), "models": sorted(self.batchers)}
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    return await reader.readexactly(length)
+
+
+async def _handle_client(pool: BatcherPool, reader, writer) -> None:
+    try:
+        while True:
+            try:
+                request = json.loads(await _read_frame(reader))
+            except asyncio.IncompleteReadError:
+                break
+            op = request.get("op")
+            try:
+                if op == "embed":
+                    texts = [str(t) for t in request.get("texts", [])]
+                    batcher = await pool.get(request.get("model"))
+                    vectors = np.asarray(await batcher.submit(texts), dtype=np.float32) if texts \
+                        else np.zeros((0, 0), dtype=np.float32)
+                    dim = int(vectors.shape[1]) if vectors.ndim == 2 and len(texts) else 0
+                    header = {"ok": True, "n": len(texts), "dim": dim}
+                    writer.write(_frame(json.dumps(header).encode()) + _frame(vectors.tobytes()))
+                elif op == "stats":
+                    writer.write(_frame(json.dumps({"ok": True, **pool.stats()}).encode()))
+                else:
+                    writer.write(_frame(json.dumps({"ok": False, "error": f"unknown op {op!r}"}).encode()))
+            except Exception as e:
+                writer.write(_frame(json.dumps({"ok": False, "error": str(e)}).encode()))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(socket_path: str = SOCKET_PATH) -> None:
+    """Load the model and serve embeddings on ``socket_path`` until cancelled."""
+    from app.services import embedding_model
+
+    pool = BatcherPool(embedding_model.MODEL_NAME)
+    await pool.get()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(
+        lambda r, w: _handle_client(pool, r, w),
+        path=socket_path,
+    )
+    os.chmod(socket_path, 0o660)
+    logger.info(f"✅ Embedding server listening on {socket_path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
+class EmbeddingClient:
+    """Blocking client used by rag.py; one connection per thread."""
+
+    def __init__(self, socket_path: str = SOCKET_PATH, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            conn.connect(self.socket_path)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+        self._local.conn = None
+
+    def _recv_exact(self, conn: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Embedding server closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def _recv_frame(self, conn: socket.socket) -> bytes:
+        (length,) = _HEADER.unpack(self._recv_exact(conn, _HEADER.size))
+        return self._recv_exact(conn, length)
+
+    def _request(self, payload: dict) -> Tuple[dict, socket.socket]:
+        try:
+            conn = self._connection()
+            conn.sendall(_frame(json.dumps(payload).encode()))
+            header = json.loads(self._recv_frame(conn))
+        except (OSError, ValueError):
+            self._reset()
+            raise
+        if not header.get("ok"):
+            raise RuntimeError(header.get("error", "embedding server error"))
+        return header, conn
+
+    def embed(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """Embed texts on the server (micro-batched with other workers)."""
+        payload = {"op": "embed", "texts": texts}
+        if model:
+            payload["model"] = model
+        header, conn = self._request(payload)
+        try:
+            data = self._recv_frame(conn)
+        except OSError:
+            self._reset()
+            raise
+        if header["n"] == 0:
+            return []
+        vectors = np.frombuffer(data, dtype=np.float32).reshape(header["n"], header["dim"])
+        return vectors.tolist()
+
+    def stats(self) -> dict:
+        """Queue depth and batch-size histogram from the server."""
+        header, _ = self._request({"op": "stats"})
+        header.pop("ok", None)
+        return header
+
+    def is_reachable(self) -> bool:
+        return os.path.exists(self.socket_path)
+
+
+def wait_for_socket(socket_path: str, timeout: float = 120.0) -> bool:
+    """Block until the server socket exists (used when starting alongside gunicorn)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(socket_path):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Ledger embedding server")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    main()
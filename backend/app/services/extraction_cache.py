@@ -0,0 +1,147 @@
+"""Persistent cache of extraction results.
+
+Maps (transcript hash, provider chain, model, prompt version) → the JSON
+returned by ``extract_decisions_and_actions``, in a small SQLite file next
+to the persistent vector store. Extracting the same transcript again
+(double-clicked /extract, end_room after a manual run, re-processing)
+then costs a lookup instead of an LLM call. Editing ``SYSTEM_PROMPT`` or
+the chunking settings changes the prompt version, so stale results are
+never served.
+
+Entries expire after ``ttl_seconds`` and the least recently used ones are
+evicted beyond ``max_entries``.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """SQLite-backed extraction result cache with TTL and LRU eviction."""
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl_seconds: float = 30 * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                content_hash TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, provider, model, prompt_version)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_extractions_last_used ON extractions (last_used_at)"
+        )
+        self._conn.commit()
+
+    def get(self, content_hash: str, provider: str, model: str, prompt_version: str) -> Optional[dict]:
+        """Cached result, or None; updates hit/miss counters and recency."""
+        key = (content_hash, provider, model, prompt_version)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM extractions "
+                "WHERE content_hash = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                key,
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM extractions "
+                    "WHERE content_hash = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                    key,
+                )
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE extractions SET last_used_at = ? "
+                "WHERE content_hash = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put(self, content_hash: str, provider: str, model: str, prompt_version: str, result: dict) -> None:
+        """Store a result, then evict expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions "
+                "(content_hash, provider, model, prompt_version, result, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, provider, model, prompt_version, json.dumps(result), now, now),
+            )
+            evicted = 0
+            if self.ttl_seconds:
+                evicted += self._conn.execute(
+                    "DELETE FROM extractions WHERE created_at < ?", (now - self.ttl_seconds,)
+                ).rowcount
+            if self.max_entries:
+                evicted += self._conn.execute(
+                    "DELETE FROM extractions WHERE rowid IN ("
+                    "SELECT rowid FROM extractions ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+            self.evictions += evicted
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            count = self._conn.execute("DELETE FROM extractions").rowcount
+            self._conn.commit()
+        return count
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()
+        return row[0] if row else 0
+
+    def stats(self) -> dict:
+        """Hit/miss/bypass/eviction counters (this process) and entry count (on disk)."""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self.count(),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
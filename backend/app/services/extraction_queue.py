@@ -0,0 +1,476 @@
+"""Durable extraction job queue.
+
+``POST /extract/`` only inserts an ``extraction_jobs`` row and returns 202;
+workers (``app/workers/extraction_worker.py``, a separate process or
+threads inside the API) claim queued jobs and run them:
+
+1. ``extract`` — process_transcript (LLM extraction, save, facts, alerts)
+2. ``notify`` and ``index`` — the assignment emails and RAG indexing, run
+   concurrently since neither depends on the other
+
+Claims are a conditional UPDATE (``status = 'queued'``), so any number of
+workers can poll the same table. A side thread refreshes a running job's
+heartbeat every EXTRACTION_HEARTBEAT_SECONDS; one whose heartbeat is older
+than EXTRACTION_JOB_TIMEOUT is requeued (up to EXTRACTION_MAX_ATTEMPTS),
+and the worker that lost it can no longer change its status.
+Cancelling a queued job is immediate; a running one stops at the next
+check before its extraction is written, and never after.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from app.db.models.extraction_job import ExtractionJob
+from app.db.models.transcript import Transcript
+from app.db.models.meeting import Meeting
+from app.db.models.action_item import ActionItem
+from app.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+EXTRACTION_POLL_SECONDS = float(os.getenv("EXTRACTION_POLL_SECONDS", "1"))
+EXTRACTION_JOB_TIMEOUT = float(os.getenv("EXTRACTION_JOB_TIMEOUT", "900"))
+EXTRACTION_MAX_ATTEMPTS = int(os.getenv("EXTRACTION_MAX_ATTEMPTS", "3"))
+# Side-thread heartbeat while a job runs; keep well below EXTRACTION_JOB_TIMEOUT
+EXTRACTION_HEARTBEAT_SECONDS = float(
+    os.getenv("EXTRACTION_HEARTBEAT_SECONDS", str(min(30.0, EXTRACTION_JOB_TIMEOUT / 3)))
+)
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised at a stage boundary when a running job was cancelled."""
+
+
+class JobSuperseded(Exception):
+    """Raised when a running job was requeued away from this worker."""
+
+
+# ============================================================================
+# Post-extraction stages
+# ============================================================================
+
+def send_post_extraction_notifications(db, meeting_id: str, action_item_ids=None):
+    """Send email notifications after extraction completes.
+
+    ``action_item_ids`` limits them to items that were just assigned, so a
+    re-extraction doesn't email every owner again; None notifies them all.
+    """
+    from app.services.email_notifier import send_action_item_assigned
+
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        return
+
+    query = db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id)
+    if action_item_ids is not None:
+        if not action_item_ids:
+            return
+        query = query.filter(ActionItem.id.in_(action_item_ids))
+    action_items = query.all()
+
+    for item in action_items:
+        if item.owner_id:
+            owner = db.query(User).filter(User.id == item.owner_id).first()
+            if owner:
+                due_date_str = item.due_date.strftime("%Y-%m-%d") if item.due_date else None
+                send_action_item_assigned(
+                    to_email=owner.email,
+                    to_name=owner.name,
+                    action_description=item.description,
+                    meeting_title=meeting.title,
+                    due_date=due_date_str,
+                )
+
+
+def index_meeting_for_rag(db, meeting_id: str):
+    """Index meeting transcript for RAG after extraction."""
+    try:
+        from app.services.rag import index_transcript, load_meeting_transcript, mark_indexed
+
+        transcript = load_meeting_transcript(db, meeting_id)
+        if not transcript:
+            return
+        meeting = transcript["meeting"]
+
+        count = index_transcript(
+            meeting_id=meeting.id,
+            transcript_text=transcript["text"],
+            meeting_title=meeting.title,
+            meeting_date=str(meeting.created_at),
+            owner_id=meeting.owner_id,
+        )
+        if count > 0:
+            mark_indexed(db, meeting.id, transcript["text"], count, transcript_id=transcript["transcript_id"])
+        logger.info(f"✅ Auto-indexed meeting for RAG: {meeting.title}")
+    except Exception as e:
+        logger.warning(f"⚠️ RAG indexing failed (non-fatal): {e}")
+
+
+# ============================================================================
+# Queue operations
+# ============================================================================
+
+def enqueue(db, transcript, refresh: bool = False) -> ExtractionJob:
+    """Queue an extraction of ``transcript``.
+
+    A meeting that already has a queued or running job gets that job back
+    (double clicks, end_room racing a manual run), ``refresh`` or not: two
+    LLM runs for one meeting would only race each other's writes. A refresh
+    asked for while the job is still queued makes that job a refresh.
+    """
+    existing = (
+        db.query(ExtractionJob)
+        .filter(ExtractionJob.meeting_id == transcript.meeting_id)
+        .filter(ExtractionJob.status.in_(ACTIVE_STATUSES))
+        .filter(ExtractionJob.cancel_requested.is_(False))
+        .order_by(ExtractionJob.created_at)
+        .first()
+    )
+    if existing is not None:
+        if refresh and not existing.refresh:
+            (
+                db.query(ExtractionJob)
+                .filter(ExtractionJob.id == existing.id, ExtractionJob.status == "queued")
+                .update({"refresh": True}, synchronize_session=False)
+            )
+            db.commit()
+            db.refresh(existing)
+        return existing
+
+    job = ExtractionJob(
+        transcript_id=transcript.id,
+        meeting_id=transcript.meeting_id,
+        status="queued",
+        refresh=refresh,
+        cancel_requested=False,
+        attempts=0,
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(f"📥 Queued extraction job {job.id} for transcript {transcript.id}")
+    return job
+
+
+def cancel(db, job: ExtractionJob) -> ExtractionJob:
+    """Cancel a job: at once if still queued, at the next stage boundary if running."""
+    if job.status == "queued":
+        updated = (
+            db.query(ExtractionJob)
+            .filter(ExtractionJob.id == job.id, ExtractionJob.status == "queued")
+            .update({"status": "cancelled", "finished_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        if not updated:
+            # Claimed in the meantime; let the worker stop it
+            job.cancel_requested = True
+    elif job.status == "running":
+        job.cancel_requested = True
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next(db, worker_id: str) -> Optional[ExtractionJob]:
+    """Atomically move the oldest queued job to running; None if the queue is empty."""
+    candidates = (
+        db.query(ExtractionJob.id)
+        .filter(ExtractionJob.status == "queued")
+        .order_by(ExtractionJob.created_at)
+        .limit(5)
+        .all()
+    )
+    for (job_id,) in candidates:
+        now = datetime.utcnow()
+        claimed = (
+            db.query(ExtractionJob)
+            .filter(ExtractionJob.id == job_id, ExtractionJob.status == "queued")
+            .update(
+                {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "heartbeat_at": now,
+                    "attempts": ExtractionJob.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            return db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+    return None
+
+
+def requeue_stale(db) -> int:
+    """Requeue running jobs whose worker stopped heartbeating (or fail them after too many attempts)."""
+    cutoff = datetime.utcnow() - timedelta(seconds=EXTRACTION_JOB_TIMEOUT)
+    stale = (
+        db.query(ExtractionJob.id, ExtractionJob.attempts, ExtractionJob.stage)
+        .filter(ExtractionJob.status == "running")
+        .filter(ExtractionJob.heartbeat_at < cutoff)
+        .all()
+    )
+    requeued = 0
+    for job_id, attempts, stage in stale:
+        if (attempts or 0) >= EXTRACTION_MAX_ATTEMPTS:
+            values = {
+                "status": "failed",
+                "error": f"Worker stopped responding ({attempts} attempts)",
+                "finished_at": datetime.utcnow(),
+            }
+        else:
+            values = {"status": "queued", "worker_id": None}
+        # Conditional on the heartbeat still being stale: a worker that
+        # heartbeated since the SELECT keeps its job
+        updated = (
+            db.query(ExtractionJob)
+            .filter(
+                ExtractionJob.id == job_id,
+                ExtractionJob.status == "running",
+                ExtractionJob.heartbeat_at < cutoff,
+            )
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        if updated:
+            requeued += 1
+            logger.warning(f"⚠️ Extraction job {job_id} stalled on {stage}; now {values['status']}")
+    return requeued
+
+
+def job_to_dict(job: ExtractionJob) -> dict:
+    """API representation of a job."""
+    def iso(value):
+        return value.isoformat() if value else None
+
+    try:
+        timings = json.loads(job.timings) if job.timings else {}
+    except ValueError:
+        timings = {}
+    return {
+        "job_id": job.id,
+        "transcript_id": job.transcript_id,
+        "meeting_id": job.meeting_id,
+        "status": job.status,
+        "stage": job.stage,
+        "cancel_requested": bool(job.cancel_requested),
+        "attempts": job.attempts or 0,
+        "error": job.error,
+        "timings": timings,
+        "created_at": iso(job.created_at),
+        "started_at": iso(job.started_at),
+        "finished_at": iso(job.finished_at),
+    }
+
+
+# ============================================================================
+# Running a job
+# ============================================================================
+
+def _run_stage(fn: Callable, meeting_id: str) -> Tuple[float, Optional[str]]:
+    """Run a post-extraction stage in its own DB session; (seconds, error)."""
+    from app.db.session import SessionLocal
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        fn(db, meeting_id)
+        return time.perf_counter() - started, None
+    except Exception as e:
+        db.rollback()
+        return time.perf_counter() - started, str(e)
+    finally:
+        db.close()
+
+
+def _update_owned(db, job_id: str, worker_id: str, values: dict) -> bool:
+    """Update a running job only while ``worker_id`` still owns it.
+
+    False means the job was requeued (and maybe claimed by another worker)
+    or finished meanwhile; the caller must then leave it alone.
+    """
+    updated = (
+        db.query(ExtractionJob)
+        .filter(
+            ExtractionJob.id == job_id,
+            ExtractionJob.worker_id == worker_id,
+            ExtractionJob.status == "running",
+        )
+        .update(values, synchronize_session=False)
+    )
+    db.commit()
+    return bool(updated)
+
+
+class _Heartbeat:
+    """Refreshes a job's heartbeat_at from a side thread while it runs.
+
+    A single stage (a long chunked extraction with retries and fallbacks)
+    can outlast EXTRACTION_JOB_TIMEOUT, so heartbeats at stage boundaries
+    alone would let requeue_stale hand a live job to a second worker.
+    ``lost`` is set once the job stops belonging to this worker.
+    """
+
+    def __init__(self, job_id: str, worker_id: str):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id[:8]}", daemon=True)
+
+    def _run(self) -> None:
+        from app.db.session import SessionLocal
+
+        while not self._stop.wait(EXTRACTION_HEARTBEAT_SECONDS):
+            db = SessionLocal()
+            try:
+                if not _update_owned(db, self.job_id, self.worker_id, {"heartbeat_at": datetime.utcnow()}):
+                    self.lost.set()
+                    return
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"⚠️ Heartbeat for extraction job {self.job_id} failed: {e}")
+            finally:
+                db.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        return False
+
+
+def run_job(job_id: str, llm_factory: Optional[Callable] = None) -> dict:
+    """Run a claimed job to completion and record its outcome and stage timings.
+
+    Cancellation is honoured up to the moment process_transcript writes its
+    results; from then on the job always finishes notify and index. Every
+    status write is conditional on this worker still owning the job, so a
+    worker whose job was requeued as stale can't overwrite the new run.
+    """
+    from app.db.session import SessionLocal
+    from app.workers.extract_from_transcript import process_transcript
+
+    db = SessionLocal()
+    job = db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+    if job is None:
+        db.close()
+        raise ValueError(f"Extraction job {job_id} not found")
+
+    worker_id = job.worker_id
+    meeting_id = job.meeting_id
+    timings: Dict[str, float] = {}
+    if job.created_at and job.started_at:
+        timings["queued"] = round(max((job.started_at - job.created_at).total_seconds(), 0.0), 3)
+
+    heartbeat = _Heartbeat(job_id, worker_id)
+    stage = None
+    written = False
+
+    def check_cancel() -> None:
+        if heartbeat.lost.is_set():
+            raise JobSuperseded()
+        row = (
+            db.query(ExtractionJob.cancel_requested, ExtractionJob.worker_id, ExtractionJob.status)
+            .filter(ExtractionJob.id == job_id)
+            .first()
+        )
+        if row is None or row.worker_id != worker_id or row.status != "running":
+            raise JobSuperseded()
+        if row.cancel_requested:
+            raise JobCancelled()
+
+    def enter(name: str, cancellable: bool = True) -> None:
+        nonlocal stage
+        if cancellable:
+            check_cancel()
+        stage = name
+        if not _update_owned(db, job_id, worker_id, {"stage": name, "heartbeat_at": datetime.utcnow()}):
+            raise JobSuperseded()
+
+    values: dict = {}
+    with heartbeat:
+        try:
+            transcript = db.query(Transcript).filter(Transcript.id == job.transcript_id).first()
+            if transcript is None:
+                raise ValueError("Transcript not found")
+
+            if llm_factory is None:
+                from app.services.openai_client import get_llm
+                llm_factory = get_llm
+            llm = llm_factory()
+
+            enter("extract")
+            started = time.perf_counter()
+            # should_cancel runs once more right before the write; after that
+            # the results are saved and the job is no longer cancellable
+            written_stats = process_transcript(
+                db, llm, transcript, refresh=bool(job.refresh), should_cancel=check_cancel
+            )
+            written = True
+            timings["extract"] = round(time.perf_counter() - started, 3)
+            assigned = (written_stats or {}).get("assigned_action_item_ids")
+
+            # The extraction is saved now; notify and index are independent of each other
+            enter("post", cancellable=False)
+            started = time.perf_counter()
+            stages = {
+                "notify": lambda stage_db, mid: send_post_extraction_notifications(stage_db, mid, assigned),
+                "index": index_meeting_for_rag,
+            }
+            with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+                futures = {name: pool.submit(_run_stage, fn, meeting_id) for name, fn in stages.items()}
+            warnings = []
+            for name, future in futures.items():
+                seconds, error = future.result()
+                timings[name] = round(seconds, 3)
+                if error:
+                    warnings.append(f"{name}: {error}")
+                    logger.warning(f"⚠️ {name} failed for extraction job {job_id} (non-fatal): {error}")
+            timings["post"] = round(time.perf_counter() - started, 3)
+
+            values = {"status": "succeeded", "error": "; ".join(warnings) or None}
+        except JobSuperseded:
+            db.rollback()
+            logger.warning(f"⚠️ Extraction job {job_id} was requeued while {worker_id} ran it; dropping this run")
+        except JobCancelled:
+            db.rollback()
+            values = {"status": "cancelled"}
+            logger.info(f"🛑 Extraction job {job_id} cancelled before {stage or 'starting'}")
+        except Exception as e:
+            db.rollback()
+            values = {"status": "failed", "error": str(e)}
+            if written:
+                values["error"] = f"Results were saved, then {stage} failed: {e}"
+            logger.error(f"❌ Extraction job {job_id} failed in {stage or 'setup'}: {e}")
+
+    try:
+        if values:
+            values.update({"timings": json.dumps(timings), "finished_at": datetime.utcnow()})
+            if not _update_owned(db, job_id, worker_id, values):
+                logger.warning(f"⚠️ Extraction job {job_id} no longer belongs to {worker_id}; status not recorded")
+        job = db.query(ExtractionJob).filter(ExtractionJob.id == job_id).first()
+        result = job_to_dict(job)
+    finally:
+        db.close()
+
+    if values.get("status") == "succeeded":
+        logger.info(f"✅ Extraction job {job_id} done: {timings}")
+    return result
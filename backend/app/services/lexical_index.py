@@ -0,0 +1,183 @@
+"""Local BM25 index over RAG chunks.
+
+Backed by SQLite FTS5 (an on-disk inverted index with built-in BM25
+ranking), stored next to the persistent vector store. It catches exact
+tokens that embeddings blur — ticket IDs, customer names, version numbers —
+and its rankings are fused with vector search via reciprocal rank fusion.
+"""
+
+import os
+import re
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Kept deliberately short: BM25's IDF already discounts common words, this
+# just stops questions like "what did we decide" from matching everything.
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "did", "do", "does",
+    "for", "from", "had", "has", "have", "how", "i", "in", "is", "it", "its",
+    "me", "of", "on", "or", "our", "so", "that", "the", "their", "there",
+    "they", "this", "to", "us", "was", "we", "were", "what", "when", "where",
+    "which", "who", "why", "will", "with", "you",
+}
+
+_TERM_RE = re.compile(r"[\w][\w\-\.]*[\w]|[\w]", re.UNICODE)
+
+
+def query_terms(text: str) -> List[str]:
+    """Split a question into search terms, keeping IDs like ``ABC-123`` intact."""
+    terms = []
+    for term in _TERM_RE.findall(text.lower()):
+        if term in _STOPWORDS:
+            continue
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+class LexicalIndex:
+    """SQLite FTS5 chunk index with BM25 ranking."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")]
+        if columns and "owner_id" not in columns:
+            # Pre-tenancy layout; rag.py backfills an empty index from the vector store
+            self._conn.execute("DROP TABLE chunks")
+        self._conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+                chunk_id UNINDEXED,
+                meeting_id UNINDEXED,
+                owner_id UNINDEXED,
+                document
+            )
+            """
+        )
+        self._conn.commit()
+
+    def add(self, rows: Iterable[Tuple[str, str, str, str]]) -> None:
+        """Insert or replace (chunk_id, meeting_id, owner_id, document) rows."""
+        rows = [(str(cid), str(mid), str(oid or ""), doc or "") for cid, mid, oid, doc in rows]
+        if not rows:
+            return
+        with self._lock:
+            ids = [r[0] for r in rows]
+            for start in range(0, len(ids), 500):
+                batch = ids[start : start + 500]
+                self._conn.execute(
+                    f"DELETE FROM chunks WHERE chunk_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            self._conn.executemany(
+                "INSERT INTO chunks (chunk_id, meeting_id, owner_id, document) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete_meetings(self, meeting_ids: List[str]) -> None:
+        """Remove every chunk belonging to the given meetings."""
+        meeting_ids = [str(m) for m in meeting_ids]
+        if not meeting_ids:
+            return
+        with self._lock:
+            for start in range(0, len(meeting_ids), 500):
+                batch = meeting_ids[start : start + 500]
+                self._conn.execute(
+                    f"DELETE FROM chunks WHERE meeting_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            self._conn.commit()
+
+    def delete_ids(self, chunk_ids: List[str]) -> None:
+        """Remove the given chunks."""
+        chunk_ids = [str(c) for c in chunk_ids]
+        with self._lock:
+            for start in range(0, len(chunk_ids), 500):
+                batch = chunk_ids[start : start + 500]
+                self._conn.execute(
+                    f"DELETE FROM chunks WHERE chunk_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            self._conn.commit()
+
+    def delete_owner(self, owner_id: str) -> None:
+        """Remove every chunk belonging to one owner."""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE owner_id = ?", (str(owner_id),))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.commit()
+
+    def destroy(self) -> None:
+        """Close and delete the index file."""
+        with self._lock:
+            self._conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()
+        return row[0] if row else 0
+
+    def search(
+        self,
+        question: str,
+        limit: int = 20,
+        meeting_ids: Optional[List[str]] = None,
+        owner_id: Optional[str] = None,
+    ) -> List[Dict[str, object]]:
+        """BM25 search; returns [{"id", "meeting_id", "score"}] best first.
+
+        Each term is matched as a quoted phrase, so ``ABC-123`` only matches
+        the adjacent tokens ``abc`` ``123`` rather than either on its own.
+        """
+        terms = query_terms(question)
+        if not terms:
+            return []
+        match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+        sql = "SELECT chunk_id, meeting_id, bm25(chunks) AS rank FROM chunks WHERE chunks MATCH ?"
+        params: List[object] = [match]
+        if meeting_ids:
+            sql += f" AND meeting_id IN ({','.join('?' * len(meeting_ids))})"
+            params.extend(str(m) for m in meeting_ids)
+        if owner_id is not None:
+            sql += " AND owner_id = ?"
+            params.append(str(owner_id))
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.error(f"Lexical search failed: {e}")
+            return []
+        # bm25() is lower-is-better; flip the sign so higher is better
+        return [{"id": cid, "meeting_id": mid, "score": -rank} for cid, mid, rank in rows]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> Dict[str, float]:
+    """Fuse ranked id lists: score(id) = Σ 1 / (k + rank), rank starting at 1."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return scores
@@ -0,0 +1,398 @@
+"""Shared, pooled LLM client layer.
+
+One place for every outbound LLM call (RAG answers, extraction, live
+assist) instead of a fresh httpx/OpenAI client per request:
+
+- One long-lived ``httpx.AsyncClient`` (keep-alive pool) for Ollama and one
+  ``openai.AsyncOpenAI`` client, both owned by a background event loop so
+  sync callers (threadpool endpoints, workers) and async callers share them
+- Per-provider concurrency limits (semaphores)
+- Per-call timeouts
+- Retry with exponential backoff + jitter on connection errors, timeouts,
+  429 and 5xx responses
+
+Sync code uses the ``*_sync`` helpers / ``iter_ollama_stream``; async code
+awaits ``ollama_generate`` / ``openai_chat`` directly.
+"""
+
+import os
+import json
+import queue
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+# Local Ollama is CPU/GPU bound — a small limit avoids thrashing it
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# ============================================================================
+# Background event loop
+# ============================================================================
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_http: Optional[httpx.AsyncClient] = None
+_openai = None
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+_stats: Dict[str, Dict[str, int]] = {
+    provider: {"requests": 0, "in_flight": 0, "retries": 0, "failures": 0}
+    for provider in ("ollama", "openai")
+}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start (or restart after fork) the loop that owns the pooled clients."""
+    global _loop, _loop_pid, _http, _openai
+    with _lock:
+        if _loop is not None and _loop_pid == os.getpid():
+            return _loop
+
+        # Threads don't survive fork: a gunicorn worker gets a fresh loop
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever,
+            name="llm-client-loop",
+            daemon=True,
+        )
+        thread.start()
+        _loop = loop
+        _loop_pid = os.getpid()
+        _http = None
+        _openai = None
+        _semaphores.clear()
+        return loop
+
+
+def _http_client() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+        )
+    return _http
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    if provider not in _semaphores:
+        limit = OLLAMA_MAX_CONCURRENCY if provider == "ollama" else OPENAI_MAX_CONCURRENCY
+        _semaphores[provider] = asyncio.Semaphore(max(limit, 1))
+    return _semaphores[provider]
+
+
+def get_openai_client():
+    """Shared ``openai.AsyncOpenAI`` client, or None when no API key is set.
+
+    Retries are disabled on the SDK side; this module applies its own policy.
+    """
+    global _openai
+    if not OPENAI_API_KEY:
+        return None
+    _get_loop()
+    if _openai is None:
+        from openai import AsyncOpenAI
+        _openai = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            max_retries=0,
+            timeout=LLM_TIMEOUT,
+        )
+    return _openai
+
+
+def _submit(coro: Awaitable) -> "asyncio.Future":
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop and block until it finishes.
+
+    Must not be called from the shared loop itself.
+    """
+    return _submit(coro).result(timeout=timeout)
+
+
+async def _run_on_loop(coro: Awaitable) -> Any:
+    """Await a coroutine on the shared loop from any other event loop."""
+    return await asyncio.wrap_future(_submit(coro))
+
+
+# ============================================================================
+# Retry
+# ============================================================================
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (httpx.TransportError, httpx.TimeoutException)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUS
+    try:
+        import openai
+        if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError,
+                            openai.RateLimitError, openai.InternalServerError)):
+            return True
+    except ImportError:
+        pass
+    return False
+
+
+async def _with_retries(
+    provider: str,
+    call: Callable[[], Awaitable[Any]],
+    max_retries: Optional[int] = None,
+) -> Any:
+    """Run ``call`` under the provider's concurrency limit, retrying with backoff."""
+    if max_retries is None:
+        max_retries = LLM_MAX_RETRIES
+    stats = _stats[provider]
+    attempt = 0
+    while True:
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        try:
+            async with _semaphore(provider):
+                return await call()
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                stats["failures"] += 1
+                raise
+            delay = LLM_RETRY_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+            attempt += 1
+            stats["retries"] += 1
+            logger.warning(
+                f"{provider} call failed ({type(e).__name__}: {e}); "
+                f"retry {attempt}/{max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+        finally:
+            stats["in_flight"] -= 1
+
+
+# ============================================================================
+# Ollama
+# ============================================================================
+
+def _ollama_payload(prompt: str, model: Optional[str], stream: bool, format: Optional[str],
+                    options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "model": model or OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": stream,
+    }
+    if format:
+        payload["format"] = format
+    if options:
+        payload["options"] = options
+    return payload
+
+
+async def _ollama_generate(
+    prompt: str,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+    format: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    url = f"{base_url or OLLAMA_URL}/api/generate"
+    payload = _ollama_payload(prompt, model, False, format, options)
+
+    async def call() -> str:
+        response = await _http_client().post(
+            url,
+            json=payload,
+            timeout=httpx.Timeout(timeout or LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    return await _with_retries("ollama", call)
+
+
+async def ollama_generate(prompt: str, **kwargs) -> str:
+    """Non-streaming Ollama /api/generate; returns the response text.
+
+    Keyword args: model, base_url, timeout, format, options.
+    """
+    return await _run_on_loop(_ollama_generate(prompt, **kwargs))
+
+
+def ollama_generate_sync(prompt: str, **kwargs) -> str:
+    """Blocking variant of ollama_generate for sync callers."""
+    return run_sync(_ollama_generate(prompt, **kwargs))
+
+
+class _StreamInterrupted(Exception):
+    """A stream failed after tokens were delivered; not retryable."""
+
+
+def iter_ollama_stream(
+    prompt: str,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Stream tokens from Ollama to a sync caller.
+
+    Connection failures are retried until the first token arrives; after
+    that, errors propagate. Closing the iterator cancels the request.
+    """
+    url = f"{base_url or OLLAMA_URL}/api/generate"
+    payload = _ollama_payload(prompt, model, True, None, options)
+    events: "queue.Queue" = queue.Queue()
+    done = object()
+
+    async def pump() -> None:
+        emitted = False
+
+        async def call() -> None:
+            nonlocal emitted
+            try:
+                async with _http_client().stream(
+                    "POST",
+                    url,
+                    json=payload,
+                    timeout=httpx.Timeout(timeout or LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        token = chunk.get("response", "")
+                        if token:
+                            emitted = True
+                            events.put(token)
+                        if chunk.get("done"):
+                            break
+            except Exception as e:
+                # Retrying mid-answer would repeat tokens the caller already has
+                if emitted:
+                    raise _StreamInterrupted() from e
+                raise
+
+        try:
+            await _with_retries("ollama", call)
+        except _StreamInterrupted as e:
+            events.put(e.__cause__)
+        except Exception as e:
+            events.put(e)
+        finally:
+            events.put(done)
+
+    future = _submit(pump())
+    try:
+        while True:
+            item = events.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if not future.done():
+            future.cancel()
+
+
+# ============================================================================
+# OpenAI
+# ============================================================================
+
+async def _openai_chat(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0,
+    max_tokens: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    client = get_openai_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+
+    kwargs: Dict[str, Any] = {
+        "model": model or OPENAI_MODEL,
+        "messages": messages,
+        "temperature": temperature,
+        "timeout": timeout or LLM_TIMEOUT,
+    }
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+
+    async def call() -> str:
+        response = await client.chat.completions.create(**kwargs)
+        return response.choices[0].message.content or ""
+
+    return await _with_retries("openai", call)
+
+
+async def openai_chat(messages: List[Dict[str, str]], **kwargs) -> str:
+    """Chat completion on the shared OpenAI client; returns the message text.
+
+    Keyword args: model, temperature, max_tokens, timeout.
+    """
+    return await _run_on_loop(_openai_chat(messages, **kwargs))
+
+
+def openai_chat_sync(messages: List[Dict[str, str]], **kwargs) -> str:
+    """Blocking variant of openai_chat for sync callers."""
+    return run_sync(_openai_chat(messages, **kwargs))
+
+
+async def _ollama_reachable(base_url: Optional[str] = None, timeout: float = 5.0) -> bool:
+    try:
+        response = await _http_client().get(
+            f"{base_url or OLLAMA_URL}/api/tags",
+            timeout=httpx.Timeout(timeout, connect=min(timeout, LLM_CONNECT_TIMEOUT)),
+        )
+        return response.status_code == 200
+    except Exception:
+        return False
+
+
+def ollama_reachable_sync(base_url: Optional[str] = None, timeout: float = 5.0) -> bool:
+    """Health probe: one GET /api/tags on the pooled client, no retries."""
+    return run_sync(_ollama_reachable(base_url, timeout))
+
+
+# ============================================================================
+# Stats
+# ============================================================================
+
+def get_stats() -> dict:
+    """Per-provider request/retry counters and configured limits."""
+    return {
+        "ollama": {**_stats["ollama"], "max_concurrency": OLLAMA_MAX_CONCURRENCY},
+        "openai": {**_stats["openai"], "max_concurrency": OPENAI_MAX_CONCURRENCY},
+        "max_connections": LLM_MAX_CONNECTIONS,
+        "max_retries": LLM_MAX_RETRIES,
+        "timeout": LLM_TIMEOUT,
+    }
@@ -5,7 +5,7 @@ logger = logging.getLogger(__name__)
 
 
 def get_llm():
-    """Get the LLM client. Returns OpenAI client or None if using Ollama."""
+    """Get the LLM client. Returns the shared OpenAI client or None if using Ollama."""
     use_ollama = os.getenv("USE_OLLAMA", "false").lower() == "true"
     api_key = os.getenv("OPENAI_API_KEY")
 
@@ -18,5 +18,6 @@ def get_llm():
             "OPENAI_API_KEY is not set. Either set it or use USE_OLLAMA=true"
         )
 
-    from openai import OpenAI
-    return OpenAI(api_key=api_key)
\ No newline at end of file
+    # Shared pooled client instead of a new OpenAI() per call
+    from app.services.llm_client import get_openai_client
+    return get_openai_client()
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""Reconcile a fresh extraction with a meeting's saved outcomes.
+
+Re-extracting used to delete every decision, action item and risk of the
+meeting and insert them again. That lost ``status`` and ``acknowledged_at``,
+gave every row a new id (breaking alert links) and rewrote rows that had
+not changed. ``reconcile_outcomes`` instead matches each new item to an
+existing row of the same kind, in order of strength:
+
+1. the same normalized text
+2. the same normalized source sentence
+3. text at least EXTRACT_DEDUPE_THRESHOLD similar (best pair first)
+
+Matched rows are updated in place, and only when a field actually differs.
+Their id, ``status``, ``acknowledged_at`` and ``created_at`` are kept, and
+so is a known owner the new extraction could not name. Unmatched new items
+are inserted, unmatched old rows deleted (with alerts that point at them).
+Everything is applied in one commit. After a partial extraction
+(``prune=False``) unmatched rows are kept, since they may come from the
+part of the transcript that failed to extract.
+"""
+
+import os
+import re
+import difflib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.db.models.alert import Alert
+from app.db.models.decision import Decision
+from app.db.models.action_item import ActionItem
+from app.db.models.risk import Risk
+from app.services.ai_extractor import EXTRACT_DEDUPE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# "reconcile" (diff and upsert) or "replace" (delete everything, insert again)
+EXTRACT_WRITE_MODE = os.getenv("EXTRACT_WRITE_MODE", "reconcile").lower()
+
+# model, text column, columns a re-extraction may overwrite
+_KINDS = {
+    "decisions": (Decision, "summary", ("summary", "source_sentence", "confidence", "owner_id")),
+    "action_items": (ActionItem, "description", ("description", "source_sentence", "confidence", "owner_id", "due_date")),
+    "risks": (Risk, "description", ("description", "source_sentence", "confidence")),
+}
+
+
+def _normalize(text) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", str(text or "").lower())).strip()
+
+
+def _same(old, new) -> bool:
+    if hasattr(old, "tzinfo") and hasattr(new, "tzinfo"):
+        # SQLite hands back naive datetimes for timezone-aware columns
+        return old.replace(tzinfo=None) == new.replace(tzinfo=None)
+    return old == new
+
+
+# ============================================================================
+# Matching
+# ============================================================================
+
+def match_items(existing: List[dict], new: List[dict]) -> List[Tuple[int, int]]:
+    """Pair new items with existing ones; returns [(existing index, new index)].
+
+    Both lists hold dicts with ``text`` and ``source_sentence``. Each row is
+    used at most once, and an exact pairing always wins over a fuzzy one.
+    """
+    old_text = [_normalize(e.get("text")) for e in existing]
+    new_text = [_normalize(n.get("text")) for n in new]
+    old_source = [_normalize(e.get("source_sentence")) for e in existing]
+    new_source = [_normalize(n.get("source_sentence")) for n in new]
+
+    pairs: List[Tuple[int, int]] = []
+    free_old = set(range(len(existing)))
+    free_new = set(range(len(new)))
+
+    for old_keys, new_keys in ((old_text, new_text), (old_source, new_source)):
+        by_key: Dict[str, List[int]] = {}
+        for i in sorted(free_old):
+            if old_keys[i]:
+                by_key.setdefault(old_keys[i], []).append(i)
+        for j in sorted(free_new):
+            candidates = by_key.get(new_keys[j])
+            if candidates:
+                i = candidates.pop(0)
+                pairs.append((i, j))
+                free_old.discard(i)
+                free_new.discard(j)
+
+    scored = []
+    for i in free_old:
+        for j in free_new:
+            if old_text[i] and new_text[j]:
+                ratio = difflib.SequenceMatcher(None, old_text[i], new_text[j]).ratio()
+                if ratio >= EXTRACT_DEDUPE_THRESHOLD:
+                    scored.append((ratio, i, j))
+    for ratio, i, j in sorted(scored, reverse=True):
+        if i in free_old and j in free_new:
+            pairs.append((i, j))
+            free_old.discard(i)
+            free_new.discard(j)
+    return pairs
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def replace_outcomes(db, meeting_id: str, rows: Dict[str, List[dict]]) -> dict:
+    """The original write path: delete the meeting's outcomes and insert ``rows``."""
+    deleted = 0
+    for kind, (model, _, _) in _KINDS.items():
+        if model is ActionItem:
+            ids = select(ActionItem.id).where(ActionItem.meeting_id == meeting_id)
+            db.query(Alert).filter(Alert.action_item_id.in_(ids)).delete(synchronize_session=False)
+        deleted += db.query(model).filter(model.meeting_id == meeting_id).delete(synchronize_session=False)
+
+    inserted = []
+    for kind, (model, _, _) in _KINDS.items():
+        for values in rows.get(kind, []):
+            obj = model(meeting_id=meeting_id, **values)
+            db.add(obj)
+            inserted.append(obj)
+    db.commit()
+
+    return {
+        "mode": "replace",
+        "inserted": len(inserted),
+        "updated": 0,
+        "deleted": deleted,
+        "unchanged": 0,
+        "assigned_action_item_ids": [o.id for o in inserted if isinstance(o, ActionItem) and o.owner_id],
+    }
+
+
+def reconcile_outcomes(db, meeting_id: str, rows: Dict[str, List[dict]], prune: bool = True) -> dict:
+    """Apply the diff between the meeting's saved outcomes and ``rows``.
+
+    ``rows`` maps "decisions" / "action_items" / "risks" to lists of column
+    values for new rows (without ``meeting_id``). Returns counts of inserted,
+    updated, deleted and unchanged rows, plus the ids of action items that
+    gained an owner (new, or reassigned) so only those owners are notified.
+    ``prune=False`` keeps saved rows the new extraction didn't match.
+    """
+    stats = {"mode": "reconcile" if prune else "reconcile_partial", "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    assigned: List[str] = []
+    removed: Dict[type, List[str]] = {}
+    inserted: List[object] = []
+
+    for kind, (model, text_column, columns) in _KINDS.items():
+        existing = db.query(model).filter(model.meeting_id == meeting_id).all()
+        new = rows.get(kind, [])
+        pairs = match_items(
+            [{"text": getattr(r, text_column), "source_sentence": r.source_sentence} for r in existing],
+            [{"text": v.get(text_column), "source_sentence": v.get("source_sentence")} for v in new],
+        )
+
+        matched_old = set()
+        matched_new = set()
+        for i, j in pairs:
+            row, values = existing[i], new[j]
+            matched_old.add(i)
+            matched_new.add(j)
+            changed = False
+            for column in columns:
+                value = values.get(column)
+                if column == "owner_id" and value is None:
+                    continue  # keep a known owner the new extraction couldn't name
+                if not _same(getattr(row, column), value):
+                    setattr(row, column, value)
+                    changed = True
+                    if column == "owner_id" and model is ActionItem:
+                        assigned.append(row.id)
+            stats["updated" if changed else "unchanged"] += 1
+
+        if prune:
+            removed[model] = [existing[i].id for i in range(len(existing)) if i not in matched_old]
+        for j, values in enumerate(new):
+            if j not in matched_new:
+                obj = model(meeting_id=meeting_id, **values)
+                db.add(obj)
+                inserted.append(obj)
+
+    for model, ids in removed.items():
+        if not ids:
+            continue
+        if model is ActionItem:
+            db.query(Alert).filter(Alert.action_item_id.in_(ids)).delete(synchronize_session=False)
+        stats["deleted"] += db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+
+    stats["inserted"] = len(inserted)
+    db.commit()
+
+    assigned.extend(o.id for o in inserted if isinstance(o, ActionItem) and o.owner_id)
+    stats["assigned_action_item_ids"] = assigned
+    logger.info(
+        f"🔁 Reconciled outcomes for meeting {meeting_id}: "
+        f"+{stats['inserted']} ~{stats['updated']} -{stats['deleted']} ={stats['unchanged']}"
+    )
+    return stats
+
+
+def write_outcomes(
+    db,
+    meeting_id: str,
+    rows: Dict[str, List[dict]],
+    mode: Optional[str] = None,
+    prune: bool = True,
+) -> dict:
+    """Save an extraction with the configured (or given) write mode.
+
+    ``prune=False`` (a partial extraction) always reconciles without
+    deleting, whatever the mode: replacing would drop the lost windows' rows.
+    """
+    if prune and (mode or EXTRACT_WRITE_MODE) == "replace":
+        return replace_outcomes(db, meeting_id, rows)
+    return reconcile_outcomes(db, meeting_id, rows, prune=prune)
@@ -0,0 +1,220 @@
+"""Resolve extracted owner names to users.
+
+The extractor returns owners as free text ("Alice", "alice smith", "Dr. Bob
+O'Neil", "Carol S."). Instead of one exact ``User.name ==`` query per item,
+every name in an extraction is resolved in one pass against the meeting's
+candidate users: its participants, its owner and the owner's colleagues,
+loaded with a single query. Names are normalized (case, accents,
+punctuation, honorifics) and matched, most confident first, on:
+
+1. the full name                                  1.0
+2. the email handle (``asmith``, ``alice.smith``)  0.95
+3. first name + last initial ("Carol S.")          0.9
+4. a first name alone                              0.9
+5. a last name alone                               0.8
+6. fuzzy similarity of the full or first name      ratio × 0.9
+
+A tier that matches several users prefers meeting participants; if that
+still leaves more than one, the name is ambiguous and stays unassigned.
+Names no candidate matches fall back to the old exact ``User.name`` lookup,
+batched into one ``IN`` query. Matches below OWNER_MATCH_MIN_CONFIDENCE are
+discarded — no owner is better than the wrong owner.
+"""
+
+import os
+import re
+import difflib
+import logging
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, select
+
+from app.db.models.user import User
+from app.db.models.meeting import Meeting
+from app.db.models.meeting_participant import MeetingParticipant
+from app.db.models.colleague import Colleague
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+OWNER_MATCH_MIN_CONFIDENCE = float(os.getenv("OWNER_MATCH_MIN_CONFIDENCE", "0.75"))
+OWNER_FUZZY_THRESHOLD = float(os.getenv("OWNER_FUZZY_THRESHOLD", "0.85"))
+
+_HONORIFICS = {"mr", "mrs", "ms", "miss", "mx", "dr", "prof", "sir"}
+
+# A participant wins a tie, at a small cost in confidence
+_TIE_BREAK_PENALTY = 0.05
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+def normalize_name(name) -> str:
+    """Lowercase, strip accents, punctuation and honorifics: "Dr. José O'Neil" → "jose oneil"."""
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"['’`]", "", text)
+    text = re.sub(r"[^\w\s]|_", " ", text)
+    return " ".join(t for t in text.split() if t not in _HONORIFICS)
+
+
+def _handle(email) -> str:
+    """Email local part without separators: "alice.smith+x@..." → "alicesmith"."""
+    local = str(email or "").split("@", 1)[0].split("+", 1)[0]
+    return re.sub(r"[^a-z0-9]", "", local.lower())
+
+
+# ============================================================================
+# Name index
+# ============================================================================
+
+class NameIndex:
+    """In-memory lookup tables over a meeting's candidate users.
+
+    ``candidates`` are dicts with ``id``, ``name``, ``email`` and
+    ``participant`` (whether the user attended the meeting).
+    """
+
+    def __init__(self, candidates: Iterable[dict]):
+        self.users: Dict[str, dict] = {}
+        self.full: Dict[str, List[str]] = {}
+        self.first: Dict[str, List[str]] = {}
+        self.last: Dict[str, List[str]] = {}
+        self.handle: Dict[str, List[str]] = {}
+
+        for user in candidates:
+            user_id = str(user["id"])
+            if user_id in self.users:
+                # Listed twice (owner and participant, say): keep the participant flag
+                self.users[user_id]["participant"] |= bool(user.get("participant"))
+                continue
+            self.users[user_id] = {"id": user_id, "name": user.get("name"), "participant": bool(user.get("participant"))}
+
+            tokens = normalize_name(user.get("name")).split()
+            if tokens:
+                self.full.setdefault(" ".join(tokens), []).append(user_id)
+                self.first.setdefault(tokens[0], []).append(user_id)
+                if len(tokens) > 1:
+                    self.last.setdefault(tokens[-1], []).append(user_id)
+            handle = _handle(user.get("email"))
+            if handle:
+                self.handle.setdefault(handle, []).append(user_id)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def _pick(self, user_ids: List[str], confidence: float, method: str) -> Optional[dict]:
+        """One match from a tier, preferring participants; None if still ambiguous."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if len(user_ids) > 1:
+            attended = [u for u in user_ids if self.users[u]["participant"]]
+            if len(attended) != 1:
+                return None
+            user_ids = attended
+            confidence -= _TIE_BREAK_PENALTY
+        user = self.users[user_ids[0]]
+        return {"user_id": user["id"], "name": user["name"], "confidence": round(confidence, 3), "method": method}
+
+    def _tiers(self, tokens: List[str]):
+        """Yield (user_ids, confidence, method) for each exact tier that matches."""
+        key = " ".join(tokens)
+        if key in self.full:
+            yield self.full[key], 1.0, "exact"
+        compact = "".join(tokens)
+        if compact in self.handle:
+            yield self.handle[compact], 0.95, "email"
+        if len(tokens) == 2 and len(tokens[1]) == 1 and tokens[0] in self.first:
+            initial = [
+                u for u in self.first[tokens[0]]
+                if normalize_name(self.users[u]["name"]).split()[-1].startswith(tokens[1])
+            ]
+            if initial:
+                yield initial, 0.9, "first_initial"
+        if len(tokens) == 1:
+            if key in self.first:
+                yield self.first[key], 0.9, "first_name"
+            if key in self.last:
+                yield self.last[key], 0.8, "last_name"
+
+    def _fuzzy(self, tokens: List[str]) -> Optional[dict]:
+        key = " ".join(tokens)
+        table = self.first if len(tokens) == 1 else self.full
+        scored = []
+        for candidate, user_ids in table.items():
+            ratio = difflib.SequenceMatcher(None, key, candidate).ratio()
+            if ratio >= OWNER_FUZZY_THRESHOLD:
+                scored.append((ratio, user_ids))
+        if not scored:
+            return None
+        scored.sort(key=lambda s: s[0], reverse=True)
+        best = scored[0][0]
+        user_ids = [u for ratio, ids in scored if ratio == best for u in ids]
+        return self._pick(user_ids, best * 0.9, "fuzzy")
+
+    def resolve(self, name) -> Optional[dict]:
+        """Best match for one name: {"user_id", "name", "confidence", "method"}, or None."""
+        tokens = normalize_name(name).split()
+        if not tokens or not self.users:
+            return None
+        for user_ids, confidence, method in self._tiers(tokens):
+            # The first tier that matches decides; an ambiguous "Alice" must
+            # not fall through to a weaker tier that happens to be unique
+            return self._pick(user_ids, confidence, method)
+        return self._fuzzy(tokens)
+
+
+# ============================================================================
+# Resolution
+# ============================================================================
+
+def load_candidates(db, meeting_id: str) -> List[dict]:
+    """Participants, owner and the owner's colleagues of a meeting, in one query."""
+    owner_id = select(Meeting.owner_id).where(Meeting.id == meeting_id).scalar_subquery()
+    participant_ids = select(MeetingParticipant.user_id).where(MeetingParticipant.meeting_id == meeting_id)
+    colleague_ids = select(Colleague.colleague_id).where(Colleague.user_id == owner_id)
+
+    rows = (
+        db.query(User.id, User.name, User.email, User.id.in_(participant_ids).label("participant"))
+        .filter(or_(User.id.in_(participant_ids), User.id == owner_id, User.id.in_(colleague_ids)))
+        .all()
+    )
+    return [{"id": r.id, "name": r.name, "email": r.email, "participant": bool(r.participant)} for r in rows]
+
+
+def resolve_owners(db, meeting_id: str, names: Iterable) -> Dict[str, Optional[dict]]:
+    """Resolve every distinct owner name of an extraction at once.
+
+    Returns {name: match or None}, where a match is {"user_id", "name",
+    "confidence", "method"} with confidence ≥ OWNER_MATCH_MIN_CONFIDENCE.
+    At most two queries run, however many items the extraction has.
+    """
+    names = list(dict.fromkeys(str(n).strip() for n in names if n and str(n).strip()))
+    if not names:
+        return {}
+
+    index = NameIndex(load_candidates(db, meeting_id))
+    resolved: Dict[str, Optional[dict]] = {}
+    for name in names:
+        match = index.resolve(name)
+        resolved[name] = match if match and match["confidence"] >= OWNER_MATCH_MIN_CONFIDENCE else None
+
+    # Owners outside the meeting's circle: exact name anywhere, as before
+    missing = [n for n, match in resolved.items() if match is None]
+    if missing:
+        by_name: Dict[str, List[str]] = {}
+        for user_id, user_name in db.query(User.id, User.name).filter(User.name.in_(missing)).all():
+            by_name.setdefault(user_name, []).append(user_id)
+        for name in missing:
+            user_ids = by_name.get(name, [])
+            if len(user_ids) == 1:
+                resolved[name] = {"user_id": user_ids[0], "name": name, "confidence": 1.0, "method": "exact_global"}
+
+    unresolved = [n for n, match in resolved.items() if match is None]
+    if unresolved:
+        logger.info(f"👤 Unresolved owners in meeting {meeting_id}: {unresolved}")
+    return resolved
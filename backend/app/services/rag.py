@@ -1,23 +1,31 @@
 """RAG service using local embeddings (no OpenAI required).
 
 Features:
-- Local sentence-transformers embeddings (all-MiniLM-L6-v2)
-- ChromaDB vector store for chunk storage and retrieval
+- Local sentence-transformers embeddings (all-MiniLM-L6-v2), loaded lazily
+- Pluggable vector store (ChromaDB, or memory-mapped NumPy when chromadb
+  isn't installed) for chunk storage and retrieval (persistent on disk)
 - Ollama for answer generation
 - Chunking with overlap for better context
+- Hybrid retrieval: BM25 (SQLite FTS5) + vector search fused with RRF
 - Meeting-level indexing and querying
 - Stats and health checks
 """
 
 import os
+import re
 import json
+import time
 import logging
 import hashlib
-from typing import List, Dict, Optional, Any
+import tempfile
+import threading
+from typing import List, Dict, Optional, Any, Callable, Iterator, Tuple
 from datetime import datetime
 
 import httpx
 
+from app.services import llm_client
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -28,83 +36,534 @@ OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 CHUNK_SIZE = int(os.getenv("RAG_CHUNK_SIZE", "500"))
 CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "50"))
+# Chunking strategy (app/services/chunking.py): "turns" packs speaker turns
+# and sentences into RAG_CHUNK_TOKENS model tokens; "words" is the original
+# RAG_CHUNK_SIZE-word window with RAG_CHUNK_OVERLAP words of overlap
+RAG_CHUNKER = os.getenv("RAG_CHUNKER", "turns")
+CHUNK_TOKENS = int(os.getenv("RAG_CHUNK_TOKENS", "224"))
 TOP_K = int(os.getenv("RAG_TOP_K", "5"))
+# Token budget for retrieved context in the Ollama prompt (0 = unlimited);
+# prompt length directly drives CPU generation latency
+CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "1500"))
+
+# Bulk indexing: chunks per encode call, chunks per vector-store upsert,
+# and meetings loaded from the DB per page
+EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "64"))
+UPSERT_BATCH_SIZE = int(os.getenv("RAG_UPSERT_BATCH_SIZE", "1024"))
+INDEX_PAGE_SIZE = int(os.getenv("RAG_INDEX_PAGE_SIZE", "200"))
+
+# Persistent vector store — survives restarts and worker recycles.
+# Set RAG_PERSIST=false to fall back to the in-memory client.
+RAG_PERSIST = os.getenv("RAG_PERSIST", "true").lower() == "true"
+CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
+
+# Chunk-hash → vector cache so unchanged chunks are never re-embedded
+RAG_EMBEDDING_CACHE = os.getenv("RAG_EMBEDDING_CACHE", "true").lower() == "true"
+RAG_EMBEDDING_CACHE_PATH = os.getenv(
+    "RAG_EMBEDDING_CACHE_PATH",
+    os.path.join(CHROMA_PERSIST_DIR, "embedding_cache.sqlite3"),
+)
+
+# Hybrid retrieval: BM25 (SQLite FTS5) fused with vector search via RRF
+RAG_HYBRID = os.getenv("RAG_HYBRID", "true").lower() == "true"
+RAG_LEXICAL_INDEX_PATH = os.getenv(
+    "RAG_LEXICAL_INDEX_PATH",
+    os.path.join(CHROMA_PERSIST_DIR, "lexical_index.sqlite3"),
+)
+HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))
+RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+
+# Extracted decisions / action items / risks indexed as their own small
+# documents; the best-matching facts get an extra RRF ranking at query time
+RAG_INDEX_FACTS = os.getenv("RAG_INDEX_FACTS", "true").lower() == "true"
+FACT_CANDIDATES = int(os.getenv("RAG_FACT_CANDIDATES", "5"))
+FACT_MIN_SIMILARITY = float(os.getenv("RAG_FACT_MIN_SIMILARITY", "0.3"))
+FACT_TYPES = ("decision", "action_item", "risk")
+
+# Two-stage retrieval: one "summary" document per meeting (its decisions,
+# risks and action items, or an extractive abstract when it has none).
+# Questions not scoped to a meeting first pick the RAG_MEETING_CANDIDATES
+# best-matching meetings, then rank chunks only within those
+RAG_MEETING_SUMMARIES = os.getenv("RAG_MEETING_SUMMARIES", "true").lower() == "true"
+MEETING_CANDIDATES = int(os.getenv("RAG_MEETING_CANDIDATES", "8"))
+
+# Semantic answer cache (per worker): same retrieved chunks + similar question
+RAG_ANSWER_CACHE = os.getenv("RAG_ANSWER_CACHE", "true").lower() == "true"
+ANSWER_CACHE_SIZE = int(os.getenv("RAG_ANSWER_CACHE_SIZE", "256"))
+ANSWER_CACHE_TTL = float(os.getenv("RAG_ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_THRESHOLD = float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD", "0.95"))
+
+# Vector store backend: auto (chromadb if installed, else numpy) | chroma | numpy
+RAG_VECTOR_STORE = os.getenv("RAG_VECTOR_STORE", "auto").lower()
+RAG_NUMPY_DTYPE = os.getenv("RAG_NUMPY_DTYPE", "float16")  # float16 | int8
+RAG_NUMPY_STORE_DIR = os.getenv(
+    "RAG_NUMPY_STORE_DIR",
+    os.path.join(CHROMA_PERSIST_DIR, "numpy_store"),
+)
+
+# Shared embedding server (app/services/embedding_server.py); empty = in-process model
+EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET", "")
 
 # ============================================================================
 # Local Embedding Model
 # ============================================================================
 
-_embedding_model = None
-EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 produces 384-dim vectors
+# Loaded lazily (first use or warm_up()); see app/services/embedding_model.py
+from app.services import embedding_model
+# RAG_EMBEDDING_MODEL: what new collections are built with. Queries use the
+# model recorded for the active collection (_active_model) until a
+# migration to the configured one has been swapped in.
+from app.services.embedding_model import MODEL_NAME as EMBEDDING_MODEL_NAME, DEFAULT_MODEL, model_info
+from app.services.embedding_server import EmbeddingClient
+
+# When the embedding server is configured, workers never load the model
+# themselves unless the server is unreachable
+_embedding_client = EmbeddingClient(EMBEDDING_SERVER_SOCKET) if EMBEDDING_SERVER_SOCKET else None
+if _embedding_client is not None:
+    logger.info(f"✅ Using embedding server at {EMBEDDING_SERVER_SOCKET}")
+
+
+def warm_up() -> bool:
+    """Open the vector store and load the active model now, not on the first query."""
+    _sync_active_collection()
+    if _embedding_client is not None and _embedding_client.is_reachable():
+        return True
+    return embedding_model.warm_up(name=_active_model)
 
-try:
-    from sentence_transformers import SentenceTransformer
-    _embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-    logger.info("✅ Loaded local embedding model: all-MiniLM-L6-v2")
-except ImportError:
-    logger.warning("⚠️ sentence-transformers not installed. RAG will be disabled.")
-except Exception as e:
-    logger.error(f"⚠️ Failed to load embedding model: {e}")
 
 # ============================================================================
-# ChromaDB Vector Store
+# Vector Store
 # ============================================================================
 
+# See app/services/vector_store.py; chromadb when installed, NumPy otherwise
+from app.services.vector_store import VectorStore, ChromaVectorStore, NumpyVectorStore
+
+_store: Optional[VectorStore] = None
+_store_load_seconds = 0.0
 _chroma_client = None
-_collection = None
-
-try:
-    import chromadb
-    _chroma_client = chromadb.Client()
-    _collection = _chroma_client.get_or_create_collection(
-        name="meeting_chunks",
-        metadata={"hnsw:space": "cosine"},
+
+# Blue/green collections: readers use the collection named in the pointer
+# file; rebuild_index() fills a new one and swaps the pointer when done
+DEFAULT_COLLECTION = "meeting_chunks"
+RAG_ACTIVE_COLLECTION_PATH = os.getenv(
+    "RAG_ACTIVE_COLLECTION_PATH",
+    os.path.join(CHROMA_PERSIST_DIR, "active_collection.json"),
+)
+RAG_KEEP_COLLECTIONS = int(os.getenv("RAG_KEEP_COLLECTIONS", "1"))  # retired ones kept for rollback
+
+# Embedding model migration: when RAG_EMBEDDING_MODEL differs from the model
+# the active collection was built with, a throttled background rebuild
+# re-embeds everything into a new collection (see start_background_migration)
+RAG_AUTO_MIGRATE = os.getenv("RAG_AUTO_MIGRATE", "true").lower() == "true"
+RAG_MIGRATION_MAX_RATE = float(os.getenv("RAG_MIGRATION_MAX_RATE", "50"))  # chunks/s, 0 = unthrottled
+
+
+def _open_chroma_store(name: str) -> Optional[VectorStore]:
+    global _chroma_client
+    if _chroma_client is None:
+        try:
+            import chromadb
+        except ImportError:
+            if RAG_VECTOR_STORE == "chroma":
+                logger.warning("⚠️ chromadb not installed. RAG will be disabled.")
+            return None
+        if RAG_PERSIST:
+            os.makedirs(CHROMA_PERSIST_DIR, exist_ok=True)
+            _chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+        else:
+            _chroma_client = chromadb.Client()
+    return ChromaVectorStore(_chroma_client, name=name)
+
+
+def _open_numpy_store(name: str, dim: int) -> VectorStore:
+    if not RAG_PERSIST:
+        directory = tempfile.mkdtemp(prefix="ledger-vectors-")
+    elif name == DEFAULT_COLLECTION:
+        directory = RAG_NUMPY_STORE_DIR
+    else:
+        directory = f"{RAG_NUMPY_STORE_DIR}.{name}"
+    return NumpyVectorStore(directory, dim=dim, dtype=RAG_NUMPY_DTYPE)
+
+
+def _open_store(name: str, model: str) -> Optional[VectorStore]:
+    """Open (creating if needed) the named collection of ``model`` vectors."""
+    store = None
+    if RAG_VECTOR_STORE in ("auto", "chroma"):
+        store = _open_chroma_store(name)
+    if store is None and RAG_VECTOR_STORE in ("auto", "numpy"):
+        store = _open_numpy_store(name, model_info(model)["dim"])
+    return store
+
+
+def _read_active_collection() -> Dict[str, Any]:
+    """The pointer file and collection registry.
+
+    {"name", "model", "dim", "previous", "built_at", "chunker",
+    "collections": {name: {"model", "dim", "chunker", "built_at"}}}; a
+    missing file (or field) means the original collection and model.
+    """
+    try:
+        with open(RAG_ACTIVE_COLLECTION_PATH) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {"name": DEFAULT_COLLECTION, "previous": []}
+    state.setdefault("model", DEFAULT_MODEL)
+    state.setdefault("collections", {})
+    return state
+
+
+def _write_active_collection(state: Dict[str, Any]) -> None:
+    """Replace the pointer file atomically, so readers see the old or the new one."""
+    directory = os.path.dirname(os.path.abspath(RAG_ACTIVE_COLLECTION_PATH))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".active_collection.")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, RAG_ACTIVE_COLLECTION_PATH)
+
+
+if RAG_PERSIST:
+    _active_state = _read_active_collection()
+    _active_collection, _active_model = _active_state["name"], _active_state["model"]
+else:
+    # An in-memory index starts empty, so it can use the configured model
+    _active_collection, _active_model = DEFAULT_COLLECTION, EMBEDDING_MODEL_NAME
+
+# The active collection is opened on first use (see _open_active_store), so
+# importing this module never creates anything in CHROMA_PERSIST_DIR
+_store_failed = False
+
+
+def _get_store_size_bytes() -> int:
+    """Total size of the persistent vector store on disk (0 when in-memory)."""
+    if not RAG_PERSIST or not os.path.isdir(CHROMA_PERSIST_DIR):
+        return 0
+    total = 0
+    for root, _dirs, files in os.walk(CHROMA_PERSIST_DIR):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+# ============================================================================
+# Embedding Cache
+# ============================================================================
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+_embedding_cache_failed = False
+
+
+def _get_embedding_cache():
+    """The shared EmbeddingCache, opened on first use; None if disabled."""
+    global _embedding_cache, _embedding_cache_failed
+    if not RAG_EMBEDDING_CACHE or _embedding_cache_failed:
+        return None
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            try:
+                from app.services.embedding_cache import EmbeddingCache
+                _embedding_cache = EmbeddingCache(RAG_EMBEDDING_CACHE_PATH)
+                logger.info(f"✅ Embedding cache ready at {RAG_EMBEDDING_CACHE_PATH}")
+            except Exception as e:
+                _embedding_cache_failed = True
+                logger.error(f"⚠️ Failed to open embedding cache: {e}")
+    return _embedding_cache
+
+
+# ============================================================================
+# Lexical (BM25) Index
+# ============================================================================
+
+_lexical_index = None
+
+
+def rebuild_lexical_index(lexical_index=None, store: Optional[VectorStore] = None) -> int:
+    """Repopulate a BM25 index (default: the active one) from its vector store.
+
+    Returns:
+        Number of chunks indexed
+    """
+    if lexical_index is None:
+        lexical_index, store = _lexical_index, _store
+    if lexical_index is None or store is None:
+        return 0
+    lexical_index.clear()
+    total = 0
+    offset = 0
+    while True:
+        page = store.get(limit=1000, offset=offset)
+        if not page:
+            break
+        lexical_index.add(
+            (c["id"], c["metadata"].get("meeting_id", ""), c["metadata"].get("owner_id", ""), c["document"])
+            for c in page
+            if c["metadata"].get("doc_type") != "summary"
+        )
+        total += len(page)
+        offset += len(page)
+    logger.info(f"✅ Rebuilt lexical index ({total} chunks)")
+    return total
+
+
+def _lexical_index_path(name: str) -> str:
+    if name == DEFAULT_COLLECTION:
+        return RAG_LEXICAL_INDEX_PATH
+    root, ext = os.path.splitext(RAG_LEXICAL_INDEX_PATH)
+    return f"{root}.{name}{ext}"
+
+
+def _open_lexical_index(name: str, store: VectorStore):
+    """Open the BM25 index that belongs to the named collection, or None."""
+    if not RAG_HYBRID:
+        return None
+    try:
+        from app.services.lexical_index import LexicalIndex
+        path = _lexical_index_path(name)
+        lexical_index = LexicalIndex(path)
+        # Backfill once for stores indexed before hybrid retrieval existed
+        if lexical_index.count() == 0 and store.count() > 0:
+            rebuild_lexical_index(lexical_index, store)
+        logger.info(f"✅ Lexical index ready at {path}")
+        return lexical_index
+    except Exception as e:
+        logger.error(f"⚠️ Failed to open lexical index, using vector search only: {e}")
+        return None
+
+
+def _open_active_store() -> None:
+    """Open the active collection and its BM25 index, once, on first use."""
+    global _store, _lexical_index, _store_load_seconds, _store_failed
+    if _store is not None or _store_failed:
+        return
+    with _swap_lock:
+        if _store is not None or _store_failed:
+            return
+        try:
+            started = time.perf_counter()
+            store = _open_store(_active_collection, _active_model)
+            if store is None:
+                _store_failed = True
+                return
+            # count() forces the on-disk segments to load, so the timing is honest
+            existing_chunks = store.count()
+            _store_load_seconds = time.perf_counter() - started
+            if RAG_PERSIST:
+                logger.info(
+                    f"✅ {store.backend} vector store loaded from {CHROMA_PERSIST_DIR} "
+                    f"[{_active_collection}, {_active_model}] ({existing_chunks} chunks in {_store_load_seconds:.2f}s)"
+                )
+            else:
+                logger.info(f"✅ {store.backend} vector store ready (in-memory)")
+        except Exception as e:
+            _store_failed = True
+            logger.error(f"⚠️ Failed to initialize vector store: {e}")
+            return
+        # Readers check _store without the lock, so it is published last
+        _lexical_index = _open_lexical_index(_active_collection, store)
+        _store = store
+
+
+# ============================================================================
+# Answer Cache
+# ============================================================================
+
+_answer_cache = None
+
+if RAG_ANSWER_CACHE:
+    from app.services.answer_cache import AnswerCache
+    _answer_cache = AnswerCache(
+        max_entries=ANSWER_CACHE_SIZE,
+        ttl_seconds=ANSWER_CACHE_TTL,
+        threshold=ANSWER_CACHE_THRESHOLD,
+    )
+
+
+def _answer_cache_key(search_results: List[Dict[str, Any]]) -> tuple:
+    """Cache key: LLM model plus the exact set of retrieved chunk versions."""
+    chunks = frozenset(
+        (r.get("id", ""), (r.get("metadata") or {}).get("indexed_at", ""))
+        for r in search_results
     )
-    logger.info("✅ ChromaDB collection ready")
-except ImportError:
-    logger.warning("⚠️ chromadb not installed. RAG will be disabled.")
-except Exception as e:
-    logger.error(f"⚠️ Failed to initialize ChromaDB: {e}")
+    return (OLLAMA_MODEL, chunks)
+
+
+def _result_meeting_ids(search_results: List[Dict[str, Any]]) -> List[str]:
+    return [(r.get("metadata") or {}).get("meeting_id", "") for r in search_results]
+
+
+def _invalidate_answers(meeting_ids: List[str]) -> None:
+    if _answer_cache is not None and meeting_ids:
+        _answer_cache.invalidate_meetings(meeting_ids)
+
+
+# ============================================================================
+# Blue/Green Collection Swap
+# ============================================================================
+
+# Reentrant: the final catch-up of rebuild_index runs under it and may
+# reach _sync_active_collection through the indexing helpers
+_swap_lock = threading.RLock()
+_active_mtime: Optional[int] = None
+
+
+def _activate_collection(name: str, model: str, store: VectorStore, lexical_index) -> None:
+    """Point this process's readers and writers at another collection.
+
+    Queries are embedded with ``model`` from now on, so they always match
+    the vectors of the collection they search.
+    """
+    global _store, _lexical_index, _active_collection, _active_model
+    _store, _lexical_index, _active_collection, _active_model = store, lexical_index, name, model
+    if _answer_cache is not None:
+        _answer_cache.clear()
+    logger.info(f"🔀 Switched RAG index to collection {name} ({model})")
+
+
+def _sync_active_collection() -> None:
+    """Follow a collection swap made by another process (one stat() per call).
+
+    Also opens the active collection on the first call.
+    """
+    global _active_mtime
+    _open_active_store()
+    if not RAG_PERSIST:
+        return
+    try:
+        mtime = os.stat(RAG_ACTIVE_COLLECTION_PATH).st_mtime_ns
+    except OSError:
+        return
+    if mtime == _active_mtime:
+        return
+    with _swap_lock:
+        if mtime == _active_mtime:
+            return
+        state = _read_active_collection()
+        name, model = state["name"], state["model"]
+        if name != _active_collection:
+            try:
+                store = _open_store(name, model)
+                if store is None:
+                    return
+                _activate_collection(name, model, store, _open_lexical_index(name, store))
+            except Exception as e:
+                logger.error(f"Failed to open collection {name}, staying on {_active_collection}: {e}")
+                return
+        _active_mtime = mtime
 
 
 def is_rag_available() -> bool:
-    """Check if RAG system is available."""
-    return _embedding_model is not None and _collection is not None
+    """Check if RAG system is available (following any collection swap first)."""
+    _sync_active_collection()
+    return _embeddings_available() and _store is not None
+
+
+def _embeddings_available() -> bool:
+    return (_embedding_client is not None and _embedding_client.is_reachable()) \
+        or embedding_model.is_available(_active_model)
 
 
 # ============================================================================
 # Embedding Functions
 # ============================================================================
 
-def get_embedding(text: str) -> List[float]:
-    """Generate embedding using local sentence-transformers model."""
-    if _embedding_model is None:
-        logger.error("No embedding model available.")
-        return [0.0] * EMBEDDING_DIM
+def _encode(texts: List[str], model: str) -> Optional[List[List[float]]]:
+    """Embed via the shared server, falling back to the in-process model."""
+    if _embedding_client is not None:
+        try:
+            return _embedding_client.embed(texts, model=model)
+        except Exception as e:
+            logger.warning(f"Embedding server unavailable ({e}); using in-process model")
+    encoder = embedding_model.get_model(model)
+    if encoder is None:
+        return None
+    return [emb.tolist() for emb in encoder.encode(texts)]
+
+
+def get_embedding(text: str, model: Optional[str] = None) -> List[float]:
+    """Generate embedding using local sentence-transformers model.
+
+    ``model`` defaults to the active collection's model, so query vectors
+    always match the indexed ones.
+    """
+    model = model or _active_model
     try:
-        return _embedding_model.encode(text).tolist()
+        embeddings = _encode([text], model)
     except Exception as e:
         logger.error(f"Embedding generation failed: {e}")
-        return [0.0] * EMBEDDING_DIM
+        return [0.0] * model_info(model)["dim"]
+    if embeddings is None:
+        logger.error("No embedding model available.")
+        return [0.0] * model_info(model)["dim"]
+    return embeddings[0]
 
 
-def get_embedding_batch(texts: List[str]) -> List[List[float]]:
+def get_embedding_batch(texts: List[str], model: Optional[str] = None) -> List[List[float]]:
     """Generate embeddings for multiple texts in a single batch."""
-    if _embedding_model is None:
-        logger.error("No embedding model available.")
-        return [[0.0] * EMBEDDING_DIM for _ in texts]
+    model = model or _active_model
     try:
-        embeddings = _embedding_model.encode(texts)
-        return [emb.tolist() for emb in embeddings]
+        embeddings = _encode(texts, model)
     except Exception as e:
         logger.error(f"Batch embedding generation failed: {e}")
-        return [[0.0] * EMBEDDING_DIM for _ in texts]
+        return [[0.0] * model_info(model)["dim"] for _ in texts]
+    if embeddings is None:
+        logger.error("No embedding model available.")
+        return [[0.0] * model_info(model)["dim"] for _ in texts]
+    return embeddings
+
+
+def get_embedding_batch_cached(texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+    """Like get_embedding_batch, but only encodes texts missing from the cache.
+
+    Vectors are looked up by content hash and model, so an unchanged chunk
+    is never re-embedded no matter which meeting or position it belongs to.
+    """
+    model = model or _active_model
+    cache = _get_embedding_cache()
+    if cache is None or not texts:
+        return get_embedding_batch(texts, model)
+
+    from app.services.embedding_cache import hash_text
+
+    hashes = [hash_text(t) for t in texts]
+    try:
+        cached = cache.get_many(model, hashes)
+    except Exception as e:
+        logger.error(f"Embedding cache lookup failed: {e}")
+        return get_embedding_batch(texts, model)
+
+    # Encode each distinct missing text once
+    missing = {}
+    for h, text in zip(hashes, texts):
+        if h not in cached and h not in missing:
+            missing[h] = text
+
+    if missing:
+        fresh = get_embedding_batch(list(missing.values()), model)
+        new_entries = {}
+        for h, vector in zip(missing.keys(), fresh):
+            cached[h] = vector
+            # Don't persist the zero-vector fallback from a failed encode
+            if any(vector):
+                new_entries[h] = vector
+        try:
+            cache.put_many(model, new_entries)
+        except Exception as e:
+            logger.error(f"Embedding cache write failed: {e}")
+
+    return [cached[h] for h in hashes]
 
 
 # ============================================================================
 # Chunking
 # ============================================================================
 
+from app.services.chunking import CHUNKERS, chunk_transcript, chunk_words
+
+
 def chunk_text(text: str, chunk_size: int = None, overlap: int = None) -> List[str]:
     """Split text into overlapping chunks by word count.
 
@@ -116,22 +575,42 @@ def chunk_text(text: str, chunk_size: int = None, overlap: int = None) -> List[s
     Returns:
         List of text chunks
     """
-    if chunk_size is None:
-        chunk_size = CHUNK_SIZE
-    if overlap is None:
-        overlap = CHUNK_OVERLAP
+    return chunk_words(
+        text,
+        CHUNK_SIZE if chunk_size is None else chunk_size,
+        CHUNK_OVERLAP if overlap is None else overlap,
+    )
+
+
+def _chunk_token_budget(model: Optional[str] = None) -> int:
+    """Tokens per chunk and per summary for ``model``.
+
+    RAG_CHUNK_TOKENS, capped to the encoder's max_seq_tokens less the
+    [CLS]/[SEP] pair, so a model with a shorter window
+    (paraphrase-MiniLM-L3-v2: 128) never silently truncates a chunk.
+    """
+    try:
+        max_seq = embedding_model.model_info(model or _active_model)["max_seq_tokens"]
+    except ValueError:
+        return CHUNK_TOKENS
+    return max(min(CHUNK_TOKENS, max_seq - 2), 1)
 
-    words = text.split()
-    if not words:
-        return []
 
-    chunks = []
-    step = max(chunk_size - overlap, 1)
-    for i in range(0, len(words), step):
-        chunk = " ".join(words[i : i + chunk_size])
-        if chunk.strip():
-            chunks.append(chunk.strip())
-    return chunks
+def _chunk_transcript(text: str, chunker: Optional[str] = None, model: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Chunk a transcript with the given (or configured) strategy.
+
+    Token budgets are counted with ``model``'s tokenizer (default: the
+    active collection's model) and capped to its encoder window.
+    """
+    model = model or _active_model
+    return chunk_transcript(
+        text,
+        chunker or RAG_CHUNKER,
+        max_tokens=_chunk_token_budget(model),
+        count_tokens=lambda t: embedding_model.count_tokens(t, name=model),
+        chunk_size=CHUNK_SIZE,
+        overlap=CHUNK_OVERLAP,
+    )
 
 
 def chunk_text_by_sentences(text: str, max_chunk_size: int = 1000) -> List[str]:
@@ -171,14 +650,46 @@ def _generate_chunk_id(meeting_id: int, chunk_index: int) -> str:
     return f"meeting-{meeting_id}-chunk-{chunk_index}"
 
 
+def _build_chunk_metadatas(
+    meeting_id,
+    chunks: List[Dict[str, Any]],
+    meeting_title: str = "",
+    meeting_date: str = "",
+    participants: str = "",
+    owner_id: Optional[str] = None,
+    chunker: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Metadata stored with each chunk of a meeting (chunks from _chunk_transcript)."""
+    indexed_at = datetime.utcnow().isoformat()
+    return [
+        {
+            "meeting_id": str(meeting_id),
+            "meeting_title": meeting_title or "",
+            "meeting_date": meeting_date or "",
+            "participants": participants or "",
+            "owner_id": str(owner_id or ""),
+            "doc_type": "transcript",
+            "chunk_index": i,
+            "total_chunks": len(chunks),
+            "chunker": chunker or RAG_CHUNKER,
+            "start_time": chunk["start"] or "",
+            "speakers": ", ".join(chunk["speakers"]),
+            "indexed_at": indexed_at,
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
 def index_transcript(
     meeting_id: int,
     transcript_text: str,
     meeting_title: str = "",
     meeting_date: str = "",
     participants: str = "",
+    owner_id: Optional[str] = None,
+    chunker: Optional[str] = None,
 ) -> int:
-    """Index a single transcript's chunks into ChromaDB.
+    """Index a single transcript's chunks into the vector store.
 
     Args:
         meeting_id: Database ID of the meeting
@@ -186,6 +697,8 @@ def index_transcript(
         meeting_title: Title of the meeting
         meeting_date: Date of the meeting (ISO format)
         participants: Comma-separated list of participants
+        owner_id: User who owns the meeting; searches are scoped to it
+        chunker: Chunking strategy ("turns" or "words"; default RAG_CHUNKER)
 
     Returns:
         Number of chunks indexed
@@ -198,39 +711,43 @@ def index_transcript(
         logger.info(f"Empty transcript for meeting {meeting_id}, skipping.")
         return 0
 
-    # Remove old chunks for this meeting first
-    delete_meeting_chunks(meeting_id)
+    # Remove old chunks for this meeting first (its indexed facts stay)
+    _delete_chunks_for_meetings([meeting_id])
 
     # Create chunks
-    chunks = chunk_text(transcript_text)
-    if not chunks:
+    chunked = _chunk_transcript(transcript_text, chunker)
+    if not chunked:
         return 0
+    chunks = [c["text"] for c in chunked]
 
-    # Generate embeddings
-    embeddings = get_embedding_batch(chunks)
+    # Generate embeddings (unchanged chunks come from the cache)
+    embeddings = get_embedding_batch_cached(chunks)
 
     # Prepare metadata
     ids = [_generate_chunk_id(meeting_id, i) for i in range(len(chunks))]
-    metadatas = [
-        {
-            "meeting_id": str(meeting_id),
-            "meeting_title": meeting_title or "",
-            "meeting_date": meeting_date or "",
-            "participants": participants or "",
-            "chunk_index": i,
-            "total_chunks": len(chunks),
-            "indexed_at": datetime.utcnow().isoformat(),
-        }
-        for i in range(len(chunks))
-    ]
+    metadatas = _build_chunk_metadatas(
+        meeting_id,
+        chunked,
+        meeting_title=meeting_title,
+        meeting_date=meeting_date,
+        participants=participants,
+        owner_id=owner_id,
+        chunker=chunker,
+    )
 
     try:
-        _collection.upsert(
+        _store.upsert(
             ids=ids,
             embeddings=embeddings,
             documents=chunks,
             metadatas=metadatas,
         )
+        if _lexical_index is not None:
+            _lexical_index.add(
+                (cid, str(meeting_id), str(owner_id or ""), doc) for cid, doc in zip(ids, chunks)
+            )
+        _index_summaries([meeting_id])
+        _invalidate_answers([str(meeting_id)])
         logger.info(f"✅ Indexed {len(chunks)} chunks for meeting {meeting_id} ({meeting_title})")
         return len(chunks)
     except Exception as e:
@@ -238,129 +755,1152 @@ def index_transcript(
         return 0
 
 
-# ...existing code...
+def _iter_transcript_pages(
+    db,
+    page_size: int = None,
+    owner_id: Optional[str] = None,
+    meeting_ids: Optional[List[str]] = None,
+):
+    """Stream meetings with transcripts from the DB, one page at a time.
+
+    Only meeting ids are loaded up front; transcript text is fetched per page
+    so memory stays bounded on large tenants.
+
+    Yields:
+        Lists of {"meeting", "transcript_id", "text"} dicts. Meetings with
+        several transcript rows have them joined in creation order.
+    """
+    from app.db.models.meeting import Meeting
+    from app.db.models.transcript import Transcript
+
+    if page_size is None:
+        page_size = INDEX_PAGE_SIZE
+
+    query = db.query(Transcript.meeting_id)
+    if owner_id is not None:
+        query = query.join(Meeting, Meeting.id == Transcript.meeting_id).filter(Meeting.owner_id == owner_id)
+    if meeting_ids is not None:
+        query = query.filter(Transcript.meeting_id.in_(meeting_ids))
+    meeting_ids = [row[0] for row in query.distinct().order_by(Transcript.meeting_id).all()]
+
+    for start in range(0, len(meeting_ids), page_size):
+        page_ids = meeting_ids[start : start + page_size]
+        meetings = {
+            m.id: m for m in db.query(Meeting).filter(Meeting.id.in_(page_ids)).all()
+        }
+        rows = (
+            db.query(Transcript.id, Transcript.meeting_id, Transcript.content)
+            .filter(Transcript.meeting_id.in_(page_ids))
+            .order_by(Transcript.meeting_id, Transcript.created_at)
+            .all()
+        )
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for transcript_id, meeting_id, content in rows:
+            if not content or not content.strip() or meeting_id not in meetings:
+                continue
+            entry = grouped.setdefault(meeting_id, {"transcript_id": transcript_id, "parts": []})
+            entry["transcript_id"] = transcript_id  # latest row wins
+            entry["parts"].append(content)
+
+        yield [
+            {
+                "meeting": meetings[meeting_id],
+                "transcript_id": e["transcript_id"],
+                "text": "\n\n".join(e["parts"]),
+            }
+            for meeting_id, e in grouped.items()
+        ]
+
+
+def load_meeting_transcript(db, meeting_id) -> Optional[Dict[str, Any]]:
+    """One meeting's transcript text, assembled exactly as bulk indexing does.
+
+    Every indexing path goes through this (or _iter_transcript_pages), so
+    the text that is chunked and the watermark hash agree however the
+    meeting was indexed.
+
+    Returns:
+        {"meeting", "transcript_id", "text"}, or None when the meeting has
+        no non-empty transcript
+    """
+    for page in _iter_transcript_pages(db, meeting_ids=[meeting_id]):
+        if page:
+            return page[0]
+    return None
+
+
+def _meeting_metadata(meeting) -> Dict[str, str]:
+    """Title, date, participants string and owner stored alongside each chunk."""
+    title = meeting.title or f"Meeting {meeting.id}"
+    date_str = ""
+    if hasattr(meeting, "date") and meeting.date:
+        date_str = str(meeting.date)
+    elif hasattr(meeting, "created_at") and meeting.created_at:
+        date_str = str(meeting.created_at)
+
+    participants_str = ""
+    if hasattr(meeting, "participants") and meeting.participants:
+        try:
+            participants_str = ", ".join(
+                [getattr(p, "name", None) or getattr(p, "email", "") or ""
+                 for p in meeting.participants]
+            )
+        except Exception:
+            pass
+
+    return {
+        "meeting_title": title,
+        "meeting_date": date_str,
+        "participants": participants_str,
+        "owner_id": getattr(meeting, "owner_id", None) or "",
+    }
+
+
+# Bump when the chunk layout or metadata changes: every watermark then
+# mismatches and the next incremental /index-all rewrites all meetings
+# (cheaply — unchanged chunk texts still hit the embedding cache).
+# The chunker is hashed too, so switching strategy re-chunks every meeting.
+INDEX_FORMAT_VERSION = "6"  # 2: owner_id in chunk metadata; 3: chunker metadata; 4: facts; 5: summaries; 6: summary ids
 
 
-def index_all_transcripts(db) -> dict:
-    """Index all transcripts in the database.
+def _watermark_hash(transcript_text: str, chunker: Optional[str] = None) -> str:
+    from app.services.embedding_cache import hash_text
+    return hash_text(f"v{INDEX_FORMAT_VERSION}:{chunker or RAG_CHUNKER}\n{transcript_text}")
+
+
+def mark_indexed(
+    db,
+    meeting_id,
+    transcript_text: str,
+    chunk_count: int,
+    transcript_id: Optional[str] = None,
+    chunker: Optional[str] = None,
+) -> None:
+    """Record the index watermark for a meeting so incremental runs skip it.
 
     Args:
         db: SQLAlchemy database session
+        meeting_id: Database ID of the meeting
+        transcript_text: The exact text that was indexed
+        chunk_count: Number of chunks written
+        transcript_id: ID of the (latest) transcript row that was indexed
+        chunker: Chunking strategy the text was indexed with
+    """
+    from app.db.models.rag_index_state import RagIndexState
+
+    state = db.query(RagIndexState).filter(RagIndexState.meeting_id == meeting_id).first()
+    if state is None:
+        state = RagIndexState(meeting_id=meeting_id)
+        db.add(state)
+    state.transcript_id = transcript_id
+    state.content_hash = _watermark_hash(transcript_text, chunker)
+    state.chunk_count = chunk_count
+    state.indexed_at = datetime.utcnow()
+    db.commit()
+
+
+def clear_index_state(db, meeting_id=None, owner_id: Optional[str] = None) -> None:
+    """Forget index watermarks for one meeting, one owner's meetings, or all."""
+    from app.db.models.meeting import Meeting
+    from app.db.models.rag_index_state import RagIndexState
+
+    query = db.query(RagIndexState)
+    if meeting_id is not None:
+        query = query.filter(RagIndexState.meeting_id == meeting_id)
+    if owner_id is not None:
+        owned = db.query(Meeting.id).filter(Meeting.owner_id == owner_id)
+        query = query.filter(RagIndexState.meeting_id.in_(owned.scalar_subquery()))
+    query.delete(synchronize_session=False)
+    db.commit()
+
+
+def _touch_index_state(db, meeting_id) -> None:
+    """Move a meeting's watermark time forward without changing its hash.
+
+    Writes that don't go through mark_indexed (facts) use this so that
+    rebuild_index's catch-up, which looks at indexed_at, sees the meeting.
+    A meeting without a watermark gets one that matches no transcript, so
+    the next incremental run indexes it as well.
+    """
+    from app.db.models.rag_index_state import RagIndexState
+
+    touched = (
+        db.query(RagIndexState)
+        .filter(RagIndexState.meeting_id == meeting_id)
+        .update({"indexed_at": datetime.utcnow()}, synchronize_session=False)
+    )
+    if not touched:
+        db.add(RagIndexState(meeting_id=meeting_id, content_hash="", chunk_count=0, indexed_at=datetime.utcnow()))
+    db.commit()
+
+
+# ============================================================================
+# Extracted Facts
+# ============================================================================
+
+def _generate_fact_id(meeting_id, doc_type: str, item_id) -> str:
+    """Generate a unique ID for an extracted fact."""
+    return f"meeting-{meeting_id}-{doc_type}-{item_id}"
+
+
+def _fact_records(db, meeting_ids: List[str]) -> List[Dict[str, Any]]:
+    """One small document per Decision, ActionItem and Risk of the meetings.
+
+    Returns:
+        List of {"id", "document", "metadata"} dicts
+    """
+    from app.db.models.meeting import Meeting
+    from app.db.models.decision import Decision
+    from app.db.models.action_item import ActionItem
+    from app.db.models.risk import Risk
+    from app.db.models.user import User
+
+    meetings = {
+        str(m.id): _meeting_metadata(m)
+        for m in db.query(Meeting).filter(Meeting.id.in_(meeting_ids)).all()
+    }
+    if not meetings:
+        return []
+
+    decisions = db.query(Decision).filter(Decision.meeting_id.in_(meetings)).all()
+    actions = db.query(ActionItem).filter(ActionItem.meeting_id.in_(meetings)).all()
+    risks = db.query(Risk).filter(Risk.meeting_id.in_(meetings)).all()
+
+    assignee_ids = {r.owner_id for r in decisions + actions if r.owner_id}
+    names = {}
+    if assignee_ids:
+        names = {u.id: u.name or u.email for u in db.query(User).filter(User.id.in_(assignee_ids)).all()}
+
+    indexed_at = datetime.utcnow().isoformat()
+    records = []
+
+    def add(row, doc_type: str, document: str, assignee: str = "", due_date: str = "") -> None:
+        records.append({
+            "id": _generate_fact_id(row.meeting_id, doc_type, row.id),
+            "document": document,
+            "meeting_id": str(row.meeting_id),
+            "metadata": {
+                "meeting_id": str(row.meeting_id),
+                **meetings[str(row.meeting_id)],
+                "owner_id": str(meetings[str(row.meeting_id)]["owner_id"] or ""),
+                "doc_type": doc_type,
+                "item_id": str(row.id),
+                "assignee": assignee,
+                "due_date": due_date,
+                "indexed_at": indexed_at,
+            },
+        })
+
+    for d in decisions:
+        if not (d.summary or "").strip():
+            continue
+        assignee = names.get(d.owner_id, "")
+        text = f"Decision: {d.summary.strip()}"
+        if assignee:
+            text += f" (owner: {assignee})"
+        add(d, "decision", text, assignee=assignee)
+
+    for a in actions:
+        if not (a.description or "").strip():
+            continue
+        assignee = names.get(a.owner_id, "")
+        due = a.due_date.date().isoformat() if a.due_date else ""
+        text = f"Action item: {a.description.strip()}"
+        if assignee:
+            text += f" (owner: {assignee})"
+        if due:
+            text += f" (due: {due})"
+        add(a, "action_item", text, assignee=assignee, due_date=due)
+
+    for r in risks:
+        if not (r.description or "").strip():
+            continue
+        add(r, "risk", f"Risk: {r.description.strip()}")
+
+    return records
+
+
+def _index_facts(
+    db,
+    meeting_ids: List[str],
+    store: Optional[VectorStore] = None,
+    lexical_index=None,
+    model: Optional[str] = None,
+) -> int:
+    """Replace the indexed facts of a set of meetings; returns facts written.
+
+    Writes to the active collection unless ``store`` (and its
+    ``lexical_index`` and embedding ``model``) are given.
+    """
+    if store is None:
+        store, lexical_index, model = _store, _lexical_index, _active_model
+    if store is None or not meeting_ids:
+        return 0
+    meeting_ids = [str(m) for m in meeting_ids]
+    try:
+        old_ids = [c["id"] for c in store.get(where={"meeting_id": meeting_ids, "doc_type": list(FACT_TYPES)})]
+        if old_ids:
+            store.delete(ids=old_ids)
+            if lexical_index is not None:
+                lexical_index.delete_ids(old_ids)
+
+        records = _fact_records(db, meeting_ids)
+        if records:
+            documents = [r["document"] for r in records]
+            store.upsert(
+                ids=[r["id"] for r in records],
+                embeddings=get_embedding_batch_cached(documents, model),
+                documents=documents,
+                metadatas=[r["metadata"] for r in records],
+            )
+            if lexical_index is not None:
+                lexical_index.add(
+                    (r["id"], r["meeting_id"], r["metadata"]["owner_id"], r["document"]) for r in records
+                )
+        _invalidate_answers(meeting_ids)
+        return len(records)
+    except Exception as e:
+        logger.error(f"Failed to index facts for {len(meeting_ids)} meetings: {e}")
+        return 0
+
+
+def index_meeting_facts(db, meeting_id) -> int:
+    """Index a meeting's decisions, action items and risks as RAG documents.
+
+    Each row becomes one compact document ("Decision: ...", "Action item:
+    ... (owner: Bob) (due: 2024-03-01)", "Risk: ...") with ``doc_type``,
+    ``item_id``, ``assignee`` and ``due_date`` metadata, replacing whatever
+    was indexed for the meeting before. Called by process_transcript after
+    every extraction. The meeting's watermark time is bumped, so a
+    blue/green rebuild running meanwhile catches the new facts up.
+
+    Args:
+        db: SQLAlchemy database session
+        meeting_id: Database ID of the meeting
+
+    Returns:
+        Number of facts indexed
+    """
+    if not RAG_INDEX_FACTS or not is_rag_available():
+        return 0
+    count = _index_facts(db, [meeting_id])
+    _index_summaries([meeting_id])
+    try:
+        _touch_index_state(db, meeting_id)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to bump index state for meeting {meeting_id}: {e}")
+    logger.info(f"✅ Indexed {count} facts for meeting {meeting_id}")
+    return count
+
+
+# ============================================================================
+# Meeting Summaries
+# ============================================================================
+
+# Order of facts in a summary; action items are the most numerous and
+# least distinctive, so they are the first to fall outside the budget
+_SUMMARY_FACT_ORDER = ("decision", "risk", "action_item")
+
+
+def _generate_summary_id(meeting_id) -> str:
+    """Generate the ID of a meeting's summary (same prefix as its chunks and facts)."""
+    return f"meeting-{meeting_id}-summary"
+
+
+def _summary_document(
+    meta: Dict[str, Any],
+    facts: List[str],
+    chunks: List[str],
+    count_tokens: Callable[[str], int],
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Meeting header plus its facts, or the opening sentence of every chunk.
+
+    Packed into ``max_tokens`` (default: the active model's chunk budget)
+    so the whole summary fits the encoder window.
+    """
+    if max_tokens is None:
+        max_tokens = _chunk_token_budget()
+    header = f"Meeting: {meta.get('meeting_title', '')}"
+    if meta.get("meeting_date"):
+        header += f" ({meta['meeting_date']})"
+    lines = [header]
+    if meta.get("participants"):
+        lines.append(f"Participants: {meta['participants']}")
+
+    if facts:
+        body = facts
+    else:
+        body = []
+        for chunk in chunks:
+            first = re.split(r"(?<=[.!?])\s+", chunk.strip().split("\n", 1)[0], maxsplit=1)[0]
+            if first:
+                body.append(first)
+
+    used = count_tokens("\n".join(lines))
+    for line in body:
+        cost = count_tokens(line)
+        if used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+
+def _index_summaries(meeting_ids: List[str], store: Optional[VectorStore] = None, model: Optional[str] = None) -> int:
+    """Rebuild the summary documents of a set of meetings from what is indexed.
+
+    The summary is built from the meeting's indexed facts and transcript
+    chunks, so no database access is needed. Summaries are kept out of the
+    BM25 index and out of chunk rankings; they are only used to pick
+    meetings (see _select_meetings).
+
+    Returns:
+        Number of summaries written
+    """
+    if store is None:
+        store, model = _store, _active_model
+    if not RAG_MEETING_SUMMARIES or store is None or not meeting_ids:
+        return 0
+    meeting_ids = [str(m) for m in meeting_ids]
+    try:
+        found = store.get(where={"meeting_id": meeting_ids, "doc_type": ["transcript", *FACT_TYPES]})
+        by_meeting: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in found:
+            by_meeting.setdefault(doc["metadata"].get("meeting_id", ""), []).append(doc)
+
+        # Meetings with nothing left to summarize lose their summary
+        # (by doc_type, which also catches summaries stored under an older id)
+        empty = [m for m in meeting_ids if m not in by_meeting]
+        if empty:
+            store.delete(where={"meeting_id": empty, "doc_type": "summary"})
+
+        count_tokens = lambda text: embedding_model.count_tokens(text, name=model)
+        indexed_at = datetime.utcnow().isoformat()
+        records = []
+        for meeting_id, docs in by_meeting.items():
+            chunks = sorted(
+                (d for d in docs if d["metadata"].get("doc_type") == "transcript"),
+                key=lambda d: int(d["metadata"].get("chunk_index", 0)),
+            )
+            facts = sorted(
+                (d for d in docs if d["metadata"].get("doc_type") in FACT_TYPES),
+                key=lambda d: _SUMMARY_FACT_ORDER.index(d["metadata"]["doc_type"]),
+            )
+            meta = docs[0]["metadata"]
+            records.append({
+                "id": _generate_summary_id(meeting_id),
+                "document": _summary_document(
+                    meta,
+                    [f["document"] for f in facts],
+                    [c["document"] for c in chunks],
+                    count_tokens,
+                    _chunk_token_budget(model),
+                ),
+                "metadata": {
+                    "meeting_id": meeting_id,
+                    "meeting_title": meta.get("meeting_title", ""),
+                    "meeting_date": meta.get("meeting_date", ""),
+                    "participants": meta.get("participants", ""),
+                    "owner_id": meta.get("owner_id", ""),
+                    "doc_type": "summary",
+                    "source": "facts" if facts else "abstract",
+                    "indexed_at": indexed_at,
+                },
+            })
+        if records:
+            documents = [r["document"] for r in records]
+            store.upsert(
+                ids=[r["id"] for r in records],
+                embeddings=get_embedding_batch_cached(documents, model),
+                documents=documents,
+                metadatas=[r["metadata"] for r in records],
+            )
+        return len(records)
+    except Exception as e:
+        logger.error(f"Failed to index summaries for {len(meeting_ids)} meetings: {e}")
+        return 0
+
+
+# ============================================================================
+# Bulk Indexing Pipeline
+# ============================================================================
+
+_index_progress: Dict[str, Any] = {"running": False}
+
+
+def get_index_progress() -> dict:
+    """Progress of the current (or last) bulk indexing run in this process."""
+    return dict(_index_progress)
+
+
+class BulkIndexPipeline:
+    """Cross-meeting embedding pipeline used by index_all_transcripts.
+
+    Chunks from many meetings are packed into fixed-size encode batches so
+    small meetings don't produce tiny, inefficient model calls, and encoded
+    chunks are written to the vector store in large upserts. A meeting's
+    watermark is only recorded once all of its chunks have been written
+    (at once for a transcript that yields no chunks).
+
+    ``max_chunks_per_second`` throttles encoding so a background migration
+    leaves CPU for queries and extraction.
+    """
+
+    def __init__(
+        self,
+        db,
+        embed_batch_size: int = None,
+        upsert_batch_size: int = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        chunker: Optional[str] = None,
+        store: Optional[VectorStore] = None,
+        lexical_index=None,
+        defer_watermarks: bool = False,
+        model: Optional[str] = None,
+        max_chunks_per_second: Optional[float] = None,
+    ):
+        self.db = db
+        self.chunker = chunker or RAG_CHUNKER
+        # Target collection: the active one, or a shadow one being rebuilt
+        self.store, self.lexical_index = (store, lexical_index) if store is not None else (_store, _lexical_index)
+        self.model = model or _active_model
+        self.max_chunks_per_second = max_chunks_per_second or None
+        # Shadow rebuilds record watermarks only after the swap
+        self.defer_watermarks = defer_watermarks
+        self.deferred_watermarks: Dict[str, Dict[str, Any]] = {}
+        self.embed_batch_size = max(embed_batch_size or EMBED_BATCH_SIZE, 1)
+        self.upsert_batch_size = max(upsert_batch_size or UPSERT_BATCH_SIZE, self.embed_batch_size)
+        self.progress_callback = progress_callback
+
+        self._queued: List[Dict[str, Any]] = []   # chunked, not yet encoded
+        self._encoded: List[Dict[str, Any]] = []  # encoded, not yet upserted
+        self._remaining: Dict[str, int] = {}      # meeting_id -> chunks not yet written
+        self._watermarks: Dict[str, Dict[str, Any]] = {}
+        self._failed: set = set()
+
+        self.meetings_indexed = 0
+        self.chunks_written = 0
+        self.facts_written = 0
+        self.summaries_written = 0
+        self.encode_batches = 0
+        self.chunks_encoded = 0
+        self.throttled_seconds = 0.0
+        self.errors: List[str] = []
+        self._started = time.perf_counter()
+
+    # -- feeding ------------------------------------------------------------
+
+    def add_meetings(self, entries: List[Dict[str, Any]]) -> None:
+        """Queue a page of {"meeting", "transcript_id", "text"} entries."""
+        if not entries:
+            return
+
+        meeting_ids = [str(e["meeting"].id) for e in entries]
+        _delete_chunks_for_meetings(meeting_ids, self.store, self.lexical_index)
+        if RAG_INDEX_FACTS:
+            self.facts_written += _index_facts(self.db, meeting_ids, self.store, self.lexical_index, self.model)
+
+        empty = []
+        for entry in entries:
+            meeting = entry["meeting"]
+            chunked = _chunk_transcript(entry["text"], self.chunker, self.model)
+            if not chunked:
+                # Still recorded, so incremental runs don't re-chunk it every time
+                self._watermarks[meeting.id] = {"text": entry["text"], "transcript_id": entry["transcript_id"], "chunks": 0}
+                empty.append(meeting.id)
+                continue
+            chunks = [c["text"] for c in chunked]
+            metadatas = _build_chunk_metadatas(
+                meeting.id, chunked, chunker=self.chunker, **_meeting_metadata(meeting)
+            )
+            self._remaining[meeting.id] = len(chunks)
+            self._watermarks[meeting.id] = {
+                "text": entry["text"],
+                "transcript_id": entry["transcript_id"],
+                "chunks": len(chunks),
+            }
+            for i, (chunk, meta) in enumerate(zip(chunks, metadatas)):
+                self._queued.append({
+                    "id": _generate_chunk_id(meeting.id, i),
+                    "document": chunk,
+                    "metadata": meta,
+                    "meeting_id": meeting.id,
+                })
+
+        if empty:
+            # Facts alone still make a summary
+            self.summaries_written += _index_summaries(empty, self.store, self.model)
+            for meeting_id in empty:
+                self._complete(meeting_id)
+
+        while len(self._queued) >= self.embed_batch_size:
+            batch = self._queued[: self.embed_batch_size]
+            del self._queued[: self.embed_batch_size]
+            self._encode(batch)
+
+    def finish(self) -> dict:
+        """Encode and write whatever is left; return pipeline statistics."""
+        if self._queued:
+            batch, self._queued = self._queued, []
+            self._encode(batch)
+        self._flush()
+        return self.stats()
+
+    # -- stages -------------------------------------------------------------
+
+    def _encode(self, batch: List[Dict[str, Any]]) -> None:
+        embeddings = get_embedding_batch_cached([r["document"] for r in batch], self.model)
+        self.encode_batches += 1
+        self.chunks_encoded += len(batch)
+        self._throttle()
+        for record, embedding in zip(batch, embeddings):
+            record["embedding"] = embedding
+            self._encoded.append(record)
+        if len(self._encoded) >= self.upsert_batch_size:
+            self._flush()
+
+    def _throttle(self) -> None:
+        if not self.max_chunks_per_second:
+            return
+        ahead = self.chunks_encoded / self.max_chunks_per_second - (time.perf_counter() - self._started)
+        if ahead > 0:
+            time.sleep(ahead)
+            self.throttled_seconds += ahead
+
+    def _flush(self) -> None:
+        if not self._encoded:
+            return
+        batch, self._encoded = self._encoded, []
+        try:
+            self.store.upsert(
+                ids=[r["id"] for r in batch],
+                embeddings=[r["embedding"] for r in batch],
+                documents=[r["document"] for r in batch],
+                metadatas=[r["metadata"] for r in batch],
+            )
+        except Exception as e:
+            failed = {r["meeting_id"] for r in batch}
+            self._failed |= failed
+            for meeting_id in failed:
+                self._remaining.pop(meeting_id, None)
+                self.errors.append(f"Meeting {meeting_id}: {str(e)}")
+            logger.error(f"Bulk upsert of {len(batch)} chunks failed: {e}")
+            return
+
+        if self.lexical_index is not None:
+            try:
+                self.lexical_index.add(
+                    (r["id"], str(r["meeting_id"]), r["metadata"]["owner_id"], r["document"]) for r in batch
+                )
+            except Exception as e:
+                logger.error(f"Lexical index update failed: {e}")
+
+        self.chunks_written += len(batch)
+        completed = []
+        for record in batch:
+            meeting_id = record["meeting_id"]
+            if meeting_id in self._failed or meeting_id not in self._remaining:
+                continue
+            self._remaining[meeting_id] -= 1
+            if self._remaining[meeting_id] == 0:
+                del self._remaining[meeting_id]
+                completed.append(meeting_id)
+        # Summaries need every chunk of their meeting in the store
+        self.summaries_written += _index_summaries(completed, self.store, self.model)
+        for meeting_id in completed:
+            self._complete(meeting_id)
+        self._report()
+
+    def _complete(self, meeting_id: str) -> None:
+        wm = self._watermarks.pop(meeting_id)
+        if self.defer_watermarks:
+            self.deferred_watermarks[meeting_id] = wm
+            self.meetings_indexed += 1
+            return
+        try:
+            mark_indexed(
+                self.db,
+                meeting_id,
+                wm["text"],
+                wm["chunks"],
+                transcript_id=wm["transcript_id"],
+                chunker=self.chunker,
+            )
+            self.meetings_indexed += 1
+        except Exception as e:
+            self.db.rollback()
+            self._failed.add(meeting_id)
+            self.errors.append(f"Meeting {meeting_id}: {str(e)}")
+            logger.error(f"Failed to record index state for meeting {meeting_id}: {e}")
+
+    # -- reporting ----------------------------------------------------------
+
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "meetings_indexed": self.meetings_indexed,
+            "meetings_failed": len(self._failed),
+            "chunks_written": self.chunks_written,
+            "facts_written": self.facts_written,
+            "summaries_written": self.summaries_written,
+            "encode_batches": self.encode_batches,
+            "embed_batch_size": self.embed_batch_size,
+            "model": self.model,
+            "throttled_seconds": round(self.throttled_seconds, 2),
+            "upsert_batch_size": self.upsert_batch_size,
+            "elapsed_seconds": round(elapsed, 2),
+            "chunks_per_second": round(self.chunks_written / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    def _report(self) -> None:
+        progress = self.stats()
+        _index_progress.update(progress)
+        logger.info(
+            f"📦 Indexed {progress['chunks_written']} chunks / "
+            f"{progress['meetings_indexed']} meetings "
+            f"({progress['chunks_per_second']} chunks/s)"
+        )
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(progress)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+
+def _delete_chunks_for_meetings(
+    meeting_ids: List[str],
+    store: Optional[VectorStore] = None,
+    lexical_index=None,
+) -> None:
+    """Remove existing transcript chunks (and summaries) for a set of meetings in one call.
+
+    Indexed facts of those meetings are left alone; they are replaced by
+    index_meeting_facts whenever extraction rewrites them. The doc_type
+    filter runs in the store, so the facts are never loaded. Chunks from
+    indexes older than format 4 carry no doc_type; re-indexing overwrites
+    them by id, and rebuild_index drops any left over.
+    """
+    if store is None:
+        store, lexical_index = _store, _lexical_index
+    if store is None or not meeting_ids:
+        return
+    try:
+        found = store.get(where={"meeting_id": [str(m) for m in meeting_ids], "doc_type": ["transcript", "summary"]})
+        ids = [c["id"] for c in found]
+        if ids:
+            store.delete(ids=ids)
+            if lexical_index is not None:
+                lexical_index.delete_ids(ids)
+        _invalidate_answers([str(m) for m in meeting_ids])
+    except Exception as e:
+        logger.error(f"Failed to delete chunks for {len(meeting_ids)} meetings: {e}")
+
+
+def index_all_transcripts(
+    db,
+    full: bool = False,
+    batch_size: int = None,
+    progress_callback: Optional[Callable[[dict], None]] = None,
+    owner_id: Optional[str] = None,
+    chunker: Optional[str] = None,
+) -> dict:
+    """Index transcripts in the database.
+
+    By default only new or changed transcripts are processed: each meeting's
+    transcript hash is compared with the watermark in ``rag_index_state``.
+    Meetings whose transcript disappeared have their chunks removed.
+    Transcripts are streamed page by page and their chunks are encoded in
+    cross-meeting batches (see BulkIndexPipeline).
+
+    Args:
+        db: SQLAlchemy database session
+        full: Re-index every meeting regardless of the watermark
+        batch_size: Chunks per encode batch (default RAG_EMBED_BATCH_SIZE)
+        progress_callback: Called with pipeline stats after every upsert
+        owner_id: Only index this user's meetings (all meetings when None)
+        chunker: Chunking strategy for this index (default RAG_CHUNKER);
+            meetings chunked with a different strategy are re-indexed
 
     Returns:
         Dictionary with indexing statistics
     """
     from app.db.models.meeting import Meeting
-    from app.db.models.transcript import Transcript
+    from app.db.models.rag_index_state import RagIndexState
+
+    chunker = chunker or RAG_CHUNKER
+    if chunker not in CHUNKERS:
+        raise ValueError(f"Unknown chunker {chunker!r}; expected one of {', '.join(CHUNKERS)}")
 
     if not is_rag_available():
         return {
             "status": "error",
-            "message": "RAG is not available. Install sentence-transformers and chromadb.",
+            "message": "RAG is not available. Install sentence-transformers.",
             "indexed_meetings": 0,
             "total_chunks": 0,
             "total_meetings": 0,
         }
 
-    meetings = db.query(Meeting).all()
-    total_chunks = 0
-    indexed_meetings = 0
-    skipped_meetings = 0
-    failed_meetings = 0
-    errors = []
+    meetings = db.query(Meeting)
+    states_query = db.query(RagIndexState)
+    if owner_id is not None:
+        meetings = meetings.filter(Meeting.owner_id == owner_id)
+        states_query = states_query.filter(
+            RagIndexState.meeting_id.in_(meetings.with_entities(Meeting.id).scalar_subquery())
+        )
+    total_meetings = meetings.count()
+    states = {s.meeting_id: s.content_hash for s in states_query.all()}
+
+    pipeline = BulkIndexPipeline(
+        db,
+        embed_batch_size=batch_size,
+        progress_callback=progress_callback,
+        chunker=chunker,
+    )
+    _index_progress.clear()
+    _index_progress.update({"running": True, "mode": "full" if full else "incremental", "owner_id": owner_id})
+
+    seen = set()
+    unchanged_meetings = 0
+    try:
+        for page in _iter_transcript_pages(db, owner_id=owner_id):
+            changed = []
+            for entry in page:
+                meeting_id = entry["meeting"].id
+                seen.add(meeting_id)
+                if not full and states.get(meeting_id) == _watermark_hash(entry["text"], chunker):
+                    unchanged_meetings += 1
+                    continue
+                changed.append(entry)
+            pipeline.add_meetings(changed)
+            _index_progress["meetings_scanned"] = len(seen)
+        pipeline_stats = pipeline.finish()
+    finally:
+        _index_progress["running"] = False
+
+    # Drop chunks for meetings whose transcript is gone
+    removed_meetings = 0
+    for meeting_id in set(states) - seen:
+        delete_meeting_chunks(meeting_id)
+        clear_index_state(db, meeting_id)
+        removed_meetings += 1
+
+    result = {
+        "status": "success",
+        "mode": "full" if full else "incremental",
+        "chunker": chunker,
+        "indexed_meetings": pipeline_stats["meetings_indexed"],
+        "unchanged_meetings": unchanged_meetings,
+        "skipped_meetings": total_meetings - len(seen),
+        "failed_meetings": pipeline_stats["meetings_failed"],
+        "removed_meetings": removed_meetings,
+        "total_chunks": pipeline_stats["chunks_written"],
+        "total_meetings": total_meetings,
+        "pipeline": pipeline_stats,
+    }
+    if pipeline.errors:
+        result["errors"] = pipeline.errors
+
+    logger.info(f"📊 RAG indexing complete: {result}")
+    return result
+
 
-    for meeting in meetings:
+_bulk_index_lock = threading.Lock()
+
+
+def start_background_index(
+    owner_id: Optional[str] = None,
+    full: bool = False,
+    batch_size: int = None,
+    chunker: Optional[str] = None,
+) -> bool:
+    """Run index_all_transcripts in a background thread.
+
+    A large tenant's bulk run outlasts any request timeout, so /rag/index-all
+    only starts it; poll get_index_progress(), whose ``result`` holds the
+    statistics once ``running`` is false. One bulk run per process at a time.
+
+    Returns:
+        True if a run was started, False if one is already running
+    """
+    chunker = chunker or RAG_CHUNKER
+    if chunker not in CHUNKERS:
+        raise ValueError(f"Unknown chunker {chunker!r}; expected one of {', '.join(CHUNKERS)}")
+    if not _bulk_index_lock.acquire(blocking=False):
+        return False
+    _index_progress.clear()
+    _index_progress.update({"running": True, "mode": "full" if full else "incremental", "owner_id": owner_id})
+
+    def run() -> None:
+        from app.db.session import SessionLocal
+        result: Dict[str, Any] = {"status": "error", "message": "Indexing did not finish"}
+        db = SessionLocal()
         try:
-            # Try to get transcript text from different possible sources:
-            transcript_text = ""
-
-            # Option 1: Meeting has a direct 'transcript' attribute
-            if hasattr(meeting, "transcript") and meeting.transcript:
-                transcript_text = meeting.transcript
-
-            # Option 2: Meeting has a relationship to Transcript model (e.g., meeting.transcripts)
-            elif hasattr(meeting, "transcripts") and meeting.transcripts:
-                # Combine all transcript entries for this meeting
-                parts = []
-                for t in meeting.transcripts:
-                    if hasattr(t, "content") and t.content:
-                        parts.append(t.content)
-                    elif hasattr(t, "text") and t.text:
-                        parts.append(t.text)
-                    elif hasattr(t, "raw_text") and t.raw_text:
-                        parts.append(t.raw_text)
-                transcript_text = "\n\n".join(parts)
-
-            # Option 3: Query Transcript table directly
-            if not transcript_text:
-                transcript_entries = db.query(Transcript).filter(
-                    Transcript.meeting_id == meeting.id
-                ).all()
-                parts = []
-                for t in transcript_entries:
-                    if hasattr(t, "content") and t.content:
-                        parts.append(t.content)
-                    elif hasattr(t, "text") and t.text:
-                        parts.append(t.text)
-                    elif hasattr(t, "raw_text") and t.raw_text:
-                        parts.append(t.raw_text)
-                transcript_text = "\n\n".join(parts)
-
-            if not transcript_text.strip():
-                skipped_meetings += 1
-                continue
+            result = index_all_transcripts(db, full=full, batch_size=batch_size, owner_id=owner_id, chunker=chunker)
+        except Exception as e:
+            logger.error(f"❌ Background RAG indexing failed: {e}")
+            result = {"status": "error", "message": str(e)}
+        finally:
+            db.close()
+            _index_progress.update({"running": False, "owner_id": owner_id, "result": result})
+            _bulk_index_lock.release()
 
-            # Get meeting metadata
-            title = meeting.title or f"Meeting {meeting.id}"
-            date_str = ""
-            if hasattr(meeting, "date") and meeting.date:
-                date_str = str(meeting.date)
-            elif hasattr(meeting, "created_at") and meeting.created_at:
-                date_str = str(meeting.created_at)
-
-            participants_str = ""
-            if hasattr(meeting, "participants") and meeting.participants:
-                try:
-                    participants_str = ", ".join(
-                        [getattr(p, "name", None) or getattr(p, "email", "") or ""
-                         for p in meeting.participants]
-                    )
-                except Exception:
-                    pass
-
-            count = index_transcript(
-                meeting.id,
-                transcript_text,
-                meeting_title=title,
-                meeting_date=date_str,
-                participants=participants_str,
-            )
-            total_chunks += count
-            if count > 0:
-                indexed_meetings += 1
-            else:
-                skipped_meetings += 1
+    threading.Thread(target=run, name="rag-index-all", daemon=True).start()
+    return True
+
+
+def _retire_collection(name: str, model: str) -> None:
+    """Delete a collection that is no longer active or kept for rollback."""
+    try:
+        store = _open_store(name, model)
+        if store is not None:
+            store.destroy()
+        lexical_path = _lexical_index_path(name)
+        if os.path.exists(lexical_path):
+            from app.services.lexical_index import LexicalIndex
+            LexicalIndex(lexical_path).destroy()
+        logger.info(f"🗑️ Dropped retired collection {name}")
+    except Exception as e:
+        logger.error(f"Failed to drop retired collection {name}: {e}")
+
+
+def rebuild_index(
+    db,
+    chunker: Optional[str] = None,
+    batch_size: int = None,
+    progress_callback: Optional[Callable[[dict], None]] = None,
+    model: Optional[str] = None,
+    max_chunks_per_second: Optional[float] = None,
+) -> dict:
+    """Blue/green rebuild of the whole index with no query downtime.
+
+    Every meeting is indexed into a new, versioned shadow collection (with
+    its own BM25 index) while queries keep using the active one. Meetings
+    re-indexed into the active collection in the meantime are caught up
+    (the last time under ``_swap_lock``), then the pointer file is replaced
+    atomically: this process switches at
+    once, other workers on their next RAG call. The previous collection is
+    kept for rollback (``RAG_KEEP_COLLECTIONS``); older ones are dropped.
+
+    Use it after changing the chunker or the embedding model; per-meeting
+    updates still go through index_transcript / index_all_transcripts. The
+    pointer file records the model and dimension of every collection, so
+    queries keep embedding with the old model until the swap.
+
+    Args:
+        db: SQLAlchemy database session
+        chunker: Chunking strategy for the new collection (default RAG_CHUNKER)
+        batch_size: Chunks per encode batch (default RAG_EMBED_BATCH_SIZE)
+        progress_callback: Called with pipeline stats after every upsert
+        model: Embedding model for the new collection (default RAG_EMBEDDING_MODEL)
+        max_chunks_per_second: Encode throttle (default unthrottled)
+
+    Returns:
+        Dictionary with rebuild statistics
+    """
+    global _active_mtime
+    from app.db.models.rag_index_state import RagIndexState
+
+    chunker = chunker or RAG_CHUNKER
+    if chunker not in CHUNKERS:
+        raise ValueError(f"Unknown chunker {chunker!r}; expected one of {', '.join(CHUNKERS)}")
+    model = model or EMBEDDING_MODEL_NAME
+    info = model_info(model)  # raises ValueError for unknown models
+    if not is_rag_available():
+        return {"status": "error", "message": "RAG is not available. Install sentence-transformers."}
+    if not RAG_PERSIST:
+        return {"status": "error", "message": "Blue/green rebuilds need RAG_PERSIST=true."}
+    if not embedding_model.is_available(model):
+        return {"status": "error", "message": f"Embedding model {model} could not be loaded."}
+
+    mode = "rebuild" if model == _active_model else "migration"
+    name = f"{DEFAULT_COLLECTION}_{datetime.utcnow():%Y%m%d%H%M%S%f}"
+    store = _open_store(name, model)
+    lexical_index = _open_lexical_index(name, store)
+    pipeline = BulkIndexPipeline(
+        db,
+        embed_batch_size=batch_size,
+        progress_callback=progress_callback,
+        chunker=chunker,
+        store=store,
+        lexical_index=lexical_index,
+        defer_watermarks=True,
+        model=model,
+        max_chunks_per_second=max_chunks_per_second,
+    )
+    _index_progress.clear()
+    _index_progress.update({"running": True, "mode": mode, "collection": name, "model": model})
+    logger.info(f"🏗️ Rebuilding RAG index into shadow collection {name} ({model})")
+
+    def abandon() -> None:
+        store.destroy()
+        if lexical_index is not None:
+            lexical_index.destroy()
+
+    def catch_up(since: datetime) -> Tuple[int, datetime]:
+        """Re-index meetings written to the active collection since ``since``."""
+        changed = [
+            row.meeting_id
+            for row in db.query(RagIndexState.meeting_id).filter(RagIndexState.indexed_at >= since).all()
+        ]
+        checked = datetime.utcnow()
+        if changed:
+            for page in _iter_transcript_pages(db, meeting_ids=changed):
+                pipeline.add_meetings(page)
+            pipeline.finish()
+        return len(changed), checked
+
+    since = datetime.utcnow()
+    caught_up = 0
+    try:
+        for page in _iter_transcript_pages(db):
+            pipeline.add_meetings(page)
+        pipeline.finish()
+
+        # Catch up on meetings written to the active collection meanwhile
+        for _ in range(3):
+            changed, since = catch_up(since)
+            caught_up += changed
+            if not changed:
+                break
+    except Exception:
+        abandon()
+        _index_progress["running"] = False
+        raise
+
+    # Swap: one atomic rename that every worker follows. The last catch-up
+    # runs under the lock, so nothing this process indexes can slip in
+    # between it and the swap; what other processes write in that window
+    # is handled with the watermarks below.
+    with _swap_lock:
+        try:
+            changed, swap_since = catch_up(since)
+            caught_up += changed
+        except Exception:
+            abandon()
+            raise
+        finally:
+            _index_progress["running"] = False
+
+        stats = pipeline.stats()
+        if pipeline.errors:
+            # Never swap in an index that is missing meetings
+            abandon()
+            logger.error(f"❌ Rebuild of {name} failed; still serving {_active_collection}")
+            return {"status": "error", "collection": _active_collection, "errors": pipeline.errors, "pipeline": stats}
+
+        built_at = datetime.utcnow().isoformat()
+        state = _read_active_collection()
+        registry = state["collections"]
+        registry.setdefault(state["name"], {"model": state["model"], "dim": model_info(state["model"])["dim"]})
+        registry[name] = {"model": model, "dim": info["dim"], "chunker": chunker, "built_at": built_at}
+        retired = [state["name"]] + [n for n in state.get("previous", []) if n != state["name"]]
+        keep, drop = retired[:RAG_KEEP_COLLECTIONS], retired[RAG_KEEP_COLLECTIONS:]
+        dropped = {n: registry.pop(n, {}).get("model", DEFAULT_MODEL) for n in drop}
+        _write_active_collection({
+            "name": name,
+            "model": model,
+            "dim": info["dim"],
+            "previous": keep,
+            "chunker": chunker,
+            "built_at": built_at,
+            "collections": registry,
+        })
+        _active_mtime = os.stat(RAG_ACTIVE_COLLECTION_PATH).st_mtime_ns
+        _activate_collection(name, model, store, lexical_index)
+        swapped_at = datetime.utcnow()
+
+    # Watermarks now describe the new collection. Meetings other workers
+    # indexed into the old collection after the last catch-up aren't in the
+    # new one (or are stale there): forget their watermarks so the next
+    # incremental run re-indexes them. Everything else keeps its row until
+    # mark_indexed overwrites it with the text the rebuild indexed.
+    rebuilt = set(pipeline.deferred_watermarks)
+    missed = [
+        row.meeting_id
+        for row in db.query(RagIndexState.meeting_id).filter(
+            RagIndexState.indexed_at >= swap_since, RagIndexState.indexed_at < swapped_at
+        ).all()
+        if row.meeting_id not in rebuilt
+    ]
+    if missed:
+        db.query(RagIndexState).filter(RagIndexState.meeting_id.in_(missed)).delete(synchronize_session=False)
+        db.commit()
+        logger.warning(f"⚠️ {len(missed)} meetings were indexed during the swap; the next incremental run re-indexes them")
+    for meeting_id, wm in pipeline.deferred_watermarks.items():
+        try:
+            mark_indexed(db, meeting_id, wm["text"], wm["chunks"], transcript_id=wm["transcript_id"], chunker=chunker)
         except Exception as e:
-            failed_meetings += 1
-            errors.append(f"Meeting {meeting.id}: {str(e)}")
-            logger.error(f"Failed to index meeting {meeting.id}: {e}")
+            db.rollback()
+            logger.error(f"Failed to record index state for meeting {meeting_id}: {e}")
+
+    for old, old_model in dropped.items():
+        _retire_collection(old, old_model)
 
     result = {
         "status": "success",
-        "indexed_meetings": indexed_meetings,
-        "skipped_meetings": skipped_meetings,
-        "failed_meetings": failed_meetings,
-        "total_chunks": total_chunks,
-        "total_meetings": len(meetings),
+        "mode": mode,
+        "collection": name,
+        "model": model,
+        "dim": info["dim"],
+        "previous_collections": keep,
+        "dropped_collections": drop,
+        "chunker": chunker,
+        "indexed_meetings": len(pipeline.deferred_watermarks),
+        "caught_up_meetings": caught_up,
+        "missed_meetings": len(missed),
+        "total_chunks": stats["chunks_written"],
+        "pipeline": stats,
     }
-    if errors:
-        result["errors"] = errors
-
-    logger.info(f"📊 RAG indexing complete: {result}")
+    logger.info(f"📊 RAG rebuild complete: {result}")
     return result
 
 
-# ...existing code...
+def migration_needed() -> bool:
+    """True when the active collection was built with another model than RAG_EMBEDDING_MODEL."""
+    _sync_active_collection()
+    return RAG_PERSIST and _active_model != EMBEDDING_MODEL_NAME
+
+
+def start_background_migration(max_chunks_per_second: Optional[float] = None) -> bool:
+    """Re-embed the index with RAG_EMBEDDING_MODEL in a background thread.
+
+    Runs rebuild_index with a throttled encoder; queries keep using the old
+    model's collection until the new one is swapped in. A lock file makes
+    sure only one worker process migrates.
+
+    Returns:
+        True if a migration was started by this call
+    """
+    if not migration_needed() or not is_rag_available():
+        return False
+    try:
+        import fcntl
+        lock_file = open(os.path.join(CHROMA_PERSIST_DIR, ".migration.lock"), "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except (ImportError, OSError):
+        logger.info("Embedding migration already running in another worker")
+        return False
+
+    rate = RAG_MIGRATION_MAX_RATE if max_chunks_per_second is None else max_chunks_per_second
+    from_model = _active_model
+
+    def run() -> None:
+        from app.db.session import SessionLocal
+        db = SessionLocal()
+        try:
+            result = rebuild_index(db, model=EMBEDDING_MODEL_NAME, max_chunks_per_second=rate)
+            logger.info(f"✅ Embedding migration {from_model} → {EMBEDDING_MODEL_NAME}: {result.get('status')}")
+        except Exception as e:
+            logger.error(f"❌ Embedding migration to {EMBEDDING_MODEL_NAME} failed: {e}")
+        finally:
+            db.close()
+            lock_file.close()
+
+    logger.info(f"🔁 Migrating RAG index from {from_model} to {EMBEDDING_MODEL_NAME} ({rate or 'unthrottled'} chunks/s)")
+    threading.Thread(target=run, name="rag-migration", daemon=True).start()
+    return True
 
 
 def delete_meeting_chunks(meeting_id: int) -> int:
@@ -372,65 +1912,175 @@ def delete_meeting_chunks(meeting_id: int) -> int:
     Returns:
         Number of chunks deleted
     """
-    if _collection is None:
+    _sync_active_collection()
+    if _store is None:
         return 0
 
+    _invalidate_answers([str(meeting_id)])
     try:
-        # Get existing chunks for this meeting
-        existing = _collection.get(
-            where={"meeting_id": str(meeting_id)},
-        )
-        if existing and existing["ids"]:
-            _collection.delete(ids=existing["ids"])
-            logger.info(f"🗑️ Deleted {len(existing['ids'])} chunks for meeting {meeting_id}")
-            return len(existing["ids"])
+        if _lexical_index is not None:
+            _lexical_index.delete_meetings([meeting_id])
+        deleted = _store.delete(where={"meeting_id": str(meeting_id)})
+        if deleted:
+            logger.info(f"🗑️ Deleted {deleted} chunks for meeting {meeting_id}")
+        return deleted
     except Exception as e:
         logger.error(f"Failed to delete chunks for meeting {meeting_id}: {e}")
     return 0
 
 
-def clear_all_chunks() -> int:
-    """Clear all chunks from the collection.
+def clear_all_chunks(owner_id: Optional[str] = None) -> int:
+    """Clear all chunks from the collection, or only one owner's.
 
     Returns:
         Number of chunks deleted
     """
-    global _collection
-    if _chroma_client is None:
+    _sync_active_collection()
+    if _store is None:
         return 0
 
     try:
-        count = _collection.count() if _collection else 0
-        _chroma_client.delete_collection("meeting_chunks")
-        _collection = _chroma_client.get_or_create_collection(
-            name="meeting_chunks",
-            metadata={"hnsw:space": "cosine"},
-        )
-        logger.info(f"🗑️ Cleared all {count} chunks from collection")
+        if owner_id is not None:
+            count = _store.delete(where={"owner_id": str(owner_id)})
+            if _lexical_index is not None:
+                _lexical_index.delete_owner(str(owner_id))
+        else:
+            count = _store.count()
+            _store.reset()
+            if _lexical_index is not None:
+                _lexical_index.clear()
+        if _answer_cache is not None:
+            _answer_cache.clear()
+        logger.info(f"🗑️ Cleared {count} chunks from collection")
         return count
     except Exception as e:
         logger.error(f"Failed to clear chunks: {e}")
         return 0
 
 
+def count_chunks(owner_id: Optional[str] = None) -> int:
+    """Number of indexed chunks, optionally for one owner."""
+    _sync_active_collection()
+    if _store is None:
+        return 0
+    return _store.count(where={"owner_id": str(owner_id)} if owner_id is not None else None)
+
+
 # ============================================================================
 # Querying
 # ============================================================================
 
+def _vector_search(
+    query_embedding: List[float],
+    top_k: int,
+    meeting_id: Optional[Any] = None,
+    owner_id: Optional[str] = None,
+    doc_types: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Nearest-neighbour search in the vector store (one owner's partition when given).
+
+    ``meeting_id`` is one meeting id or a list of them.
+    """
+    where = {}
+    if owner_id is not None:
+        where["owner_id"] = str(owner_id)
+    if isinstance(meeting_id, list):
+        where["meeting_id"] = [str(m) for m in meeting_id]
+    elif meeting_id is not None:
+        where["meeting_id"] = str(meeting_id)
+    if doc_types:
+        where["doc_type"] = list(doc_types)
+    results = _store.query(query_embedding, top_k, where=where or None)
+    for result in results:
+        result["similarity"] = 1 - result["distance"]  # cosine distance to similarity
+    return results
+
+
+def _select_meetings(query_embedding: List[float], owner_id: Optional[str] = None) -> Optional[List[str]]:
+    """Stage one: the meetings whose summaries best match the question.
+
+    None when fewer than RAG_MEETING_CANDIDATES summaries exist (a small
+    tenant, or one not yet re-indexed); searching all chunks is then as
+    cheap and can't miss anything.
+    """
+    if not RAG_MEETING_SUMMARIES:
+        return None
+    try:
+        summaries = _vector_search(query_embedding, MEETING_CANDIDATES, owner_id=owner_id, doc_types=["summary"])
+    except Exception as e:
+        logger.error(f"Meeting summary search failed: {e}")
+        return None
+    if len(summaries) < MEETING_CANDIDATES:
+        return None
+    return [r["metadata"]["meeting_id"] for r in summaries]
+
+
+def _chunk_search(
+    query_embedding: List[float],
+    top_k: int,
+    meeting_id: Optional[Any] = None,
+    owner_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Vector search over transcript chunks and facts, leaving out summaries."""
+    return _vector_search(query_embedding, top_k, meeting_id, owner_id, ["transcript", *FACT_TYPES])
+
+
+def _fetch_chunks(chunk_ids: List[str], query_embedding: List[float]) -> Dict[str, Dict[str, Any]]:
+    """Load lexical-only hits from the vector store and score them against the query."""
+    if not chunk_ids:
+        return {}
+    import numpy as np
+
+    found = _store.get(ids=chunk_ids, include_embeddings=True)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query)) or 1.0
+
+    chunks = {}
+    for chunk in found:
+        chunk_id = chunk["id"]
+        vec = np.asarray(chunk["embedding"], dtype=np.float32)
+        similarity = float(vec @ query) / ((float(np.linalg.norm(vec)) or 1.0) * query_norm)
+        chunks[chunk_id] = {
+            "id": chunk_id,
+            "document": chunk["document"],
+            "metadata": chunk["metadata"],
+            "distance": 1 - similarity,
+            "similarity": similarity,
+        }
+    return chunks
+
+
 def search_chunks(
     question: str,
     top_k: int = None,
-    meeting_id: Optional[int] = None,
+    meeting_id: Optional[str] = None,
+    query_embedding: Optional[List[float]] = None,
+    owner_id: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    """Search for relevant chunks using vector similarity.
+    """Search for relevant chunks using hybrid lexical + vector retrieval.
+
+    Vector and BM25 candidates are fused with reciprocal rank fusion, so exact
+    tokens (ticket IDs, names, versions) surface without raising ``top_k``.
+    Indexed facts (decisions, action items, risks) that match the question
+    with at least RAG_FACT_MIN_SIMILARITY get a third ranking of their own,
+    so compact facts outrank the transcript passages they came from.
+    Falls back to pure vector search when neither applies.
+
+    Without ``meeting_id``, retrieval is two-stage: meeting summaries pick
+    the RAG_MEETING_CANDIDATES most relevant meetings and every ranking is
+    restricted to them (see _select_meetings).
 
     Args:
         question: The search query
         top_k: Number of results to return
         meeting_id: Optional filter to search within a specific meeting
+        query_embedding: Precomputed embedding of ``question``, if the
+            caller already has one
+        owner_id: Only search this user's chunks
 
     Returns:
-        List of dictionaries with document, metadata, and distance
+        List of dictionaries with id, document, metadata, distance and
+        similarity (plus rrf_score when hybrid retrieval ran)
     """
     if not is_rag_available():
         return []
@@ -438,80 +2088,167 @@ def search_chunks(
     if top_k is None:
         top_k = TOP_K
 
-    query_embedding = get_embedding(question)
+    if query_embedding is None:
+        query_embedding = get_embedding(question)
 
-    try:
-        query_params = {
-            "query_embeddings": [query_embedding],
-            "n_results": top_k,
-        }
-        if meeting_id is not None:
-            query_params["where"] = {"meeting_id": str(meeting_id)}
-
-        results = _collection.query(**query_params)
-
-        documents = results.get("documents", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0]
-
-        search_results = []
-        for doc, meta, dist in zip(documents, metadatas, distances):
-            search_results.append({
-                "document": doc,
-                "metadata": meta,
-                "distance": dist,
-                "similarity": 1 - dist,  # cosine distance to similarity
-            })
+    # Stage one: narrow a broad question down to its best-matching meetings
+    scope = meeting_id if meeting_id is not None else _select_meetings(query_embedding, owner_id)
+
+    fact_results = []
+    if RAG_INDEX_FACTS:
+        try:
+            fact_results = [
+                r for r in _vector_search(query_embedding, FACT_CANDIDATES, scope, owner_id, FACT_TYPES)
+                if r["similarity"] >= FACT_MIN_SIMILARITY
+            ]
+        except Exception as e:
+            logger.error(f"Fact search failed: {e}")
+
+    if _lexical_index is None and not fact_results:
+        try:
+            return _chunk_search(query_embedding, top_k, scope, owner_id)
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            return []
 
-        return search_results
+    candidates = max(top_k, HYBRID_CANDIDATES)
+    try:
+        vector_results = _chunk_search(query_embedding, candidates, scope, owner_id)
     except Exception as e:
-        logger.error(f"Search failed: {e}")
-        return []
+        logger.error(f"Vector search failed: {e}")
+        vector_results = []
+    lexical_results = []
+    if _lexical_index is not None:
+        if isinstance(scope, list):
+            lexical_meetings = scope
+        else:
+            lexical_meetings = [str(scope)] if scope is not None else None
+        lexical_results = _lexical_index.search(
+            question,
+            limit=candidates,
+            meeting_ids=lexical_meetings,
+            owner_id=str(owner_id) if owner_id is not None else None,
+        )
 
+    from app.services.lexical_index import reciprocal_rank_fusion
 
-def build_context(search_results: List[Dict[str, Any]]) -> str:
-    """Build context string from search results.
+    rankings = [[r["id"] for r in vector_results], [r["id"] for r in lexical_results]]
+    if fact_results:
+        rankings.append([r["id"] for r in fact_results])
+    fused = reciprocal_rank_fusion(rankings, k=RRF_K)
+    ranked_ids = sorted(fused, key=fused.get, reverse=True)[:top_k]
+
+    by_id = {r["id"]: r for r in fact_results}
+    by_id.update({r["id"]: r for r in vector_results})
+    lexical_ids = {r["id"] for r in lexical_results}
+    try:
+        by_id.update(_fetch_chunks([i for i in ranked_ids if i not in by_id], query_embedding))
+    except Exception as e:
+        logger.error(f"Failed to load lexical hits: {e}")
+
+    search_results = []
+    for chunk_id in ranked_ids:
+        result = by_id.get(chunk_id)
+        if result is None:
+            continue  # stale lexical entry
+        result["rrf_score"] = fused[chunk_id]
+        result["lexical_match"] = chunk_id in lexical_ids
+        search_results.append(result)
+    return search_results
+
+
+def _strip_overlap(previous: str, following: str, max_words: int) -> str:
+    """Drop the words at the start of ``following`` that repeat the end of ``previous``."""
+    prev_words = previous.split()
+    next_words = following.split()
+    for size in range(min(max_words, len(prev_words), len(next_words)), 0, -1):
+        if prev_words[-size:] == next_words[:size]:
+            return " ".join(next_words[size:])
+    return following
+
+
+def _meeting_header(meta: Dict[str, Any]) -> str:
+    header = f"[Meeting: {meta.get('meeting_title', 'Unknown Meeting')}"
+    if meta.get("meeting_date"):
+        header += f" | Date: {meta['meeting_date']}"
+    if meta.get("participants"):
+        header += f" | Participants: {meta['participants']}"
+    return header + "]"
+
+
+def build_context(search_results: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> str:
+    """Pack search results into the context block of the prompt.
+
+    Chunks are taken in relevance order until ``max_tokens`` (default
+    RAG_CONTEXT_TOKENS) is reached, then grouped under one header per
+    meeting. Adjacent chunks of a meeting (consecutive ``chunk_index``) are
+    merged into one passage with their overlapping words removed; gaps
+    between passages are marked with "...". A meeting's indexed facts come
+    before its transcript passages.
 
     Args:
-        search_results: List of search result dictionaries
+        search_results: List of search result dictionaries, best first
+        max_tokens: Token budget for the whole context (0 = unlimited)
 
     Returns:
         Formatted context string
     """
     if not search_results:
         return ""
+    if max_tokens is None:
+        max_tokens = CONTEXT_TOKENS
+    count = embedding_model.count_tokens
+
+    # meeting_id -> {"header", "chunks": {chunk_index: text}}, in rank order
+    meetings: Dict[str, Dict[str, Any]] = {}
+    used = 0
+    for position, result in enumerate(search_results):
+        meta = result.get("metadata", {}) or {}
+        doc = (result.get("document") or "").strip()
+        if not doc:
+            continue
+        meeting_key = str(meta.get("meeting_id", "")) or f"result-{position}"
+        chunk_index = meta.get("chunk_index")
+        key = chunk_index if isinstance(chunk_index, int) else f"result-{position}"
+
+        group = meetings.get(meeting_key)
+        header_cost = 0 if group else count(_meeting_header(meta))
+        cost = header_cost + count(doc)
+        if max_tokens and used + cost > max_tokens:
+            if used:
+                continue  # a smaller, lower-ranked chunk may still fit
+            # Always keep the best chunk, trimmed to the budget
+            words = doc.split()
+            while words and header_cost + count(" ".join(words)) > max_tokens:
+                words = words[: int(len(words) * 0.9)]
+            doc = " ".join(words)
+            cost = header_cost + count(doc)
+        if group is None:
+            group = meetings[meeting_key] = {"header": _meeting_header(meta), "chunks": {}}
+        group["chunks"][key] = doc
+        used += cost
 
     context_parts = []
-    for result in search_results:
-        meta = result.get("metadata", {})
-        title = meta.get("meeting_title", "Unknown Meeting")
-        date = meta.get("meeting_date", "")
-        participants = meta.get("participants", "")
-        doc = result.get("document", "")
-
-        header = f"[Meeting: {title}"
-        if date:
-            header += f" | Date: {date}"
-        if participants:
-            header += f" | Participants: {participants}"
-        header += "]"
-
-        context_parts.append(f"{header}\n{doc}")
+    for group in meetings.values():
+        passages: List[str] = []
+        previous_index = None
+        indexed = sorted(k for k in group["chunks"] if isinstance(k, int))
+        # Standalone results (indexed facts) lead, then transcript passages
+        for key in [k for k in group["chunks"] if not isinstance(k, int)] + indexed:
+            text = group["chunks"][key]
+            if isinstance(key, int) and previous_index is not None and key == previous_index + 1:
+                passages[-1] += " " + _strip_overlap(passages[-1], text, CHUNK_OVERLAP * 2)
+            else:
+                passages.append(text)
+            previous_index = key if isinstance(key, int) else None
+        context_parts.append(group["header"] + "\n" + "\n...\n".join(passages))
 
     return "\n\n---\n\n".join(context_parts)
 
 
-def generate_answer_with_ollama(question: str, context: str) -> str:
-    """Generate an answer using Ollama based on the provided context.
-
-    Args:
-        question: The user's question
-        context: The relevant meeting transcript context
-
-    Returns:
-        Generated answer string
-    """
-    prompt = f"""You are a helpful assistant that answers questions about meetings based on meeting transcripts.
+def _build_answer_prompt(question: str, context: str) -> str:
+    """Prompt sent to Ollama for a grounded answer."""
+    return f"""You are a helpful assistant that answers questions about meetings based on meeting transcripts.
 
 Based on the following meeting transcripts, answer the question accurately and concisely.
 If the answer is not in the transcripts, say "I couldn't find that information in the meeting data."
@@ -526,70 +2263,254 @@ Question: {question}
 
 Answer:"""
 
+
+def _generate_answer(question: str, context: str) -> Tuple[str, bool]:
+    """Generate an answer with Ollama.
+
+    Returns:
+        (answer or user-facing error message, whether generation succeeded)
+    """
+    prompt = _build_answer_prompt(question, context)
+
     try:
-        with httpx.Client(timeout=120) as client:
-            response = client.post(
-                f"{OLLAMA_URL}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result.get("response", "").strip()
-            if not answer:
-                return "The AI model returned an empty response. Please try again."
-            return answer
+        answer = llm_client.ollama_generate_sync(
+            prompt,
+            model=OLLAMA_MODEL,
+            base_url=OLLAMA_URL,
+            timeout=120,
+        ).strip()
+        if not answer:
+            return "The AI model returned an empty response. Please try again.", False
+        return answer, True
     except httpx.ConnectError:
         logger.error("Cannot connect to Ollama. Is it running?")
-        return "Cannot connect to Ollama. Please make sure it's running with: ollama serve"
+        return "Cannot connect to Ollama. Please make sure it's running with: ollama serve", False
     except httpx.TimeoutException:
         logger.error("Ollama request timed out.")
-        return "The request timed out. The question may be too complex or the model is still loading."
+        return "The request timed out. The question may be too complex or the model is still loading.", False
     except Exception as e:
         logger.error(f"Ollama query failed: {e}")
-        return f"Failed to generate answer: {str(e)}"
+        return f"Failed to generate answer: {str(e)}", False
 
 
-def query_rag(
+def generate_answer_with_ollama(question: str, context: str) -> str:
+    """Generate an answer using Ollama based on the provided context.
+
+    Args:
+        question: The user's question
+        context: The relevant meeting transcript context
+
+    Returns:
+        Generated answer string
+    """
+    return _generate_answer(question, context)[0]
+
+
+def stream_answer_with_ollama(question: str, context: str) -> Iterator[str]:
+    """Generate an answer with Ollama, yielding tokens as they are produced.
+
+    Args:
+        question: The user's question
+        context: The relevant meeting transcript context
+
+    Yields:
+        Answer text fragments
+
+    Raises:
+        httpx.HTTPError: If Ollama can't be reached or the stream fails
+    """
+    prompt = _build_answer_prompt(question, context)
+    yield from llm_client.iter_ollama_stream(
+        prompt,
+        model=OLLAMA_MODEL,
+        base_url=OLLAMA_URL,
+    )
+
+
+def stream_question(
     question: str,
     top_k: int = None,
-    meeting_id: Optional[int] = None,
-) -> str:
-    """Query the RAG system: retrieve relevant chunks, then generate answer with Ollama.
+    meeting_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Streaming variant of answer_question.
+
+    Yields events in order: one "sources" event with the retrieved chunks
+    (sent before generation starts), any number of "token" events, then a
+    "done" event with per-stage timings. Failures produce an "error" event.
 
     Args:
         question: The user's question
         top_k: Number of chunks to retrieve
         meeting_id: Optional filter to search within a specific meeting
+        owner_id: Only search this user's meetings
+
+    Yields:
+        Dictionaries with "event" and "data" keys
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def _ms(since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    if not is_rag_available():
+        yield {"event": "error", "data": "RAG is not available. Please install sentence-transformers."}
+        return
+
+    if not question or not question.strip():
+        yield {"event": "error", "data": "Please provide a question."}
+        return
+
+    stage = time.perf_counter()
+    query_embedding = get_embedding(question)
+    search_results = search_chunks(
+        question, top_k=top_k, meeting_id=meeting_id, query_embedding=query_embedding, owner_id=owner_id
+    )
+    timings["retrieve_ms"] = _ms(stage)
+    yield {"event": "sources", "data": search_results}
+
+    if not search_results:
+        yield {"event": "error", "data": "No relevant meeting data found. Try indexing your meetings first."}
+        return
+
+    cache_key = _answer_cache_key(search_results)
+    if _answer_cache is not None:
+        hit = _answer_cache.lookup(query_embedding, cache_key)
+        if hit is not None:
+            timings["first_token_ms"] = _ms(started)
+            timings["total_ms"] = timings["first_token_ms"]
+            yield {"event": "token", "data": hit["answer"]}
+            yield {"event": "done", "data": {"timings": timings, "cached": True}}
+            return
+
+    stage = time.perf_counter()
+    context = build_context(search_results)
+    timings["build_context_ms"] = _ms(stage)
+
+    stage = time.perf_counter()
+    tokens: List[str] = []
+    try:
+        for token in stream_answer_with_ollama(question, context):
+            if "first_token_ms" not in timings:
+                timings["first_token_ms"] = _ms(started)
+            tokens.append(token)
+            yield {"event": "token", "data": token}
+    except httpx.ConnectError:
+        logger.error("Cannot connect to Ollama. Is it running?")
+        yield {"event": "error", "data": "Cannot connect to Ollama. Please make sure it's running with: ollama serve"}
+        return
+    except httpx.TimeoutException:
+        logger.error("Ollama request timed out.")
+        yield {"event": "error", "data": "The request timed out. The question may be too complex or the model is still loading."}
+        return
+    except Exception as e:
+        logger.error(f"Ollama streaming failed: {e}")
+        yield {"event": "error", "data": f"Failed to generate answer: {str(e)}"}
+        return
+    timings["generate_ms"] = _ms(stage)
+    timings["total_ms"] = _ms(started)
+
+    answer = "".join(tokens).strip()
+    if _answer_cache is not None and answer:
+        _answer_cache.put(query_embedding, cache_key, _result_meeting_ids(search_results), answer)
+
+    yield {"event": "done", "data": {"timings": timings, "cached": False}}
+
+
+def answer_question(
+    question: str,
+    top_k: int = None,
+    meeting_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the RAG pipeline once: retrieve → build_context → generate.
+
+    The single retrieval result feeds both the prompt and the returned
+    sources, so each question costs one embedding and one vector search.
+
+    Args:
+        question: The user's question
+        top_k: Number of chunks to retrieve
+        meeting_id: Optional filter to search within a specific meeting
+        owner_id: Only search this user's meetings
 
     Returns:
-        Generated answer string
+        Dictionary with "answer", "sources" (the search results used),
+        "timings" (milliseconds per stage) and "cached" (answer cache hit)
     """
+    timings: Dict[str, float] = {}
+    result: Dict[str, Any] = {"answer": "", "sources": [], "timings": timings, "cached": False}
+    started = time.perf_counter()
+
+    def _finish(answer: str) -> Dict[str, Any]:
+        result["answer"] = answer
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
     if not is_rag_available():
-        return "RAG is not available. Please install sentence-transformers and chromadb."
+        return _finish("RAG is not available. Please install sentence-transformers.")
 
     if not question or not question.strip():
-        return "Please provide a question."
+        return _finish("Please provide a question.")
 
-    # 1. Search for relevant chunks
-    search_results = search_chunks(question, top_k=top_k, meeting_id=meeting_id)
+    # 1. Retrieve relevant chunks
+    stage = time.perf_counter()
+    query_embedding = get_embedding(question)
+    search_results = search_chunks(
+        question, top_k=top_k, meeting_id=meeting_id, query_embedding=query_embedding, owner_id=owner_id
+    )
+    timings["retrieve_ms"] = round((time.perf_counter() - stage) * 1000, 1)
+    result["sources"] = search_results
 
     if not search_results:
-        return "No relevant meeting data found. Try indexing your meetings first."
+        return _finish("No relevant meeting data found. Try indexing your meetings first.")
+
+    # Same chunks + near-identical question → reuse the earlier answer
+    cache_key = _answer_cache_key(search_results)
+    if _answer_cache is not None:
+        hit = _answer_cache.lookup(query_embedding, cache_key)
+        if hit is not None:
+            result["cached"] = True
+            return _finish(hit["answer"])
 
     # 2. Build context
+    stage = time.perf_counter()
     context = build_context(search_results)
+    timings["build_context_ms"] = round((time.perf_counter() - stage) * 1000, 1)
 
     if not context:
-        return "No relevant meeting data found."
+        return _finish("No relevant meeting data found.")
 
     # 3. Generate answer using Ollama
-    answer = generate_answer_with_ollama(question, context)
+    stage = time.perf_counter()
+    answer, ok = _generate_answer(question, context)
+    timings["generate_ms"] = round((time.perf_counter() - stage) * 1000, 1)
+
+    if ok and _answer_cache is not None:
+        _answer_cache.put(query_embedding, cache_key, _result_meeting_ids(search_results), answer)
 
-    return answer
+    return _finish(answer)
+
+
+def query_rag(
+    question: str,
+    top_k: int = None,
+    meeting_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+) -> str:
+    """Query the RAG system: retrieve relevant chunks, then generate answer with Ollama.
+
+    Args:
+        question: The user's question
+        top_k: Number of chunks to retrieve
+        meeting_id: Optional filter to search within a specific meeting
+        owner_id: Only search this user's meetings
+
+    Returns:
+        Generated answer string
+    """
+    return answer_question(question, top_k=top_k, meeting_id=meeting_id, owner_id=owner_id)["answer"]
 
 
 # ============================================================================
@@ -598,21 +2519,38 @@ def query_rag(
 
 def get_stats() -> dict:
     """Get RAG index statistics."""
+    _sync_active_collection()
     stats = {
-        "embedding_model": "all-MiniLM-L6-v2" if _embedding_model else "not loaded",
-        "embedding_dim": EMBEDDING_DIM,
-        "vector_store": "chromadb" if _collection else "not available",
+        "embedding_model": _active_model if _embeddings_available() else "not loaded",
+        "embedding_model_status": embedding_model.status(),
+        "embedding_dim": model_info(_active_model)["dim"],
+        "configured_embedding_model": EMBEDDING_MODEL_NAME,
+        "migration_pending": RAG_PERSIST and _active_model != EMBEDDING_MODEL_NAME,
+        "vector_store": _store.backend if _store is not None else "not available",
+        "vector_store_stats": _store.stats() if _store is not None else None,
+        "collection": _active_collection,
         "llm_provider": "ollama",
         "llm_model": OLLAMA_MODEL,
         "ollama_url": OLLAMA_URL,
+        "llm_client": llm_client.get_stats(),
         "chunk_size": CHUNK_SIZE,
         "chunk_overlap": CHUNK_OVERLAP,
+        "chunker": RAG_CHUNKER,
+        "chunk_tokens": _chunk_token_budget(),
         "top_k": TOP_K,
+        "context_tokens": CONTEXT_TOKENS,
+        "retrieval": "hybrid" if _lexical_index is not None else "vector",
+        "meeting_candidates": MEETING_CANDIDATES if RAG_MEETING_SUMMARIES else None,
+        "lexical_chunks": _lexical_index.count() if _lexical_index is not None else 0,
+        "persistent": RAG_PERSIST,
+        "persist_dir": CHROMA_PERSIST_DIR if RAG_PERSIST else None,
+        "store_size_bytes": _get_store_size_bytes(),
+        "store_load_seconds": round(_store_load_seconds, 3),
     }
 
-    if _collection is not None:
+    if _store is not None:
         try:
-            count = _collection.count()
+            count = _store.count()
             stats["status"] = "ready"
             stats["total_chunks"] = count
         except Exception as e:
@@ -623,22 +2561,41 @@ def get_stats() -> dict:
         stats["status"] = "disabled"
         stats["total_chunks"] = 0
 
+    stats["indexing"] = get_index_progress()
+    stats["answer_cache"] = _answer_cache.stats() if _answer_cache is not None else None
+
+    cache = _get_embedding_cache()
+    if cache is not None:
+        try:
+            stats["embedding_cache"] = cache.stats(_active_model)
+        except Exception as e:
+            stats["embedding_cache"] = {"error": str(e)}
+    else:
+        stats["embedding_cache"] = None
+
+    if _embedding_client is not None:
+        try:
+            stats["embedding_server"] = {"socket": EMBEDDING_SERVER_SOCKET, **_embedding_client.stats()}
+        except Exception as e:
+            stats["embedding_server"] = {"socket": EMBEDDING_SERVER_SOCKET, "error": str(e)}
+    else:
+        stats["embedding_server"] = None
+
     return stats
 
 
 def health_check() -> dict:
     """Check health of all RAG components."""
+    _sync_active_collection()
     health = {
-        "embedding_model": _embedding_model is not None,
-        "vector_store": _collection is not None,
+        "embedding_model": _embeddings_available(),
+        "vector_store": _store is not None,
         "ollama": False,
     }
 
-    # Check Ollama connectivity
+    # Check Ollama connectivity on the pooled client
     try:
-        with httpx.Client(timeout=5) as client:
-            response = client.get(f"{OLLAMA_URL}/api/tags")
-            health["ollama"] = response.status_code == 200
+        health["ollama"] = llm_client.ollama_reachable_sync(OLLAMA_URL, timeout=5)
     except Exception:
         health["ollama"] = False
 
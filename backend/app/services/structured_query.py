@@ -0,0 +1,406 @@
+"""Structured-query router for Ask-AI.
+
+Many questions are really database lookups — "what's overdue?", "what is
+assigned to Priya?", "how many decisions last week?". ``route_question``
+recognises these with a small set of full-match patterns and answers them
+from ``ActionItem`` / ``Decision`` / ``Risk`` / ``Meeting`` queries in
+milliseconds. Anything that doesn't match a pattern exactly (for example
+"what did we decide about pricing?") returns None and goes to RAG.
+
+Answers are scoped to the asking user's meetings, like RAG retrieval.
+"""
+
+import os
+import re
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_ROUTER = os.getenv("RAG_STRUCTURED_ROUTER", "true").lower() == "true"
+MAX_ROWS = int(os.getenv("RAG_STRUCTURED_MAX_ROWS", "20"))
+
+# ============================================================================
+# Intent Classification
+# ============================================================================
+
+_ITEMS = r"(?:action items?|tasks?|items?|todos?|to-dos?)"
+_WINDOW = (
+    r"(?:\s+(?:in|from|during|over|for))?(?:\s+the)?"
+    r"(?:\s+(?P<window>today|yesterday|this week|last week|this month|last month"
+    r"|(?:last|past) \d+ (?:days?|weeks?|months?)))?"
+)
+
+_PATTERNS: List[Tuple[str, "re.Pattern"]] = [
+    ("overdue_items", re.compile(
+        rf"(?:(?:what|which)(?: {_ITEMS})? (?:is|are)(?: currently| still)?"
+        rf"|(?:show|list)(?: me)?(?: all)?(?: the)?|(?:is )?(?:there )?anything)"
+        rf" (?:overdue|past due|late)(?: {_ITEMS})?"
+        rf"(?: (?:for|assigned to|owned by) (?P<person>.+?))?"
+    )),
+    ("overdue_items", re.compile(
+        rf"(?:what|which|show|list)(?: me)?(?: are)?(?: the| all the| all)? (?:overdue|late) {_ITEMS}"
+        rf"(?: (?:for|assigned to|owned by) (?P<person>.+?))?"
+    )),
+    ("person_items", re.compile(
+        rf"(?:what|which)(?: {_ITEMS})? (?:is|are)(?: currently| still)? (?:assigned to|owned by|on)"
+        rf" (?P<person>.+?)(?:'s plate)?"
+    )),
+    ("person_items", re.compile(
+        rf"(?:what|which)(?: {_ITEMS})? (?:does|do|has|have) (?P<person>.+?)"
+        rf" (?:own|got|have|owe|need to do|have to do|working on|been assigned)(?: open)?"
+    )),
+    ("person_items", re.compile(
+        rf"(?:(?:(?:show|list)(?: me)?|what are) )?(?P<person>.+?)'s?(?: open)? {_ITEMS}"
+    )),
+    ("person_items", re.compile(
+        rf"(?:show|list|what are)(?: me)?(?: the| all the| all)?(?: open)? {_ITEMS}"
+        rf" (?:for|assigned to|owned by) (?P<person>.+?)"
+    )),
+    ("open_items", re.compile(
+        rf"(?:what|which)(?: {_ITEMS})? (?:is|are) (?:still )?(?:open|pending|outstanding)"
+    )),
+    ("open_items", re.compile(
+        rf"(?:(?:show|list)(?: me)?|what are)?(?: the| all the| all)? ?(?:open|pending|outstanding) {_ITEMS}"
+    )),
+    ("count", re.compile(
+        r"how many (?P<state>open |overdue |completed |done )?"
+        r"(?P<entity>decisions|action items|tasks|risks|meetings)"
+        r"(?: (?:were|have been|did we|did i|do we|do i|are there|were there|have we|have i|are|do|did))?"
+        r"(?: (?:make|made|take|taken|create|created|record|recorded|hold|held|have|had"
+        r"|raise|raised|identify|identified|open|overdue|done|completed))?"
+        r"(?: (?:there|so far))?" + _WINDOW
+    )),
+    ("list", re.compile(
+        r"(?:what|which|list|show(?: me)?)(?: were| are| have been)?(?: the| all the| all)?"
+        r" (?:(?:recent|latest) )?(?P<entity>decisions|risks)"
+        r"(?: (?:were|have been|did we|did i|do we))?"
+        r"(?: (?:make|made|take|taken|record|recorded|raise|raised|identify|identified))?" + _WINDOW
+    )),
+    ("list", re.compile(r"what did (?:we|i) (?P<entity>decide)" + _WINDOW)),
+]
+
+_CONTRACTIONS = {
+    "what's": "what is",
+    "who's": "who is",
+    "what're": "what are",
+    "isn't": "is not",
+}
+
+_ME = {"me", "i", "myself", "my"}
+
+
+def _normalize(question: str) -> str:
+    text = " ".join(question.strip().split()).lower()
+    text = text.replace("’", "'")
+    for short, full in _CONTRACTIONS.items():
+        text = re.sub(rf"\b{re.escape(short)}", full, text)
+    text = re.sub(r"^(?:please|hey|ok|so)[, ]+", "", text)
+    return text.rstrip(" ?.!")
+
+
+def classify(question: str) -> Optional[Dict[str, Any]]:
+    """Match a question against the structured patterns.
+
+    Returns:
+        {"intent", "entity", "state", "person", "window"} (missing parts are
+        None), or None when the question should go to RAG
+    """
+    if not question or not question.strip():
+        return None
+    text = _normalize(question)
+    for intent, pattern in _PATTERNS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        entity = groups.get("entity")
+        if entity in ("tasks", "action items"):
+            entity = "action_items"
+        elif entity == "decide":
+            entity = "decisions"
+        person = (groups.get("person") or "").strip(" '") or None
+        return {
+            "intent": intent,
+            "entity": entity,
+            "state": (groups.get("state") or "").strip() or None,
+            "person": person,
+            "window": groups.get("window"),
+        }
+    return None
+
+
+# ============================================================================
+# Time Windows
+# ============================================================================
+
+def _month_start(day: datetime) -> datetime:
+    return day.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def window_bounds(window: Optional[str], now: Optional[datetime] = None) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Turn "last week", "past 30 days", ... into a UTC [start, end) range."""
+    if not window:
+        return None, None
+    now = now or datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week = today - timedelta(days=today.weekday())
+    if window == "today":
+        return today, None
+    if window == "yesterday":
+        return today - timedelta(days=1), today
+    if window == "this week":
+        return week, None
+    if window == "last week":
+        return week - timedelta(weeks=1), week
+    if window == "this month":
+        return _month_start(today), None
+    if window == "last month":
+        return _month_start(_month_start(today) - timedelta(days=1)), _month_start(today)
+    match = re.fullmatch(r"(?:last|past) (\d+) (day|week|month)s?", window)
+    if match:
+        n, unit = int(match.group(1)), match.group(2)
+        days = {"day": 1, "week": 7, "month": 30}[unit] * n
+        return now - timedelta(days=days), None
+    return None, None
+
+
+# ============================================================================
+# Queries
+# ============================================================================
+
+def _resolve_people(db, person: str, current_user_id: Optional[str]) -> List[Any]:
+    """Users matching a name from the question: exact name, then first name."""
+    from app.db.models.user import User
+
+    if person in _ME:
+        user = db.query(User).filter(User.id == current_user_id).first() if current_user_id else None
+        return [user] if user else []
+    name = person.lower()
+    users = db.query(User).filter(func.lower(User.name) == name).all()
+    if not users:
+        users = db.query(User).filter(func.lower(User.name).like(f"{name} %")).all()
+    if not users and "@" in name:
+        users = db.query(User).filter(func.lower(User.email) == name).all()
+    return users
+
+
+def _meeting_time():
+    from app.db.models.meeting import Meeting
+    return func.coalesce(Meeting.start_time, Meeting.created_at)
+
+
+def _scoped(query, model, owner_id: Optional[str], meeting_id: Optional[str], start=None, end=None):
+    """Join a Decision/ActionItem/Risk query to the owner's meetings."""
+    from app.db.models.meeting import Meeting
+
+    query = query.join(Meeting, model.meeting_id == Meeting.id)
+    if owner_id is not None:
+        query = query.filter(Meeting.owner_id == owner_id)
+    if meeting_id is not None:
+        query = query.filter(Meeting.id == meeting_id)
+    if start is not None:
+        query = query.filter(_meeting_time() >= start)
+    if end is not None:
+        query = query.filter(_meeting_time() < end)
+    return query
+
+
+def _source(doc_type: str, row, meeting, text: str) -> Dict[str, Any]:
+    """Source entry in the shape of a RAG search result."""
+    return {
+        "id": f"meeting-{meeting.id}-{doc_type}-{row.id}",
+        "document": text,
+        "metadata": {
+            "meeting_id": str(meeting.id),
+            "meeting_title": meeting.title or f"Meeting {meeting.id}",
+            "doc_type": doc_type,
+        },
+        "distance": 0.0,
+        "similarity": 1.0,
+    }
+
+
+def _when(window: Optional[str]) -> str:
+    if not window:
+        return ""
+    return f" in the {window}" if re.match(r"(?:last|past) \d", window) else f" {window}"
+
+
+def _plural(n: int, word: str) -> str:
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def _list_items(db, intent: Dict[str, Any], owner_id, meeting_id, current_user_id) -> Optional[Dict[str, Any]]:
+    from app.db.models.meeting import Meeting
+    from app.db.models.action_item import ActionItem
+    from app.db.models.user import User
+
+    # "My" items are the user's wherever they were assigned, including
+    # meetings someone else owns; an owner-scoped "none" would be wrong
+    about_me = intent["person"] in _ME
+    scope = None if about_me else owner_id
+    query = _scoped(db.query(ActionItem, Meeting, User), ActionItem, scope, meeting_id)
+    query = query.outerjoin(User, ActionItem.owner_id == User.id).filter(
+        or_(ActionItem.status.is_(None), ActionItem.status != "done")
+    )
+
+    label = "open action item"
+    who = ""
+    if intent["intent"] == "overdue_items":
+        now = datetime.utcnow()
+        query = query.filter(ActionItem.due_date.isnot(None), ActionItem.due_date < now)
+        label = "overdue action item"
+    if intent["person"]:
+        people = _resolve_people(db, intent["person"], current_user_id)
+        if not people:
+            return None  # unknown name: let RAG search the transcripts
+        query = query.filter(ActionItem.owner_id.in_([p.id for p in people]))
+        who = " for " + ("you" if about_me else ", ".join(p.name for p in people))
+
+    rows = query.order_by(ActionItem.due_date.is_(None), ActionItem.due_date, ActionItem.created_at).all()
+    if not rows:
+        return {"answer": f"There are no {label}s{who}.", "sources": []}
+
+    lines = [f"{_plural(len(rows), label)}{who}:"]
+    sources = []
+    for item, meeting, user in rows[:MAX_ROWS]:
+        details = []
+        if not who:
+            details.append(user.name if user is not None else "unassigned")
+        if item.due_date:
+            details.append(f"due {item.due_date.date().isoformat()}")
+        if item.status and item.status != "open":
+            details.append(item.status)
+        suffix = f" ({', '.join(details)})" if details else ""
+        lines.append(f"- {item.description}{suffix} — {meeting.title}")
+        sources.append(_source("action_item", item, meeting, item.description))
+    if len(rows) > MAX_ROWS:
+        lines.append(f"…and {len(rows) - MAX_ROWS} more.")
+    return {"answer": "\n".join(lines), "sources": sources}
+
+
+def _count(db, intent: Dict[str, Any], owner_id, meeting_id) -> Dict[str, Any]:
+    from app.db.models.meeting import Meeting
+    from app.db.models.decision import Decision
+    from app.db.models.action_item import ActionItem
+    from app.db.models.risk import Risk
+
+    start, end = window_bounds(intent["window"])
+    entity, state = intent["entity"], intent["state"]
+    when = _when(intent["window"])
+
+    if entity == "meetings":
+        query = db.query(func.count(Meeting.id))
+        if owner_id is not None:
+            query = query.filter(Meeting.owner_id == owner_id)
+        if meeting_id is not None:
+            query = query.filter(Meeting.id == meeting_id)
+        if start is not None:
+            query = query.filter(_meeting_time() >= start)
+        if end is not None:
+            query = query.filter(_meeting_time() < end)
+        n = query.scalar() or 0
+        return {"answer": f"{_plural(n, 'meeting')}{when}.", "sources": []}
+
+    model, word = {
+        "decisions": (Decision, "decision"),
+        "risks": (Risk, "risk"),
+        "action_items": (ActionItem, "action item"),
+    }[entity]
+    query = _scoped(db.query(func.count(model.id), func.count(func.distinct(model.meeting_id))),
+                    model, owner_id, meeting_id, start, end)
+    if model is ActionItem and state:
+        if state == "overdue":
+            query = query.filter(
+                ActionItem.due_date.isnot(None),
+                ActionItem.due_date < datetime.utcnow(),
+                or_(ActionItem.status.is_(None), ActionItem.status != "done"),
+            )
+        elif state == "open":
+            query = query.filter(or_(ActionItem.status.is_(None), ActionItem.status != "done"))
+        else:
+            query = query.filter(ActionItem.status == "done")
+        word = f"{state} {word}"
+    n, meetings = query.one()
+    answer = f"{_plural(n or 0, word)}{when}"
+    if n and meeting_id is None:
+        answer += f", across {_plural(meetings, 'meeting')}"
+    return {"answer": answer + ".", "sources": []}
+
+
+def _list_entities(db, intent: Dict[str, Any], owner_id, meeting_id) -> Dict[str, Any]:
+    from app.db.models.meeting import Meeting
+    from app.db.models.decision import Decision
+    from app.db.models.risk import Risk
+
+    start, end = window_bounds(intent["window"])
+    model, doc_type, word = (
+        (Risk, "risk", "risk") if intent["entity"] == "risks" else (Decision, "decision", "decision")
+    )
+    query = _scoped(db.query(model, Meeting), model, owner_id, meeting_id, start, end)
+    rows = query.order_by(_meeting_time().desc(), model.created_at).all()
+    when = _when(intent["window"])
+    if not rows:
+        return {"answer": f"No {word}s{when}.", "sources": []}
+
+    lines = [f"{_plural(len(rows), word)}{when}:"]
+    sources = []
+    for row, meeting in rows[:MAX_ROWS]:
+        text = row.summary if model is Decision else row.description
+        lines.append(f"- {text} — {meeting.title}")
+        sources.append(_source(doc_type, row, meeting, text))
+    if len(rows) > MAX_ROWS:
+        lines.append(f"…and {len(rows) - MAX_ROWS} more.")
+    return {"answer": "\n".join(lines), "sources": sources}
+
+
+def route_question(
+    db,
+    question: str,
+    owner_id: Optional[str] = None,
+    meeting_id: Optional[str] = None,
+    current_user_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Answer a status question from the database, or return None for RAG.
+
+    Args:
+        db: SQLAlchemy database session
+        question: The user's question
+        owner_id: Only look at this user's meetings
+        meeting_id: Optional filter to a single meeting
+        current_user_id: Who "me" / "I" refers to (defaults to owner_id)
+
+    Returns:
+        {"answer", "sources", "intent", "timings"} or None
+    """
+    if not STRUCTURED_ROUTER:
+        return None
+    started = time.perf_counter()
+    intent = classify(question)
+    if intent is None:
+        return None
+    current_user_id = current_user_id or owner_id
+
+    try:
+        if intent["intent"] in ("overdue_items", "person_items", "open_items"):
+            result = _list_items(db, intent, owner_id, meeting_id, current_user_id)
+        elif intent["intent"] == "count":
+            result = _count(db, intent, owner_id, meeting_id)
+        else:
+            result = _list_entities(db, intent, owner_id, meeting_id)
+    except Exception as e:
+        logger.error(f"Structured query failed, falling back to RAG: {e}")
+        return None
+    if result is None:
+        return None
+
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"⚡ Answered {intent['intent']} question from SQL in {elapsed} ms")
+    result["intent"] = intent["intent"]
+    result["timings"] = {"route_ms": elapsed, "total_ms": elapsed}
+    return result
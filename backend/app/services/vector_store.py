@@ -0,0 +1,646 @@
+"""Vector store backends for RAG chunks.
+
+``rag.py`` talks to a small ``VectorStore`` interface so the storage engine
+can be swapped (``RAG_VECTOR_STORE``):
+
+- ``ChromaVectorStore`` — the ChromaDB collection used so far (HNSW index)
+- ``NumpyVectorStore`` — exact brute-force search over a memory-mapped
+  ``.npy`` matrix per owner partition, with float16 or int8-quantized
+  vectors. No extra dependencies; for a per-tenant corpus well under a
+  million chunks one vectorized dot product beats an approximate index
+  and never misses a neighbour.
+
+Filters (``where``) are plain dicts of metadata field → value, all of which
+must match; a list value means "any of".
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Where = Dict[str, Union[str, Sequence[str]]]
+
+
+class VectorStore(ABC):
+    """Interface shared by the vector store backends."""
+
+    backend = "base"
+
+    @abstractmethod
+    def count(self, where: Optional[Where] = None) -> int:
+        """Number of chunks matching ``where`` (all chunks by default)."""
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Insert or replace chunks by id."""
+
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Where] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_embeddings: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return [{"id", "document", "metadata"(, "embedding")}]."""
+
+    @abstractmethod
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Where] = None) -> int:
+        """Delete by ids and/or filter; returns the number of chunks removed."""
+
+    @abstractmethod
+    def query(self, embedding: List[float], top_k: int, where: Optional[Where] = None) -> List[Dict[str, Any]]:
+        """Nearest neighbours: [{"id", "document", "metadata", "distance"}] by cosine distance."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Remove every chunk."""
+
+    @abstractmethod
+    def destroy(self) -> None:
+        """Delete the store itself (a retired blue/green collection)."""
+
+    def stats(self) -> dict:
+        return {"backend": self.backend}
+
+
+# ============================================================================
+# ChromaDB
+# ============================================================================
+
+def _chroma_where(where: Optional[Where]) -> Optional[dict]:
+    if not where:
+        return None
+    clauses = [
+        {key: {"$in": [str(v) for v in value]}} if isinstance(value, (list, tuple, set)) else {key: str(value)}
+        for key, value in where.items()
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class ChromaVectorStore(VectorStore):
+    """ChromaDB collection with cosine HNSW index."""
+
+    backend = "chromadb"
+
+    def __init__(self, client, name: str = "meeting_chunks"):
+        self.client = client
+        self.name = name
+        self.collection = client.get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+
+    def count(self, where=None) -> int:
+        if not where:
+            return self.collection.count()
+        return len(self.collection.get(where=_chroma_where(where), include=[]).get("ids") or [])
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    def get(self, ids=None, where=None, limit=None, offset=0, include_embeddings=False):
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        params: Dict[str, Any] = {"include": include}
+        if ids is not None:
+            params["ids"] = ids
+        if where:
+            params["where"] = _chroma_where(where)
+        if limit is not None:
+            params["limit"] = limit
+            params["offset"] = offset
+        found = self.collection.get(**params)
+        embeddings = found.get("embeddings") if include_embeddings else None
+        results = []
+        for i, chunk_id in enumerate(found.get("ids") or []):
+            item = {
+                "id": chunk_id,
+                "document": found["documents"][i],
+                "metadata": found["metadatas"][i] or {},
+            }
+            if embeddings is not None:
+                item["embedding"] = list(embeddings[i])
+            results.append(item)
+        return results
+
+    def delete(self, ids=None, where=None) -> int:
+        if ids is None and not where:
+            return 0
+        existing = self.collection.get(ids=ids, where=_chroma_where(where), include=[])
+        found = existing.get("ids") or []
+        if found:
+            self.collection.delete(ids=found)
+        return len(found)
+
+    def query(self, embedding, top_k, where=None):
+        params: Dict[str, Any] = {"query_embeddings": [embedding], "n_results": top_k}
+        if where:
+            params["where"] = _chroma_where(where)
+        found = self.collection.query(**params)
+        return [
+            {"id": cid, "document": doc, "metadata": meta or {}, "distance": dist}
+            for cid, doc, meta, dist in zip(
+                found.get("ids", [[]])[0],
+                found.get("documents", [[]])[0],
+                found.get("metadatas", [[]])[0],
+                found.get("distances", [[]])[0],
+            )
+        ]
+
+    def reset(self) -> None:
+        self.client.delete_collection(self.name)
+        self.collection = self.client.get_or_create_collection(name=self.name, metadata={"hnsw:space": "cosine"})
+
+    def destroy(self) -> None:
+        self.client.delete_collection(self.name)
+
+
+# ============================================================================
+# NumPy (memory-mapped, exact)
+# ============================================================================
+
+_DEFAULT_PARTITION = "_shared"
+_SEARCH_BLOCK = 65536  # rows dequantized per step, bounds temporary memory
+
+
+def _partition_name(value: Any) -> str:
+    return str(value) if value not in (None, "") else _DEFAULT_PARTITION
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact top-k over memory-mapped, quantized vectors, partitioned by owner.
+
+    Layout under ``directory``:
+
+    - ``rows.sqlite3`` — id → (partition, row), document and metadata, plus
+      per-partition size/capacity and a generation counter other processes
+      use to notice changes
+    - ``<partition>.vectors.npy`` — (capacity, dim) float16 or int8 matrix,
+      L2-normalised before quantization so a dot product is the cosine
+    - ``<partition>.scales.npy`` — per-row dequantization scale (int8 only)
+
+    Deleted rows leave a hole in the matrix until the partition is compacted
+    (when more than half of it is dead).
+    """
+
+    backend = "numpy"
+
+    def __init__(
+        self,
+        directory: str,
+        dim: int,
+        dtype: str = "float16",
+        partition_key: str = "owner_id",
+    ):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.directory = directory
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.partition_key = partition_key
+        self._lock = threading.RLock()
+        # partition → {"generation", "capacity", "vectors", "scales", "rows"}
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "rows.sqlite3"),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                id TEXT PRIMARY KEY,
+                partition TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                document TEXT,
+                metadata TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_rows_partition_row ON rows (partition, row);
+            CREATE INDEX IF NOT EXISTS ix_rows_meeting ON rows (json_extract(metadata, '$.meeting_id'));
+            -- Per-partition filters used by two-stage retrieval (summaries, then chunks of a few meetings)
+            CREATE INDEX IF NOT EXISTS ix_rows_partition_meeting ON rows (partition, json_extract(metadata, '$.meeting_id'));
+            CREATE INDEX IF NOT EXISTS ix_rows_doc_type ON rows (partition, json_extract(metadata, '$.doc_type'));
+            CREATE TABLE IF NOT EXISTS partitions (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                capacity INTEGER NOT NULL,
+                generation INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        stored = self._conn.execute("SELECT value FROM settings WHERE key = 'format'").fetchone()
+        fmt = json.dumps({"dim": dim, "dtype": dtype})
+        if stored is None:
+            self._conn.execute("INSERT INTO settings (key, value) VALUES ('format', ?)", (fmt,))
+        elif stored[0] != fmt:
+            raise ValueError(f"Vector store at {directory} was created with {stored[0]}, not {fmt}")
+
+    # ------------------------------------------------------------------
+    # Partition files
+    # ------------------------------------------------------------------
+
+    def _partition_of(self, metadata: Dict[str, Any]) -> str:
+        return _partition_name(metadata.get(self.partition_key) if metadata else None)
+
+    def _path(self, partition: str, kind: str) -> str:
+        slug = hashlib.sha1(partition.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{slug}.{kind}.npy")
+
+    def _partition_row(self, partition: str) -> Optional[tuple]:
+        return self._conn.execute(
+            "SELECT size, capacity, generation FROM partitions WHERE name = ?", (partition,)
+        ).fetchone()
+
+    def _open(self, partition: str) -> Optional[Dict[str, Any]]:
+        """Memory-map a partition, re-opening it if another writer changed it."""
+        info = self._partition_row(partition)
+        if info is None:
+            self._cache.pop(partition, None)
+            return None
+        _size, capacity, generation = info
+        cached = self._cache.get(partition)
+        if cached is not None and cached["generation"] == generation:
+            return cached
+        # Growth and compaction replace the files, so always re-map on change
+        vectors = np.load(self._path(partition, "vectors"), mmap_mode="r+")
+        scales = np.load(self._path(partition, "scales"), mmap_mode="r+") if self.dtype == np.int8 else None
+        rows = np.fromiter(
+            (r for (r,) in self._conn.execute(
+                "SELECT row FROM rows WHERE partition = ? ORDER BY row", (partition,)
+            )),
+            dtype=np.int64,
+        )
+        cached = {
+            "generation": generation,
+            "capacity": capacity,
+            "vectors": vectors,
+            "scales": scales,
+            "rows": rows,
+        }
+        self._cache[partition] = cached
+        return cached
+
+    def _allocate(self, partition: str, capacity: int, keep_rows: Optional[np.ndarray] = None) -> None:
+        """(Re)write a partition's files with ``capacity`` rows, copying ``keep_rows`` to the front."""
+        old = self._cache.get(partition)
+        for kind, dtype, shape in (
+            ("vectors", self.dtype, (capacity, self.dim)),
+            ("scales", np.float32, (capacity,)),
+        ):
+            if kind == "scales" and self.dtype != np.int8:
+                continue
+            path = self._path(partition, kind)
+            tmp = path + ".tmp"
+            new = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=shape)
+            if old is not None and keep_rows is not None and len(keep_rows):
+                source = old[kind]
+                for start in range(0, len(keep_rows), _SEARCH_BLOCK):
+                    block = keep_rows[start : start + _SEARCH_BLOCK]
+                    new[start : start + len(block)] = source[block]
+            new.flush()
+            del new
+            os.replace(tmp, path)
+        self._cache.pop(partition, None)
+
+    def _write_vectors(self, partition: str, rows: np.ndarray, matrix: np.ndarray) -> None:
+        part = self._open(partition)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1.0, norms)
+        if self.dtype == np.int8:
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            part["vectors"][rows] = np.round(matrix / scales[:, None]).astype(np.int8)
+            part["scales"][rows] = scales
+            part["scales"].flush()
+        else:
+            part["vectors"][rows] = matrix.astype(np.float16)
+        part["vectors"].flush()
+
+    def _bump(self, partition: str, size: Optional[int] = None, capacity: Optional[int] = None) -> None:
+        info = self._partition_row(partition)
+        self._conn.execute(
+            "UPDATE partitions SET size = ?, capacity = ?, generation = ? WHERE name = ?",
+            (
+                info[0] if size is None else size,
+                info[1] if capacity is None else capacity,
+                info[2] + 1,
+                partition,
+            ),
+        )
+
+    def _maybe_compact(self, partition: str) -> None:
+        info = self._partition_row(partition)
+        if info is None:
+            return
+        size, capacity, _generation = info
+        alive = self._conn.execute("SELECT COUNT(*) FROM rows WHERE partition = ?", (partition,)).fetchone()[0]
+        if alive == 0:
+            self._conn.execute("DELETE FROM partitions WHERE name = ?", (partition,))
+            self._cache.pop(partition, None)
+            for kind in ("vectors", "scales"):
+                if os.path.exists(self._path(partition, kind)):
+                    os.remove(self._path(partition, kind))
+            return
+        if size < 1024 or alive * 2 > size:
+            return
+        part = self._open(partition)
+        keep = part["rows"]
+        new_capacity = max(1024, 1 << int(alive - 1).bit_length())
+        self._allocate(partition, new_capacity, keep_rows=keep)
+        self._conn.executemany(
+            "UPDATE rows SET row = ? WHERE partition = ? AND row = ?",
+            [(new, partition, int(old)) for new, old in enumerate(keep)],
+        )
+        self._bump(partition, size=alive, capacity=new_capacity)
+
+    # ------------------------------------------------------------------
+    # Filters
+    # ------------------------------------------------------------------
+
+    def _where_sql(self, where: Optional[Where]) -> tuple:
+        clauses, params = [], []
+        for key, value in (where or {}).items():
+            if key == self.partition_key:
+                column = "partition"
+                value = [_partition_name(v) for v in value] if isinstance(value, (list, tuple, set)) \
+                    else _partition_name(value)
+            else:
+                column = f"json_extract(metadata, '$.{key}')"
+            if isinstance(value, (list, tuple, set)):
+                values = [str(v) for v in value]
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        return (" AND ".join(clauses) or "1"), params
+
+    def _partitions_for(self, where: Optional[Where]) -> List[str]:
+        value = (where or {}).get(self.partition_key)
+        if value is None:
+            return [name for (name,) in self._conn.execute("SELECT name FROM partitions")]
+        if isinstance(value, (list, tuple, set)):
+            return [_partition_name(v) for v in value]
+        return [_partition_name(value)]
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    def count(self, where=None) -> int:
+        clause, params = self._where_sql(where)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM rows WHERE {clause}", params).fetchone()[0]
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        if not ids:
+            return
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim embeddings, got shape {matrix.shape}")
+
+        by_partition: Dict[str, List[int]] = {}
+        for i, meta in enumerate(metadatas):
+            by_partition.setdefault(self._partition_of(meta), []).append(i)
+
+        with self._lock:
+            # Serialises writers across processes as well as threads
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = {}
+                for start in range(0, len(ids), 500):
+                    batch = ids[start : start + 500]
+                    existing.update(
+                        (cid, (partition, row))
+                        for cid, partition, row in self._conn.execute(
+                            f"SELECT id, partition, row FROM rows WHERE id IN ({','.join('?' * len(batch))})",
+                            batch,
+                        )
+                    )
+
+                touched = set()
+                for partition, indexes in by_partition.items():
+                    info = self._partition_row(partition)
+                    if info is None:
+                        capacity = max(1024, 1 << int(len(indexes) - 1).bit_length())
+                        self._conn.execute(
+                            "INSERT INTO partitions (name, size, capacity, generation) VALUES (?, 0, ?, 0)",
+                            (partition, capacity),
+                        )
+                        self._allocate(partition, capacity)
+                        size = 0
+                    else:
+                        size, capacity, _generation = info
+
+                    rows, records = [], []
+                    for i in indexes:
+                        previous = existing.get(ids[i])
+                        if previous is not None and previous[0] == partition:
+                            row = previous[1]  # overwrite in place
+                        else:
+                            if previous is not None:
+                                touched.add(previous[0])
+                            row = size
+                            size += 1
+                        rows.append(row)
+                        records.append((ids[i], partition, row, documents[i], json.dumps(metadatas[i] or {})))
+
+                    if size > capacity:
+                        new_capacity = 1 << int(size - 1).bit_length()
+                        part = self._open(partition)
+                        self._allocate(partition, new_capacity, keep_rows=np.arange(part["vectors"].shape[0]))
+                        capacity = new_capacity
+
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO rows (id, partition, row, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                        records,
+                    )
+                    self._bump(partition, size=size, capacity=capacity)
+                    self._write_vectors(partition, np.asarray(rows), matrix[indexes])
+                for partition in touched - set(by_partition):
+                    self._bump(partition)
+                self._conn.execute("COMMIT")
+                # Row lists were read mid-transaction; re-read on next use
+                for partition in touched | set(by_partition):
+                    self._cache.pop(partition, None)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._cache.clear()
+                raise
+
+    def get(self, ids=None, where=None, limit=None, offset=0, include_embeddings=False):
+        clause, params = self._where_sql(where)
+        if ids is not None:
+            if not ids:
+                return []
+            clause += f" AND id IN ({','.join('?' * len(ids))})"
+            params = params + list(ids)
+        sql = f"SELECT id, partition, row, document, metadata FROM rows WHERE {clause} ORDER BY partition, row"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [limit, offset]
+
+        with self._lock:
+            found = self._conn.execute(sql, params).fetchall()
+            results = []
+            for cid, partition, row, document, metadata in found:
+                item = {"id": cid, "document": document, "metadata": json.loads(metadata or "{}")}
+                if include_embeddings:
+                    part = self._open(partition)
+                    vector = np.asarray(part["vectors"][row], dtype=np.float32)
+                    if part["scales"] is not None:
+                        vector = vector * part["scales"][row]
+                    item["embedding"] = vector.tolist()
+                results.append(item)
+        return results
+
+    def delete(self, ids=None, where=None) -> int:
+        if ids is None and not where:
+            return 0
+        clause, params = self._where_sql(where)
+        if ids is not None:
+            if not ids:
+                return 0
+            clause += f" AND id IN ({','.join('?' * len(ids))})"
+            params = params + list(ids)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                partitions = [
+                    p for (p,) in self._conn.execute(f"SELECT DISTINCT partition FROM rows WHERE {clause}", params)
+                ]
+                deleted = self._conn.execute(f"DELETE FROM rows WHERE {clause}", params).rowcount
+                for partition in partitions:
+                    self._bump(partition)
+                    self._maybe_compact(partition)
+                self._conn.execute("COMMIT")
+                for partition in partitions:
+                    self._cache.pop(partition, None)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._cache.clear()
+                raise
+        return deleted
+
+    def query(self, embedding, top_k, where=None):
+        if top_k <= 0:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm:
+            query = query / norm
+        filters = {k: v for k, v in (where or {}).items() if k != self.partition_key}
+
+        with self._lock:
+            candidate_rows, candidate_scores = [], []
+            for partition in self._partitions_for(where):
+                part = self._open(partition)
+                if part is None:
+                    continue
+                rows = part["rows"]
+                if filters:
+                    clause, params = self._where_sql(filters)
+                    # Sorted here rather than in SQL so the filter indexes are usable
+                    rows = np.sort(np.fromiter(
+                        (r for (r,) in self._conn.execute(
+                            f"SELECT row FROM rows WHERE partition = ? AND {clause}",
+                            [partition] + params,
+                        )),
+                        dtype=np.int64,
+                    ))
+                if not len(rows):
+                    continue
+                scores = np.empty(len(rows), dtype=np.float32)
+                for start in range(0, len(rows), _SEARCH_BLOCK):
+                    block = rows[start : start + _SEARCH_BLOCK]
+                    vectors = part["vectors"][block].astype(np.float32)
+                    block_scores = vectors @ query
+                    if part["scales"] is not None:
+                        block_scores *= part["scales"][block]
+                    scores[start : start + len(block)] = block_scores
+                k = min(top_k, len(scores))
+                best = np.argpartition(-scores, k - 1)[:k]
+                candidate_rows.extend((partition, int(rows[i])) for i in best)
+                candidate_scores.extend(float(scores[i]) for i in best)
+
+            if not candidate_rows:
+                return []
+            order = np.argsort(-np.asarray(candidate_scores))[:top_k]
+            results = []
+            for i in order:
+                partition, row = candidate_rows[i]
+                found = self._conn.execute(
+                    "SELECT id, document, metadata FROM rows WHERE partition = ? AND row = ?",
+                    (partition, row),
+                ).fetchone()
+                if found is None:
+                    continue
+                results.append({
+                    "id": found[0],
+                    "document": found[1],
+                    "metadata": json.loads(found[2] or "{}"),
+                    "distance": 1.0 - candidate_scores[i],
+                })
+        return results
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                partitions = [p for (p,) in self._conn.execute("SELECT name FROM partitions")]
+                self._conn.execute("DELETE FROM rows")
+                self._conn.execute("DELETE FROM partitions")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._cache.clear()
+            for partition in partitions:
+                for kind in ("vectors", "scales"):
+                    path = self._path(partition, kind)
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            partitions = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(capacity), 0) FROM partitions").fetchone()
+        return {
+            "backend": self.backend,
+            "dtype": str(self.dtype),
+            "partitions": partitions[0],
+            "allocated_rows": partitions[1],
+            "bytes_per_vector": self.dim * self.dtype.itemsize + (4 if self.dtype == np.int8 else 0),
+        }
+
+    def destroy(self) -> None:
+        """Close and delete the store directory."""
+        with self._lock:
+            self._cache.clear()
+            self._conn.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
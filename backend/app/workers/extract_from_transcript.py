@@ -1,41 +1,52 @@
 # /Users/pragyabose/Ledger/backend/app/workers/extract_from_transcript.py
-print("🔥 RUNNING UPDATED extract_from_transcript.py 🔥")
 
+import logging
 from datetime import datetime
-from app.services.ai_extractor import extract_decisions_and_actions
-from app.db.models.decision import Decision
-from app.db.models.action_item import ActionItem
-from app.db.models.user import User
-from app.db.models.risk import Risk
+from app.services.ai_extractor import ExtractionFailed, extract_with_status
+from app.services.owner_resolver import resolve_owners
+from app.services.outcome_reconciler import write_outcomes
 
-def process_transcript(db, llm, transcript):
-    # -----------------------------
-    # 1. DELETE OLD DATA (IDEMPOTENT)
-    # -----------------------------
-    db.query(Decision).filter(
-        Decision.meeting_id == transcript.meeting_id
-    ).delete()
+logger = logging.getLogger(__name__)
 
-    db.query(ActionItem).filter(
-        ActionItem.meeting_id == transcript.meeting_id
-    ).delete()
 
-    db.query(Risk).filter(
-        Risk.meeting_id == transcript.meeting_id
-    ).delete()
+def process_transcript(db, llm, transcript, refresh=False, should_cancel=None, mode=None):
+    # -----------------------------
+    # 1. RUN EXTRACTION
+    # -----------------------------
+    # refresh=True re-runs the LLM even if this transcript is in the extraction cache
+    result, complete = extract_with_status(
+        llm, transcript.content, refresh=refresh
+    )
+    if result is None:
+        # Never overwrite saved outcomes with the empty fallback
+        raise ExtractionFailed("Every extraction attempt failed; saved outcomes were left untouched")
 
-    db.commit()
+    # Last point a running job can be cancelled; nothing has been written yet
+    if should_cancel is not None:
+        should_cancel()
 
     # -----------------------------
-    # 2. RUN EXTRACTION
+    # 2. RESOLVE OWNERS (one pass for every item)
     # -----------------------------
-    result = extract_decisions_and_actions(
-        llm, transcript.content
-    )
+    # Matched against the meeting's participants and colleagues; unknown
+    # names stay unassigned (don't create ghost accounts)
+    owner_names = [
+        item.get("owner")
+        for kind in ("decisions", "action_items")
+        for item in result.get(kind, [])
+        if isinstance(item, dict)
+    ]
+    owners = resolve_owners(db, transcript.meeting_id, owner_names)
+
+    def owner_id_for(owner_name):
+        match = owners.get(str(owner_name).strip()) if owner_name else None
+        return match["user_id"] if match else None
 
     # -----------------------------
-    # 3. SAVE DECISIONS (with owner + confidence)
+    # 3. BUILD ROWS
     # -----------------------------
+    rows = {"decisions": [], "action_items": [], "risks": []}
+
     for d in result.get("decisions", []):
         if isinstance(d, dict):
             summary = d.get("summary") or d.get("text") or ""
@@ -48,35 +59,14 @@ def process_transcript(db, llm, transcript):
             confidence = None
             owner_name = None
 
-        owner_id = None
-        if owner_name:
-            owner = db.query(User).filter(User.name == owner_name).first()
-            if owner:
-                owner_id = owner.id
-            # If no matching user found, leave owner_id as None (don't create ghost accounts)
-
-        db.add(
-            Decision(
-                meeting_id=transcript.meeting_id,
-                summary=summary,
-                source_sentence=source_sentence,
-                confidence=confidence,
-                owner_id=owner_id,
-            )
-        )
-    
-    # -----------------------------
-    # 4. SAVE ACTION ITEMS
-    # -----------------------------
-    for a in result.get("action_items", []):
-        owner_name = a.get("owner")
-        owner_id = None
-        if owner_name:
-            owner = db.query(User).filter(User.name == owner_name).first()
-            if owner:
-                owner_id = owner.id
-            # If no matching user found, leave owner_id as None (don't create ghost accounts)
+        rows["decisions"].append({
+            "summary": summary,
+            "source_sentence": source_sentence,
+            "confidence": confidence,
+            "owner_id": owner_id_for(owner_name),
+        })
 
+    for a in result.get("action_items", []):
         due = None
         if a.get("due_date"):
             try:
@@ -84,21 +74,15 @@ def process_transcript(db, llm, transcript):
             except Exception:
                 pass
 
-        db.add(
-            ActionItem(
-                meeting_id=transcript.meeting_id,
-                description=a["description"],
-                status="open",
-                owner_id=owner_id,
-                due_date=due,
-                source_sentence=a.get("source_sentence"),
-                confidence=a.get("confidence"),
-            )
-        )
+        rows["action_items"].append({
+            "description": a["description"],
+            "status": "open",
+            "owner_id": owner_id_for(a.get("owner")),
+            "due_date": due,
+            "source_sentence": a.get("source_sentence"),
+            "confidence": a.get("confidence"),
+        })
 
-    # -----------------------------
-    # 5. SAVE RISKS
-    # -----------------------------
     for r in result.get("risks", []):
         if isinstance(r, dict):
             description = r.get("description") or ""
@@ -109,20 +93,40 @@ def process_transcript(db, llm, transcript):
             source_sentence = None
             confidence = None
 
-        db.add(
-            Risk(
-                meeting_id=transcript.meeting_id,
-                description=description,
-                source_sentence=source_sentence,
-                confidence=confidence,
-            )
-        )
+        rows["risks"].append({
+            "description": description,
+            "source_sentence": source_sentence,
+            "confidence": confidence,
+        })
+
+    # -----------------------------
+    # 4. SAVE (IDEMPOTENT, ONE COMMIT)
+    # -----------------------------
+    # Done after the LLM call, so the meeting keeps its old results while
+    # a (possibly minutes-long) extraction runs. Reconcile mode updates
+    # matching rows in place, keeping their ids, status and acknowledged_at.
+    # A partial extraction (some windows failed) only adds and updates:
+    # rows it didn't match may come from the windows that were lost.
+    stats = write_outcomes(db, transcript.meeting_id, rows, mode=mode, prune=complete)
+
+    if stats["unchanged"] and not (stats["inserted"] or stats["updated"] or stats["deleted"]):
+        # Re-extraction changed nothing: facts and alerts are already up to date
+        return stats
 
-    db.commit()
+    # -----------------------------
+    # 5. INDEX FACTS FOR ASK-AI (non-fatal)
+    # -----------------------------
+    try:
+        from app.services.rag import index_meeting_facts
+        index_meeting_facts(db, transcript.meeting_id)
+    except Exception as e:
+        logger.warning(f"⚠️ RAG fact indexing failed (non-fatal): {e}", exc_info=True)
 
     # -----------------------------
     # 6. RUN ALERTS (single + repeated)
     # -----------------------------
     from app.workers.alert_engine import run_alerts_for_meeting, detect_repeated_issues
     run_alerts_for_meeting(db, transcript.meeting_id)
-    detect_repeated_issues(db, transcript.meeting_id)
\ No newline at end of file
+    detect_repeated_issues(db, transcript.meeting_id)
+
+    return stats
@@ -0,0 +1,103 @@
+"""Extraction job worker.
+
+Claims queued ``extraction_jobs`` rows and runs them (see
+app/services/extraction_queue.py). Run as its own process:
+
+    python -m app.workers.extraction_worker [--threads N] [--once]
+
+With EXTRACTION_INLINE_WORKER=true (default) each API process also runs
+EXTRACTION_WORKER_THREADS worker threads, so a single-container deploy
+needs no extra process; set it to false when running dedicated workers.
+"""
+
+import os
+import socket
+import logging
+import argparse
+import threading
+from typing import Optional
+
+from app.db.session import SessionLocal
+from app.services.extraction_queue import EXTRACTION_POLL_SECONDS, claim_next, requeue_stale, run_job
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_INLINE_WORKER = os.getenv("EXTRACTION_INLINE_WORKER", "true").lower() == "true"
+EXTRACTION_WORKER_THREADS = int(os.getenv("EXTRACTION_WORKER_THREADS", "1"))
+
+
+def _worker_loop(worker_id: str, stop: threading.Event, once: bool = False) -> int:
+    """Claim and run jobs until ``stop`` is set (or, with ``once``, the queue is empty)."""
+    processed = 0
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            requeue_stale(db)
+            job = claim_next(db, worker_id)
+        except Exception as e:
+            logger.error(f"⚠️ Extraction queue poll failed: {e}")
+            job = None
+        finally:
+            db.close()
+
+        if job is None:
+            if once:
+                break
+            stop.wait(EXTRACTION_POLL_SECONDS)
+            continue
+
+        logger.info(f"⚙️ [{worker_id}] Running extraction job {job.id}")
+        try:
+            result = run_job(job.id)
+            logger.info(f"[{worker_id}] Extraction job {job.id} → {result['status']} {result['timings']}")
+        except Exception as e:
+            # Keep the loop alive; a stuck job is requeued by requeue_stale
+            logger.error(f"❌ [{worker_id}] Extraction job {job.id} crashed: {e}")
+        processed += 1
+    return processed
+
+
+def run_worker(threads: int = 1, once: bool = False, stop: Optional[threading.Event] = None) -> None:
+    """Run ``threads`` worker loops in this process and wait for them."""
+    stop = stop or threading.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    loops = [
+        threading.Thread(target=_worker_loop, args=(f"{prefix}:{i}", stop, once), daemon=True)
+        for i in range(max(threads, 1))
+    ]
+    for loop in loops:
+        loop.start()
+    try:
+        for loop in loops:
+            while loop.is_alive():
+                loop.join(timeout=1)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+def start_inline_worker() -> Optional[threading.Event]:
+    """Start worker threads inside the API process; returns their stop event."""
+    if not EXTRACTION_INLINE_WORKER:
+        return None
+    stop = threading.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}:api"
+    for i in range(max(EXTRACTION_WORKER_THREADS, 1)):
+        threading.Thread(
+            target=_worker_loop, args=(f"{prefix}:{i}", stop), name=f"extraction-worker-{i}", daemon=True
+        ).start()
+    return stop
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run queued transcript extractions")
+    parser.add_argument("--threads", type=int, default=EXTRACTION_WORKER_THREADS)
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logger.info(f"🚀 Extraction worker started ({args.threads} thread(s))")
+    run_worker(threads=args.threads, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Blue/green rebuild of the Ask-AI index.
+
+Indexes every meeting into a new collection while queries keep using the
+current one, then swaps atomically (see rag.rebuild_index). Run after
+changing the chunker or the embedding model:
+
+    python -m app.workers.rag_rebuild [--chunker turns|words] [--batch-size N]
+                                      [--model NAME] [--max-rate CHUNKS_PER_SECOND]
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.chunking import CHUNKERS
+from app.services.embedding_model import MODELS
+from app.services.rag import rebuild_index
+
+
+def run_rebuild(chunker=None, batch_size=None, model=None, max_rate=None) -> dict:
+    db = SessionLocal()
+    try:
+        return rebuild_index(
+            db, chunker=chunker, batch_size=batch_size, model=model, max_chunks_per_second=max_rate
+        )
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the RAG index into a new collection and swap it in")
+    parser.add_argument("--chunker", choices=CHUNKERS, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--model", choices=sorted(MODELS), default=None, help="default: RAG_EMBEDDING_MODEL")
+    parser.add_argument("--max-rate", type=float, default=None, help="chunks encoded per second")
+    args = parser.parse_args()
+
+    print("🏗️  Rebuilding RAG index (queries keep using the current collection)...")
+    result = run_rebuild(
+        chunker=args.chunker, batch_size=args.batch_size, model=args.model, max_rate=args.max_rate
+    )
+    if result.get("status") != "success":
+        print(f"❌ Rebuild failed: {result.get('message') or result.get('errors')}")
+        raise SystemExit(1)
+    print(
+        f"✅ Now serving {result['collection']} ({result['model']}): {result['indexed_meetings']} meetings, "
+        f"{result['total_chunks']} chunks"
+    )
+    if result["dropped_collections"]:
+        print(f"🗑️  Dropped {', '.join(result['dropped_collections'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Gunicorn settings for the Ledger API.
+
+With EMBEDDING_SERVER_SOCKET set, the master starts one embedding server
+process (app/services/embedding_server.py) before forking; workers send
+their embedding requests to it over the Unix socket, where concurrent
+requests are micro-batched, and no worker loads the model at all.
+
+Otherwise, with RAG_PRELOAD_MODEL=true (default) the master process loads
+the sentence-transformers model before forking, so every worker shares the
+weights copy-on-write instead of loading its own copy. Only the model is
+pre-loaded — the app itself (DB engine, vector store, SQLite handles) is
+still imported in each worker, so no connections cross the fork.
+"""
+import os
+import sys
+import subprocess
+
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.getenv("BIND", "0.0.0.0:8000")
+timeout = 120
+accesslog = "-"
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+_embedding_server = None
+
+
+def _start_embedding_server(server, socket_path):
+    global _embedding_server
+    sys.path.insert(0, _BACKEND_DIR)
+    from app.services.embedding_server import wait_for_socket
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    _embedding_server = subprocess.Popen(
+        [sys.executable, "-m", "app.services.embedding_server", "--socket", socket_path],
+        cwd=_BACKEND_DIR,
+    )
+    # Workers fall back to an in-process model if the socket isn't there yet
+    if wait_for_socket(socket_path, timeout=float(os.getenv("EMBEDDING_SERVER_START_TIMEOUT", "120"))):
+        server.log.info(f"Embedding server ready on {socket_path}")
+    else:
+        server.log.warning("Embedding server did not start; workers will embed in-process")
+
+
+def on_starting(server):
+    socket_path = os.getenv("EMBEDDING_SERVER_SOCKET", "")
+    if socket_path and os.getenv("EMBEDDING_SERVER_AUTOSTART", "true").lower() == "true":
+        _start_embedding_server(server, socket_path)
+        return
+
+    if os.getenv("RAG_PRELOAD_MODEL", "true").lower() != "true":
+        return
+    sys.path.insert(0, _BACKEND_DIR)
+    from app.services.embedding_model import preload_for_fork
+    if preload_for_fork():
+        server.log.info("Embedding model pre-loaded in master; workers will share it")
+
+
+def on_exit(server):
+    if _embedding_server is not None and _embedding_server.poll() is None:
+        _embedding_server.terminate()
+        try:
+            _embedding_server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _embedding_server.kill()
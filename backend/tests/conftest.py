@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Vector store, BM25 index and caches live under CHROMA_PERSIST_DIR; keep
+# them out of the source tree (set before any app module is imported)
+os.environ.setdefault("CHROMA_PERSIST_DIR", tempfile.mkdtemp(prefix="ledger-test-chroma-"))
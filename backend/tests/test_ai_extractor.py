@@ -0,0 +1,56 @@
+from app.services import ai_extractor
+from app.services.ai_extractor import extract_chunked, merge_extractions, split_transcript
+
+
+def test_split_transcript_overlaps_on_line_boundaries():
+    lines = [f"Speaker {i % 3}: line number {i} of the meeting." for i in range(40)]
+    windows = split_transcript("\n".join(lines), max_chars=300, overlap=80)
+
+    assert len(windows) > 1
+    assert all(len(w) <= 300 for w in windows)
+    # Every line survives whole, and consecutive windows share their boundary lines
+    assert set(lines) == {line for w in windows for line in w.splitlines()}
+    for first, second in zip(windows, windows[1:]):
+        assert first.splitlines()[-1] == second.splitlines()[0]
+
+
+def test_merge_extractions_dedupes_and_fills_fields():
+    merged = merge_extractions([
+        {
+            "decisions": [{"summary": "Ship v2 in March.", "owner": None, "confidence": 0.6}],
+            "action_items": [{"description": "Carol runs QA sign-off", "owner": "Carol", "confidence": 0.9}],
+            "risks": [],
+        },
+        {
+            "decisions": [{"summary": "ship v2 in March", "owner": "Alice", "confidence": 0.8}],
+            "action_items": [{"description": "Carol runs the QA sign-off", "due_date": "2024-03-01", "confidence": 0.7}],
+            "risks": [{"description": "QA may slip"}],
+        },
+    ])
+
+    assert merged["decisions"] == [{"summary": "ship v2 in March", "owner": "Alice", "confidence": 0.8}]
+    assert merged["action_items"] == [{
+        "description": "Carol runs QA sign-off",
+        "owner": "Carol",
+        "confidence": 0.9,
+        "due_date": "2024-03-01",
+    }]
+    assert merged["risks"] == [{"description": "QA may slip"}]
+
+
+def test_extract_chunked_reports_partial_results(monkeypatch):
+    def fake_single(llm, text):
+        if "[Part 2 of" in text:
+            return None
+        return {"decisions": [{"summary": text.splitlines()[1]}], "action_items": [], "risks": []}
+
+    monkeypatch.setattr(ai_extractor, "_extract_single", fake_single)
+    monkeypatch.setattr(ai_extractor, "EXTRACT_CHUNK_CHARS", 300)
+    monkeypatch.setattr(ai_extractor, "EXTRACT_CHUNK_OVERLAP", 0)
+    text = "\n".join(f"Speaker {i}: point {i} of the meeting agenda today." for i in range(30))
+
+    result, complete = extract_chunked(None, text)
+    assert result["decisions"] and complete is False
+
+    monkeypatch.setattr(ai_extractor, "_extract_single", lambda llm, text: None)
+    assert extract_chunked(None, text) == (None, False)
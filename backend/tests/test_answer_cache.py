@@ -0,0 +1,47 @@
+from app.services import answer_cache
+from app.services.answer_cache import AnswerCache
+
+
+def test_similar_question_with_same_chunks_hits():
+    cache = AnswerCache(threshold=0.9)
+    cache.put([1.0, 0.0], "chunks-a", ["m1"], "We ship Friday.")
+
+    assert cache.lookup([0.99, 0.1], "chunks-a")["answer"] == "We ship Friday."
+    assert cache.lookup([0.6, 0.8], "chunks-a") is None  # below the threshold
+    assert cache.lookup([1.0, 0.0], "chunks-b") is None  # other chunks retrieved
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    cache = AnswerCache(ttl_seconds=60)
+    cache.put([1.0, 0.0], "k", ["m1"], "old")
+
+    now[0] += 59
+    assert cache.lookup([1.0, 0.0], "k")["answer"] == "old"
+    now[0] += 2
+    assert cache.lookup([1.0, 0.0], "k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = AnswerCache(max_entries=2)
+    cache.put([1.0, 0.0], "a", ["m1"], "A")
+    cache.put([1.0, 0.0], "b", ["m2"], "B")
+    assert cache.lookup([1.0, 0.0], "a") is not None  # "a" is now the most recent
+
+    cache.put([1.0, 0.0], "c", ["m3"], "C")
+    assert cache.lookup([1.0, 0.0], "b") is None
+    assert cache.lookup([1.0, 0.0], "a")["answer"] == "A"
+    assert cache.evictions == 1
+
+
+def test_reindexed_meetings_invalidate_their_answers():
+    cache = AnswerCache()
+    cache.put([1.0, 0.0], "a", ["m1", "m2"], "A")
+    cache.put([1.0, 0.0], "b", ["m3"], "B")
+
+    assert cache.invalidate_meetings(["m2"]) == 1
+    assert cache.lookup([1.0, 0.0], "a") is None
+    assert cache.lookup([1.0, 0.0], "b")["answer"] == "B"
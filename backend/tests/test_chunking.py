@@ -0,0 +1,42 @@
+from app.services.chunking import chunk_transcript, parse_turns
+
+
+def _count(text):
+    return len(text.split())
+
+
+TRANSCRIPT = """[00:05] Alice: We agreed on: shipping v2 in March. Bob owns the rollout.
+[00:21] Bob: Fine. I need the QA sign-off first. Carol, can you do that?
+It should take a week.
+[01:02] Carol: Yes, I can take it."""
+
+
+def test_parse_turns_reads_timestamps_and_speakers():
+    turns = parse_turns(TRANSCRIPT)
+    assert [(t["timestamp"], t["speaker"]) for t in turns] == [
+        ("00:05", "Alice"),
+        ("00:21", "Bob"),
+        ("01:02", "Carol"),
+    ]
+    assert turns[1]["text"].endswith("It should take a week.")
+
+
+def test_turn_chunks_respect_budget_and_sentences():
+    chunks = chunk_transcript(TRANSCRIPT, "turns", max_tokens=14, count_tokens=_count)
+
+    assert all(_count(c["text"]) <= 14 for c in chunks)
+    # Every line starts with its turn header, even when a turn is split
+    assert all(line.startswith("[") for c in chunks for line in c["text"].splitlines())
+    assert chunks[0]["start"] == "00:05"
+    assert chunks[0]["speakers"] == ["Alice"]
+    # Sentences are never cut
+    assert "We agreed on: shipping v2 in March." in chunks[0]["text"]
+
+    whole = chunk_transcript(TRANSCRIPT, "turns", max_tokens=200, count_tokens=_count)
+    assert len(whole) == 1
+    assert whole[0]["speakers"] == ["Alice", "Bob", "Carol"]
+
+
+def test_words_strategy_keeps_fixed_windows():
+    chunks = chunk_transcript("one two three four five", "words", 10, _count, chunk_size=3, overlap=1)
+    assert [c["text"] for c in chunks] == ["one two three", "three four five", "five"]
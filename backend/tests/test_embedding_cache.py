@@ -0,0 +1,25 @@
+from app.services.embedding_cache import EmbeddingCache, hash_text
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    h1, h2 = hash_text("hello"), hash_text("world")
+
+    assert cache.get_many("model-a", [h1, h2]) == {}
+    assert cache.misses == 2
+
+    cache.put_many("model-a", {h1: [0.5, 0.25]})
+    found = cache.get_many("model-a", [h1, h2])
+    assert found == {h1: [0.5, 0.25]}
+    assert cache.hits == 1
+    assert cache.misses == 3
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    h = hash_text("same text")
+    cache.put_many("model-a", {h: [1.0]})
+
+    assert cache.get_many("model-b", [h]) == {}
+    assert cache.count("model-a") == 1
+    assert cache.count("model-b") == 0
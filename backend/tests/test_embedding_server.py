@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+
+from app.services.embedding_server import MicroBatcher
+
+
+def _run(scenario, encode=None, **batcher_kwargs):
+    """Run ``scenario(batcher)`` against a live batcher; returns (result, encode calls, batcher)."""
+    calls = []
+
+    def fake_encode(texts):
+        calls.append(list(texts))
+        return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+    async def main():
+        batcher = MicroBatcher(encode or fake_encode, **batcher_kwargs)
+        task = asyncio.create_task(batcher.run())
+        try:
+            return await asyncio.wait_for(scenario(batcher), timeout=2), calls, batcher
+        finally:
+            task.cancel()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_batch():
+    async def scenario(batcher):
+        return await asyncio.gather(batcher.submit(["a", "bb"]), batcher.submit(["ccc"]))
+
+    (first, second), calls, batcher = _run(scenario, window_ms=50)
+    assert calls == [["a", "bb", "ccc"]]
+    assert first.tolist() == [[1.0], [2.0]] and second.tolist() == [[3.0]]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_full_batch_flushes_before_the_window():
+    async def scenario(batcher):
+        return await asyncio.gather(*(batcher.submit([t]) for t in "abcd"))
+
+    _, calls, _ = _run(scenario, window_ms=10_000, max_batch_size=2)
+    assert calls == [["a", "b"], ["c", "d"]]
+
+
+def test_window_expiry_flushes_a_partial_batch():
+    async def scenario(batcher):
+        await batcher.submit(["a"])
+        await batcher.submit(["b"])
+
+    _, calls, batcher = _run(scenario, window_ms=5)
+    assert calls == [["a"], ["b"]]
+    assert batcher.stats()["batch_size_histogram"] == {"1": 2}
+
+
+def test_encode_failure_reaches_every_request():
+    def boom(texts):
+        raise ValueError("model exploded")
+
+    async def scenario(batcher):
+        return await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+        )
+
+    results, _, _ = _run(scenario, encode=boom, window_ms=50)
+    assert [str(r) for r in results] == ["model exploded", "model exploded"]
@@ -0,0 +1,29 @@
+from app.services.extraction_cache import ExtractionCache
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extractions.sqlite3"))
+    result = {"decisions": [{"summary": "Ship v2"}], "action_items": [], "risks": []}
+
+    assert cache.get("h1", "ollama", "llama3", "v1") is None
+    cache.put("h1", "ollama", "llama3", "v1", result)
+    assert cache.get("h1", "ollama", "llama3", "v1") == result
+    # Any part of the key changing is a miss
+    assert cache.get("h1", "ollama", "llama3", "v2") is None
+    assert cache.get("h1", "ollama", "mistral", "v1") is None
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 3)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extractions.sqlite3"), max_entries=2)
+    for h in ("a", "b"):
+        cache.put(h, "ollama", "llama3", "v1", {"h": h})
+    cache.get("a", "ollama", "llama3", "v1")  # "b" is now the oldest
+    cache.put("c", "ollama", "llama3", "v1", {"h": "c"})
+
+    assert cache.count() == 2
+    assert cache.get("b", "ollama", "llama3", "v1") is None
+    assert cache.get("a", "ollama", "llama3", "v1") == {"h": "a"}
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.extraction_job import ExtractionJob
+from app.db.models.meeting import Meeting
+from app.db.models.transcript import Transcript
+from app.services.extraction_queue import cancel, claim_next, enqueue
+
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/queue.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    meeting = Meeting(title="Standup")
+    db.add(meeting)
+    db.commit()
+    transcript = Transcript(meeting_id=meeting.id, content="Alice: ship it.")
+    db.add(transcript)
+    db.commit()
+    return db, transcript
+
+
+def test_enqueue_dedupes_and_claims_once(tmp_path):
+    db, transcript = _session(tmp_path)
+
+    job = enqueue(db, transcript)
+    assert enqueue(db, transcript).id == job.id  # double click reuses the active job
+    # A double-clicked re-extract too; the queued job becomes a refresh
+    assert enqueue(db, transcript, refresh=True).id == job.id
+    assert db.get(ExtractionJob, job.id).refresh is True
+
+    claimed = claim_next(db, "w1")
+    assert (claimed.id, claimed.status, claimed.attempts) == (job.id, "running", 1)
+    assert enqueue(db, transcript, refresh=True).id == job.id
+    assert claim_next(db, "w2") is None
+
+    db.query(ExtractionJob).update({"status": "succeeded"})
+    db.commit()
+    assert enqueue(db, transcript, refresh=True).id != job.id
+
+
+def test_cancel_queued_and_running(tmp_path):
+    db, transcript = _session(tmp_path)
+
+    queued = cancel(db, enqueue(db, transcript))
+    assert queued.status == "cancelled"
+
+    assert claim_next(db, "w1") is None  # a cancelled job is never claimed
+
+    job = enqueue(db, transcript)
+    claim_next(db, "w1")
+    db.refresh(job)
+    job = cancel(db, job)
+    assert (job.status, job.cancel_requested) == ("running", True)
+
+
+def _run_with(tmp_path, monkeypatch, fake_process):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/app.db")  # if session isn't imported yet
+    from app.db import session as db_session
+    from app.services import extraction_queue
+    from app.workers import extract_from_transcript
+
+    db, transcript = _session(tmp_path)
+    monkeypatch.setattr(db_session, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    monkeypatch.setattr(extract_from_transcript, "process_transcript", fake_process)
+    monkeypatch.setattr(extraction_queue, "index_meeting_for_rag", lambda stage_db, meeting_id: None)
+
+    job = enqueue(db, transcript)
+    claim_next(db, "w1")
+    return db, extraction_queue.run_job(job.id, llm_factory=lambda: None)
+
+
+def test_cancel_after_write_still_succeeds(tmp_path, monkeypatch):
+    def fake_process(db, llm, transcript, refresh=False, should_cancel=None):
+        should_cancel()
+        # Results are committed; a cancel arriving now must not undo the job
+        db.query(ExtractionJob).update({"cancel_requested": True})
+        db.commit()
+        return {"assigned_action_item_ids": []}
+
+    _, result = _run_with(tmp_path, monkeypatch, fake_process)
+    assert result["status"] == "succeeded"
+    assert set(result["timings"]) >= {"extract", "notify", "index"}
+
+
+def test_failed_extraction_fails_the_job(tmp_path, monkeypatch):
+    from app.services.ai_extractor import ExtractionFailed
+
+    def fake_process(db, llm, transcript, refresh=False, should_cancel=None):
+        raise ExtractionFailed("every call failed")
+
+    _, result = _run_with(tmp_path, monkeypatch, fake_process)
+    assert (result["status"], result["error"]) == ("failed", "every call failed")
+
+
+def test_superseded_worker_cannot_overwrite_status(tmp_path, monkeypatch):
+    def fake_process(db, llm, transcript, refresh=False, should_cancel=None):
+        # requeue_stale handed the job back to the queue while we were extracting
+        db.query(ExtractionJob).update({"status": "queued", "worker_id": None})
+        db.commit()
+        should_cancel()
+        raise AssertionError("a superseded run must stop before writing")
+
+    _, result = _run_with(tmp_path, monkeypatch, fake_process)
+    assert result["status"] == "queued"
+
+
+def test_job_endpoints_only_serve_the_meeting_owner(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/app.db")  # if session isn't imported yet
+    from fastapi import HTTPException
+    from app.api import extract as extract_api
+    from app.db.models.user import User
+
+    db, transcript = _session(tmp_path)
+    owner, stranger = User(name="Alice", email="alice@example.com"), User(name="Mallory", email="m@example.com")
+    db.add_all([owner, stranger])
+    db.commit()
+    db.query(Meeting).update({"owner_id": owner.id})
+    db.commit()
+    job = enqueue(db, transcript)
+
+    for call in (extract_api.extraction_job_status, extract_api.cancel_extraction_job):
+        with pytest.raises(HTTPException) as denied:
+            call(job.id, db=db, current_user=stranger)
+        assert denied.value.status_code == 403
+    assert db.get(ExtractionJob, job.id).status == "queued"
+
+    assert extract_api.extraction_job_status(job.id, db=db, current_user=owner)["status"] == "queued"
+    assert extract_api.cancel_extraction_job(job.id, db=db, current_user=owner)["status"] == "cancelled"
@@ -0,0 +1,29 @@
+from app.services.lexical_index import LexicalIndex, query_terms, reciprocal_rank_fusion
+
+
+def test_query_terms_keep_identifiers():
+    assert query_terms("What is the status of ABC-123 in v2.3.1?") == ["status", "abc-123", "v2.3.1"]
+
+
+def test_search_matches_exact_tokens_and_filters_meetings(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.sqlite3"))
+    index.add([
+        ("m1-c0", "m1", "u1", "Priya owns ticket ABC-123."),
+        ("m2-c0", "m2", "u1", "ABC planning for 123 customers."),
+        ("m3-c0", "m3", "u2", "Unrelated roadmap discussion."),
+    ])
+
+    hits = index.search("ABC-123", limit=5)
+    assert [h["id"] for h in hits][0] == "m1-c0"
+    assert "m3-c0" not in [h["id"] for h in hits]
+
+    assert index.search("ABC-123", meeting_ids=["m2"]) == []
+    assert index.search("ABC-123", owner_id="u2") == []
+
+    index.delete_meetings(["m1"])
+    assert index.count() == 2
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    scores = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)
+    assert max(scores, key=scores.get) == "b"
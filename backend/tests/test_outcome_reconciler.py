@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.action_item import ActionItem
+from app.db.models.alert import Alert
+from app.db.models.decision import Decision
+from app.db.models.meeting import Meeting
+from app.db.models.user import User
+from app.services.outcome_reconciler import match_items, reconcile_outcomes
+
+
+def test_match_items_prefers_exact_then_source_then_fuzzy():
+    existing = [
+        {"text": "Ship v2 on Friday", "source_sentence": "a"},
+        {"text": "Hire a designer", "source_sentence": "We need a designer."},
+        {"text": "Migrate the billing database", "source_sentence": None},
+    ]
+    new = [
+        {"text": "Migrate the billing databases", "source_sentence": None},
+        {"text": "ship v2 on friday!", "source_sentence": "b"},
+        {"text": "Bring on a designer", "source_sentence": "We need a designer"},
+        {"text": "Something new", "source_sentence": None},
+    ]
+    assert sorted(match_items(existing, new)) == [(0, 1), (1, 2), (2, 0)]
+
+
+def _rows(*actions, decisions=()):
+    return {
+        "decisions": [{"summary": d, "source_sentence": None, "confidence": 0.9, "owner_id": None} for d in decisions],
+        "action_items": [
+            {"description": a, "status": "open", "owner_id": owner, "due_date": None,
+             "source_sentence": None, "confidence": 0.8}
+            for a, owner in actions
+        ],
+        "risks": [],
+    }
+
+
+def test_reconcile_keeps_user_state_and_ids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/outcomes.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    bob = User(name="Bob", email="bob@example.com")
+    meeting = Meeting(title="Planning")
+    db.add_all([bob, meeting])
+    db.commit()
+    meeting_id, bob_id = meeting.id, bob.id
+
+    first = reconcile_outcomes(db, meeting_id, _rows(("Write the spec", None), ("Book the venue", None), decisions=["Ship v2"]))
+    assert first["inserted"] == 3
+
+    spec = db.query(ActionItem).filter_by(description="Write the spec").one()
+    venue = db.query(ActionItem).filter_by(description="Book the venue").one()
+    spec.status = "done"
+    spec.acknowledged_at = datetime.now(timezone.utc)
+    db.add(Alert(meeting_id=meeting_id, action_item_id=venue.id, type="no_owner", message="x"))
+    db.commit()
+    spec_id = spec.id
+
+    again = reconcile_outcomes(db, meeting_id, _rows(("Write the spec", None), ("Book the venue", None), decisions=["Ship v2"]))
+    assert (again["inserted"], again["updated"], again["deleted"], again["unchanged"]) == (0, 0, 0, 3)
+
+    stats = reconcile_outcomes(db, meeting_id, _rows(("Write the spec.", bob_id), ("Order pizza", None), decisions=["Ship v2"]))
+    assert (stats["inserted"], stats["updated"], stats["deleted"], stats["unchanged"]) == (1, 1, 1, 1)
+    assert stats["assigned_action_item_ids"] == [spec_id]
+
+    spec = db.query(ActionItem).filter_by(meeting_id=meeting_id, description="Write the spec.").one()
+    assert (spec.id, spec.status, spec.owner_id) == (spec_id, "done", bob_id)
+    assert spec.acknowledged_at is not None
+    assert db.query(ActionItem).filter_by(description="Book the venue").count() == 0
+    assert db.query(Alert).count() == 0  # the deleted item's alert went with it
+    assert db.query(Decision).filter_by(meeting_id=meeting_id).count() == 1
+
+
+def test_failed_or_partial_extraction_keeps_saved_rows(tmp_path, monkeypatch):
+    import pytest
+
+    from app.db.models.transcript import Transcript
+    from app.services.ai_extractor import ExtractionFailed
+    from app.workers import extract_from_transcript
+
+    engine = create_engine(f"sqlite:///{tmp_path}/outcomes.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    meeting = Meeting(title="Planning")
+    db.add(meeting)
+    db.commit()
+    transcript = Transcript(meeting_id=meeting.id, content="Alice: write the spec.")
+    db.add(transcript)
+    db.commit()
+    reconcile_outcomes(db, meeting.id, _rows(("Write the spec", None), ("Book the venue", None)))
+
+    monkeypatch.setattr(extract_from_transcript, "extract_with_status", lambda *a, **k: (None, False))
+    with pytest.raises(ExtractionFailed):
+        extract_from_transcript.process_transcript(db, None, transcript)
+    assert db.query(ActionItem).count() == 2
+
+    partial = {"decisions": [], "action_items": [{"description": "Order pizza"}], "risks": []}
+    monkeypatch.setattr(extract_from_transcript, "extract_with_status", lambda *a, **k: (partial, False))
+    stats = extract_from_transcript.process_transcript(db, None, transcript)
+    assert (stats["inserted"], stats["deleted"]) == (1, 0)
+    assert db.query(ActionItem).count() == 3
@@ -0,0 +1,79 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.action_item import ActionItem  # noqa: F401 (User.action_items)
+from app.db.models.colleague import Colleague
+from app.db.models.meeting import Meeting
+from app.db.models.meeting_participant import MeetingParticipant
+from app.db.models.user import User
+from app.services.owner_resolver import NameIndex, normalize_name, resolve_owners
+
+
+def _index():
+    return NameIndex([
+        {"id": "1", "name": "Alice Smith", "email": "asmith@example.com", "participant": True},
+        {"id": "2", "name": "Alice Jones", "email": "alice.jones@example.com", "participant": False},
+        {"id": "3", "name": "José O'Neil", "email": "jose@example.com", "participant": True},
+        {"id": "4", "name": "Carol Stone", "email": "cstone@example.com", "participant": False},
+        {"id": "5", "name": "Carol Price", "email": "cprice@example.com", "participant": False},
+    ])
+
+
+def test_normalize_name():
+    assert normalize_name("Dr. José  O'Neil") == "jose oneil"
+
+
+def test_match_tiers_and_confidence():
+    index = _index()
+
+    assert index.resolve("alice smith")["confidence"] == 1.0
+    assert index.resolve("Jose ONeil")["user_id"] == "3"
+    assert index.resolve("asmith")["method"] == "email"
+    assert index.resolve("Carol S.")["user_id"] == "4"
+    assert index.resolve("O'Neil")["method"] == "last_name"
+
+    # Two Alices: the participant wins, with a lower confidence
+    alice = index.resolve("Alice")
+    assert (alice["user_id"], alice["confidence"]) == ("1", 0.85)
+    # Two Carols, neither attended: ambiguous, not guessed
+    assert index.resolve("Carol") is None
+
+    typo = index.resolve("Alice Smyth")
+    assert (typo["user_id"], typo["method"]) == ("1", "fuzzy")
+    assert typo["confidence"] < 0.9
+    assert index.resolve("Zed") is None
+
+
+def test_resolve_owners_batches_queries(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/owners.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    owner = User(name="Olivia Park", email="olivia@example.com")
+    bob = User(name="Bob Lee", email="bob@example.com")
+    dana = User(name="Dana White", email="dana@example.com")
+    outsider = User(name="Eve Stranger", email="eve@example.com")
+    db.add_all([owner, bob, dana, outsider])
+    db.commit()
+    meeting = Meeting(title="Planning", owner_id=owner.id)
+    db.add(meeting)
+    db.commit()
+    db.add_all([
+        MeetingParticipant(meeting_id=meeting.id, user_id=bob.id),
+        Colleague(user_id=owner.id, colleague_id=dana.id),
+    ])
+    db.commit()
+
+    meeting_id = meeting.id
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    names = ["Bob", "bob lee", "Dana", "Olivia", "Eve Stranger", "Nobody"] * 10
+    owners = resolve_owners(db, meeting_id, names)
+
+    assert len(statements) == 2  # candidates + one exact-name fallback
+    assert owners["Bob"]["user_id"] == bob.id
+    assert owners["Dana"]["user_id"] == dana.id
+    assert owners["Olivia"]["user_id"] == owner.id
+    assert owners["Eve Stranger"]["method"] == "exact_global"
+    assert owners["Nobody"] is None
@@ -0,0 +1,349 @@
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.action_item import ActionItem  # noqa: F401 (User.action_items)
+from app.db.models.decision import Decision
+from app.db.models.meeting import Meeting
+from app.db.models.rag_index_state import RagIndexState
+from app.db.models.risk import Risk  # noqa: F401
+from app.db.models.transcript import Transcript
+from app.db.models.user import User  # noqa: F401 (meetings.owner_id)
+from app.services import embedding_model, llm_client, rag
+from app.services.vector_store import NumpyVectorStore
+
+
+def _word_count(text, name=None):
+    return len(text.split())
+
+
+def test_chunk_budget_fits_the_encoder_window(monkeypatch):
+    monkeypatch.setattr(rag, "CHUNK_TOKENS", 224)
+    monkeypatch.setattr(embedding_model, "count_tokens", _word_count)
+    assert rag._chunk_token_budget("all-MiniLM-L6-v2") == 224
+    assert rag._chunk_token_budget("paraphrase-MiniLM-L3-v2") == 126
+
+    text = "\n".join(f"Alice: point {i} of a long and winding update." for i in range(200))
+    chunks = rag._chunk_transcript(text, "turns", "paraphrase-MiniLM-L3-v2")
+    assert len(chunks) > 1
+    assert all(_word_count(c["text"]) <= 126 for c in chunks)
+    assert max(_word_count(c["text"]) for c in rag._chunk_transcript(text, "turns", "all-MiniLM-L6-v2")) > 126
+
+
+def _hit(meeting_id, document, chunk_index=None, doc_type="transcript"):
+    meta = {"meeting_id": meeting_id, "meeting_title": f"Meeting {meeting_id}", "doc_type": doc_type}
+    if chunk_index is not None:
+        meta["chunk_index"] = chunk_index
+    return {"id": f"{meeting_id}-{chunk_index}-{doc_type}", "document": document, "metadata": meta}
+
+
+def test_build_context_merges_adjacent_chunks_and_strips_overlap(monkeypatch):
+    monkeypatch.setattr(embedding_model, "count_tokens", _word_count)
+    results = [
+        _hit("m1", "we agreed to ship on friday after review", 1),
+        _hit("m1", "alice opened the call and we agreed to ship", 0),
+        _hit("m1", "Decision: ship on Friday", doc_type="decision"),
+        _hit("m1", "bob will write the release notes", 4),
+    ]
+
+    context = rag.build_context(results, max_tokens=0)
+    assert context == (
+        "[Meeting: Meeting m1]\n"
+        "Decision: ship on Friday\n...\n"
+        "alice opened the call and we agreed to ship on friday after review\n...\n"
+        "bob will write the release notes"
+    )
+
+
+def test_build_context_trims_the_best_chunk_to_the_budget(monkeypatch):
+    monkeypatch.setattr(embedding_model, "count_tokens", _word_count)
+    best = " ".join(f"w{i}" for i in range(40))
+
+    context = rag.build_context([_hit("m1", best, 0), _hit("m2", "short", 0)], max_tokens=20)
+    assert context.startswith("[Meeting: Meeting m1]\nw0 w1 ")
+    assert "m2" not in context and _word_count(context) <= 20
+
+
+def test_build_context_skips_chunks_over_budget_but_keeps_smaller_ones(monkeypatch):
+    monkeypatch.setattr(embedding_model, "count_tokens", _word_count)
+    results = [
+        _hit("m1", "we ship on friday", 0),
+        _hit("m2", "a long tangent " * 10, 0),
+        _hit("m3", "bob owns the notes", 0),
+    ]
+
+    context = rag.build_context(results, max_tokens=20)
+    assert context == (
+        "[Meeting: Meeting m1]\nwe ship on friday"
+        "\n\n---\n\n"
+        "[Meeting: Meeting m3]\nbob owns the notes"
+    )
+
+
+def test_summary_document_prefers_facts_and_fits_the_budget():
+    meta = {"meeting_title": "Planning", "meeting_date": "2024-05-01", "participants": "Alice, Bob"}
+    facts = ["Decision: ship on Friday", "Action item: Bob writes the notes", "Risk: the vendor is late"]
+    chunks = ["Alice: we ship Friday. Then we rest.\nBob: fine.", "Bob: I'll take notes."]
+
+    doc = rag._summary_document(meta, facts, chunks, _word_count, max_tokens=100)
+    assert doc.splitlines() == ["Meeting: Planning (2024-05-01)", "Participants: Alice, Bob", *facts]
+
+    # Without facts: the opening sentence of every chunk
+    doc = rag._summary_document(meta, [], chunks, _word_count, max_tokens=100)
+    assert doc.splitlines()[2:] == ["Alice: we ship Friday.", "Bob: I'll take notes."]
+
+    # Lines that would overflow the budget are dropped, the header never is
+    doc = rag._summary_document(meta, facts, chunks, _word_count, max_tokens=12)
+    assert doc.splitlines()[2:] == facts[:1]
+    assert _word_count(doc) <= 12
+
+
+def _tagged_store(tmp_path, monkeypatch, meetings):
+    """One summary and one transcript chunk per meeting, on orthogonal axes."""
+    store = NumpyVectorStore(str(tmp_path / "vectors"), dim=8)
+    ids, vectors, documents, metadatas = [], [], [], []
+    for i, meeting_id in enumerate(meetings):
+        for doc_type in ("summary", "transcript"):
+            vector = [0.0] * 8
+            vector[i] = 1.0
+            ids.append(f"{meeting_id}_{doc_type}")
+            vectors.append(vector)
+            documents.append(f"{doc_type} of {meeting_id}")
+            metadatas.append({"meeting_id": meeting_id, "owner_id": "u1", "doc_type": doc_type})
+    store.upsert(ids, vectors, documents, metadatas)
+    monkeypatch.setattr(rag, "_store", store)
+    monkeypatch.setattr(rag, "RAG_MEETING_SUMMARIES", True)
+    return store
+
+
+def test_select_meetings_needs_enough_summaries(tmp_path, monkeypatch):
+    _tagged_store(tmp_path, monkeypatch, ["m0", "m1", "m2"])
+    query = [0.25, 0.0, 1.0, 0, 0, 0, 0, 0]
+
+    monkeypatch.setattr(rag, "MEETING_CANDIDATES", 2)
+    assert rag._select_meetings(query, owner_id="u1") == ["m2", "m0"]
+    assert rag._select_meetings(query, owner_id="someone-else") is None
+
+    monkeypatch.setattr(rag, "MEETING_CANDIDATES", 4)
+    assert rag._select_meetings(query, owner_id="u1") is None
+
+
+def test_chunk_search_never_returns_summaries(tmp_path, monkeypatch):
+    _tagged_store(tmp_path, monkeypatch, ["m0", "m1", "m2"])
+    query = [1.0, 0.5, 0.25, 0, 0, 0, 0, 0]
+
+    results = rag._chunk_search(query, 3, owner_id="u1")
+    assert [r["metadata"]["meeting_id"] for r in results] == ["m0", "m1", "m2"]
+    assert {r["metadata"]["doc_type"] for r in results} == {"transcript"}
+    assert [r["id"] for r in rag._chunk_search(query, 2, ["m1", "m2"], "u1")] == ["m1_transcript", "m2_transcript"]
+
+
+def test_reindexing_deletes_chunks_but_never_loads_facts(tmp_path, monkeypatch):
+    store = _tagged_store(tmp_path, monkeypatch, ["m0", "m1"])
+    fact = {"meeting_id": "m0", "owner_id": "u1", "doc_type": "decision"}
+    store.upsert(["m0_decision"], [[0.0] * 7 + [1.0]], ["Decision: ship"], [fact])
+    loaded = []
+    get = store.get
+
+    def recording_get(**kwargs):
+        found = get(**kwargs)
+        loaded.extend(found)
+        return found
+
+    monkeypatch.setattr(store, "get", recording_get)
+
+    rag._delete_chunks_for_meetings(["m0"], store=store)
+    assert sorted(c["id"] for c in loaded) == ["m0_summary", "m0_transcript"]
+    assert sorted(c["id"] for c in get()) == ["m0_decision", "m1_summary", "m1_transcript"]
+
+
+def test_every_path_indexes_all_of_a_meetings_transcripts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/transcripts.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    meeting = Meeting(title="Planning")
+    db.add(meeting)
+    db.commit()
+    start = datetime(2024, 5, 1, 9)
+    for minutes, content in ((10, "Bob: part two."), (0, "Alice: part one."), (20, "  ")):
+        db.add(Transcript(meeting_id=meeting.id, content=content, created_at=start + timedelta(minutes=minutes)))
+    db.commit()
+
+    transcript = rag.load_meeting_transcript(db, meeting.id)
+    assert transcript["text"] == "Alice: part one.\n\nBob: part two."
+    [[bulk]] = list(rag._iter_transcript_pages(db))
+    assert (bulk["text"], bulk["transcript_id"]) == (transcript["text"], transcript["transcript_id"])
+    assert rag.load_meeting_transcript(db, "missing") is None
+
+
+class _FakeEncoder:
+    """Bag-of-words vectors, so the test needs no model download."""
+
+    tokenizer = None
+
+    def encode(self, texts, **kwargs):
+        vectors = np.zeros((len(texts), 384), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i, sum(map(ord, word)) % 384] += 1.0
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def _rebuild_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag, "RAG_PERSIST", True)
+    monkeypatch.setattr(rag, "RAG_VECTOR_STORE", "numpy")
+    monkeypatch.setattr(rag, "CHROMA_PERSIST_DIR", str(tmp_path))
+    monkeypatch.setattr(rag, "RAG_NUMPY_STORE_DIR", str(tmp_path / "numpy_store"))
+    monkeypatch.setattr(rag, "RAG_ACTIVE_COLLECTION_PATH", str(tmp_path / "active_collection.json"))
+    monkeypatch.setattr(rag, "RAG_LEXICAL_INDEX_PATH", str(tmp_path / "lexical_index.sqlite3"))
+    monkeypatch.setattr(rag, "_embedding_client", None)
+    monkeypatch.setattr(rag, "RAG_EMBEDDING_CACHE", False)
+    monkeypatch.setitem(embedding_model._models, rag._active_model, _FakeEncoder())
+    monkeypatch.setitem(embedding_model._models, rag.EMBEDDING_MODEL_NAME, _FakeEncoder())
+    store = rag._open_store(rag.DEFAULT_COLLECTION, rag._active_model)
+    for name, value in {
+        "_store": store,
+        "_lexical_index": None,
+        "_active_collection": rag.DEFAULT_COLLECTION,
+        "_active_mtime": None,
+    }.items():
+        monkeypatch.setattr(rag, name, value)
+
+    engine = create_engine(f"sqlite:///{tmp_path}/rag.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for title in ("Planning", "Retro"):
+        meeting = Meeting(title=title)
+        db.add(meeting)
+        db.commit()
+        db.add(Transcript(meeting_id=meeting.id, content=f"Alice: the {title.lower()} notes.\nBob: agreed."))
+    db.commit()
+    return db
+
+
+def test_rebuild_swaps_and_other_workers_follow(tmp_path, monkeypatch):
+    db = _rebuild_session(tmp_path, monkeypatch)
+    old_store = rag._store
+    write_pointer = rag._write_active_collection
+
+    def write_during_swap(state):
+        # Another worker indexes a new meeting into the old collection after
+        # the last catch-up: its watermark must not survive the swap
+        meeting = Meeting(title="Late")
+        db.add(meeting)
+        db.commit()
+        db.add(Transcript(meeting_id=meeting.id, content="Carol: late notes."))
+        db.commit()
+        rag.mark_indexed(db, meeting.id, "Carol: late notes.", 1)
+        write_during_swap.late = meeting.id
+        write_pointer(state)
+
+    monkeypatch.setattr(rag, "_write_active_collection", write_during_swap)
+    result = rag.rebuild_index(db, chunker="turns")
+
+    assert result["status"] == "success", result
+    assert (result["indexed_meetings"], result["missed_meetings"]) == (2, 1)
+    assert rag._active_collection == result["collection"] != rag.DEFAULT_COLLECTION
+    assert rag._store is not old_store and rag._store.count() >= 2
+    watermarks = {s.meeting_id for s in db.query(RagIndexState).all()}
+    assert len(watermarks) == 2 and write_during_swap.late not in watermarks
+    summaries = rag._store.get(where={"doc_type": "summary"})
+    assert sorted(d["id"] for d in summaries) == sorted(f"meeting-{m}-summary" for m in watermarks)
+
+    # A worker still on the old collection follows the pointer on its next call
+    new_collection, new_count = rag._active_collection, rag._store.count()
+    monkeypatch.setattr(rag, "_store", old_store)
+    monkeypatch.setattr(rag, "_active_collection", rag.DEFAULT_COLLECTION)
+    monkeypatch.setattr(rag, "_active_mtime", None)
+    rag._sync_active_collection()
+    assert rag._active_collection == new_collection
+    assert rag._store.count() == new_count
+
+
+def test_rebuild_catches_up_facts_extracted_meanwhile(tmp_path, monkeypatch):
+    db = _rebuild_session(tmp_path, monkeypatch)
+    meeting = db.query(Meeting).filter(Meeting.title == "Planning").one()
+
+    def extract_during_build(progress):
+        if not extract_during_build.done:
+            # An extraction finishes after the meeting went into the shadow collection
+            extract_during_build.done = True
+            db.add(Decision(meeting_id=meeting.id, summary="Ship the beta on Friday"))
+            db.commit()
+            rag.index_meeting_facts(db, meeting.id)
+
+    extract_during_build.done = False
+    result = rag.rebuild_index(db, chunker="turns", progress_callback=extract_during_build)
+
+    assert result["status"] == "success", result
+    assert extract_during_build.done and result["caught_up_meetings"] >= 1
+    facts = rag._store.get(where={"meeting_id": meeting.id, "doc_type": "decision"})
+    assert [f["document"] for f in facts] == ["Decision: Ship the beta on Friday"]
+
+
+def test_health_check_probes_ollama_on_the_pooled_client(monkeypatch):
+    probed = []
+    monkeypatch.setattr(llm_client, "ollama_reachable_sync", lambda url, timeout: probed.append(url) or True)
+    assert rag.health_check()["ollama"] is True
+    assert probed == [rag.OLLAMA_URL]
+
+    monkeypatch.undo()
+    assert llm_client.ollama_reachable_sync("http://127.0.0.1:9", timeout=1) is False
+
+
+def test_meetings_without_chunks_are_not_rechunked(tmp_path, monkeypatch):
+    db = _rebuild_session(tmp_path, monkeypatch)
+    retro = db.query(Meeting).filter(Meeting.title == "Retro").one()
+    chunk_transcript = rag._chunk_transcript
+    chunked = []
+
+    def no_chunks_for_retro(text, *args):
+        chunked.append(text)
+        return [] if "retro" in text else chunk_transcript(text, *args)
+
+    monkeypatch.setattr(rag, "_chunk_transcript", no_chunks_for_retro)
+    first = rag.index_all_transcripts(db, chunker="turns")
+    assert (first["indexed_meetings"], len(chunked)) == (2, 2)
+    assert db.get(RagIndexState, retro.id).chunk_count == 0
+
+    second = rag.index_all_transcripts(db, chunker="turns")
+    assert (second["unchanged_meetings"], len(chunked)) == (2, 2)
+
+
+def _wait_for_index():
+    for _ in range(100):
+        if not rag.get_index_progress()["running"]:
+            return rag.get_index_progress()
+        threading.Event().wait(0.05)
+    raise AssertionError("background index still running")
+
+
+def test_index_all_runs_in_the_background_one_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/app.db")  # if session isn't imported yet
+    from app.db import session as db_session
+
+    release, calls = threading.Event(), []
+
+    def slow_index(db, **kwargs):
+        calls.append(kwargs["owner_id"])
+        release.wait(5)
+        return {"status": "success", "indexed_meetings": 3}
+
+    monkeypatch.setattr(rag, "index_all_transcripts", slow_index)
+    monkeypatch.setattr(db_session, "SessionLocal", sessionmaker(bind=create_engine(f"sqlite:///{tmp_path}/app.db")))
+
+    assert rag.start_background_index(owner_id="u1") is True
+    assert rag.get_index_progress()["running"] is True
+    assert rag.start_background_index(owner_id="u2") is False
+
+    release.set()
+    progress = _wait_for_index()
+    assert (progress["owner_id"], calls) == ("u1", ["u1"])
+    assert progress["result"]["indexed_meetings"] == 3
+
+    assert rag.start_background_index(owner_id="u2") is True
+    assert _wait_for_index()["owner_id"] == "u2"
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.action_item import ActionItem
+from app.db.models.meeting import Meeting
+from app.db.models.user import User
+from app.services.structured_query import classify, route_question, window_bounds
+
+
+def test_status_questions_are_routed():
+    assert classify("What's overdue?")["intent"] == "overdue_items"
+    assert classify("what is assigned to Priya?") == {
+        "intent": "person_items",
+        "entity": None,
+        "state": None,
+        "person": "priya",
+        "window": None,
+    }
+    count = classify("How many decisions were made last week?")
+    assert (count["intent"], count["entity"], count["window"]) == ("count", "decisions", "last week")
+    assert classify("how many overdue tasks")["state"] == "overdue"
+
+
+def test_open_ended_questions_fall_through_to_rag():
+    assert classify("What did we decide about pricing?") is None
+    assert classify("Why is the launch overdue?") is None
+    assert classify("") is None
+
+
+def test_window_bounds():
+    saturday = datetime(2024, 3, 16, 15, 30)
+    assert window_bounds("last week", saturday) == (datetime(2024, 3, 4), datetime(2024, 3, 11))
+    assert window_bounds("last month", saturday) == (datetime(2024, 2, 1), datetime(2024, 3, 1))
+    assert window_bounds("past 2 days", saturday) == (datetime(2024, 3, 14, 15, 30), None)
+
+
+def test_route_question_answers_from_the_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/sq.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    me = User(name="Sam Lee", email="sam@example.com")
+    boss = User(name="Priya Shah", email="priya@example.com")
+    db.add_all([me, boss])
+    db.commit()
+    mine = Meeting(title="My sync", owner_id=me.id)
+    theirs = Meeting(title="Priya's planning", owner_id=boss.id)
+    db.add_all([mine, theirs])
+    db.commit()
+    db.add_all([
+        ActionItem(meeting_id=theirs.id, owner_id=me.id, description="Draft the launch plan", status="open"),
+        ActionItem(meeting_id=mine.id, owner_id=boss.id, description="Review the budget", status="open"),
+        ActionItem(meeting_id=mine.id, owner_id=me.id, description="Book a room", status="done"),
+    ])
+    db.commit()
+
+    # Assigned in a meeting someone else owns: still mine
+    result = route_question(db, "What is assigned to me?", owner_id=me.id)
+    assert "Draft the launch plan" in result["answer"]
+    assert "Book a room" not in result["answer"]
+
+    result = route_question(db, "what is assigned to Priya?", owner_id=me.id)
+    assert result["answer"].startswith("1 open action item for Priya Shah")
+
+    assert route_question(db, "how many action items", owner_id=me.id)["answer"] == (
+        "2 action items, across 1 meeting."
+    )
+    assert route_question(db, "what is assigned to Nobody?", owner_id=me.id) is None
+    assert route_question(db, "What did we decide about pricing?", owner_id=me.id) is None
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from app.services.vector_store import NumpyVectorStore, VectorStore
+
+
+def _vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_exact_top_k_matches_brute_force(tmp_path, dtype):
+    store = NumpyVectorStore(str(tmp_path / "store"), dim=8, dtype=dtype)
+    vectors = _vectors(50)
+    store.upsert(
+        ids=[f"c{i}" for i in range(50)],
+        embeddings=vectors.tolist(),
+        documents=[f"doc {i}" for i in range(50)],
+        metadatas=[{"meeting_id": str(i % 5)} for i in range(50)],
+    )
+
+    query = vectors[7] + 0.01
+    hits = store.query(query.tolist(), top_k=3)
+    assert hits[0]["id"] == "c7"
+    assert hits[0]["distance"] == pytest.approx(0.0, abs=0.02)
+
+    filtered = store.query(query.tolist(), top_k=20, where={"meeting_id": "1"})
+    assert {h["metadata"]["meeting_id"] for h in filtered} == {"1"}
+    assert len(filtered) == 10
+
+
+def test_partitions_upsert_delete_and_reopen(tmp_path):
+    directory = str(tmp_path / "store")
+    store = NumpyVectorStore(directory, dim=8)
+    vectors = _vectors(4)
+    store.upsert(
+        ids=["a", "b", "c", "d"],
+        embeddings=vectors.tolist(),
+        documents=["a", "b", "c", "d"],
+        metadatas=[
+            {"meeting_id": "m1", "owner_id": "u1"},
+            {"meeting_id": "m1", "owner_id": "u1"},
+            {"meeting_id": "m2", "owner_id": "u2"},
+            {"meeting_id": "m3"},
+        ],
+    )
+
+    hits = store.query(vectors[2].tolist(), top_k=4, where={"owner_id": "u1"})
+    assert {h["id"] for h in hits} == {"a", "b"}
+
+    assert store.delete(where={"meeting_id": ["m1"]}) == 2
+    assert store.count() == 2
+
+    reopened = NumpyVectorStore(directory, dim=8)
+    assert [h["id"] for h in reopened.query(vectors[3].tolist(), top_k=1)] == ["d"]
+    [chunk] = reopened.get(ids=["c"], include_embeddings=True)
+    assert np.dot(chunk["embedding"], vectors[2] / np.linalg.norm(vectors[2])) == pytest.approx(1.0, abs=1e-2)
+
+
+def test_backends_must_implement_the_whole_interface(tmp_path):
+    class NoDestroy(VectorStore):
+        count = upsert = get = delete = query = reset = lambda self, *args, **kwargs: None
+
+    with pytest.raises(TypeError, match="destroy"):
+        NoDestroy()
+    with pytest.raises(TypeError):
+        VectorStore()
+    assert isinstance(NumpyVectorStore(str(tmp_path / "store"), dim=8), VectorStore)
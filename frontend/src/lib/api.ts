@@ -42,6 +42,60 @@ export function parseApiError(err: any, fallback = "Something went wrong"): stri
   return fallback;
 }
 
+// Queue an extraction and poll its job until it finishes (POST /extract/ returns 202).
+// Gives up if no worker claims the job within queuedTimeoutMs (e.g. no worker
+// running) or the job doesn't finish within timeoutMs; the job itself keeps going.
+export async function extractTranscript(
+  transcriptId: string,
+  refresh = false,
+  { timeoutMs = 15 * 60_000, queuedTimeoutMs = 2 * 60_000 } = {}
+) {
+  const res = await api.post("/extract/", { transcript_id: transcriptId, refresh });
+  const jobId = res.data.job_id as string;
+  const startedAt = Date.now();
+  let claimed = false;
+
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, 1500));
+    const { data } = await api.get(`/extract/jobs/${jobId}`);
+    if (data.status === "succeeded") return data;
+    if (data.status === "failed" || data.status === "cancelled") {
+      throw new Error(data.error || `Extraction ${data.status}`);
+    }
+
+    claimed = claimed || data.status !== "queued";
+    const waited = Date.now() - startedAt;
+    if (!claimed && waited > queuedTimeoutMs) {
+      throw new Error("Extraction is still queued — is an extraction worker running?");
+    }
+    if (waited > timeoutMs) {
+      throw new Error("Extraction is taking too long; check back later");
+    }
+  }
+}
+
+// Start a background RAG index of the user's meetings (POST /rag/index-all returns 202)
+// and poll its progress until it finishes; resolves with the run's statistics.
+export async function indexAllMeetings({ timeoutMs = 30 * 60_000 } = {}) {
+  const res = await api.post("/rag/index-all");
+  const progressUrl = res.data.progress_url as string;
+  const startedAt = Date.now();
+
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, 2000));
+    const { data } = await api.get(progressUrl);
+    if (!data.running) {
+      if (data.result?.status === "error") {
+        throw new Error(data.result.message || "Indexing failed");
+      }
+      return data.result;
+    }
+    if (Date.now() - startedAt > timeoutMs) {
+      throw new Error("Indexing is taking too long; check back later");
+    }
+  }
+}
+
 export async function login(email: string, password: string) {
   const response = await api.post("/auth/login", { email, password });
   const { access_token } = response.data;
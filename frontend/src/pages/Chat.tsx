@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
-import { api } from "../lib/api";
+import { api, indexAllMeetings } from "../lib/api";
 import Layout from "../components/Layout";
 
 type Message = {
@@ -57,7 +57,7 @@ export default function ChatPage() {
   const handleIndexAll = async () => {
     try {
       setIndexing(true);
-      await api.post("/rag/index-all");
+      await indexAllMeetings();
       await loadStats();
     } catch (err: any) {
       console.error("Failed to index meetings", err);
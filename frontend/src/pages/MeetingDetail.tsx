@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import { api } from "../lib/api";
+import { api, extractTranscript } from "../lib/api";
 import Layout from "../components/Layout";
 import { useToast } from "../context/ToastContext";
 
@@ -169,7 +169,7 @@ export default function MeetingDetailPage() {
       setUploadProgress("Running AI extraction...");
       
       // Auto-run extraction
-      await api.post("/extract/", { transcript_id: res.data.transcript_id });
+      await extractTranscript(res.data.transcript_id);
 
       setShowAudioUpload(false);
       setAudioFile(null);
@@ -291,7 +291,7 @@ export default function MeetingDetailPage() {
         meeting_id: id,
         content: `Live Recording\n\n${finalTranscript}`,
       });
-      await api.post("/extract/", { transcript_id: res.data.transcript_id });
+      await extractTranscript(res.data.transcript_id);
       setLiveTranscript("");
       await fetchAll();
     } catch (err) {
@@ -342,11 +342,11 @@ export default function MeetingDetailPage() {
 
     try {
       setExtracting(true);
-      await api.post("/extract/", { transcript_id: meeting.transcript_id });
+      await extractTranscript(meeting.transcript_id, true);
       await fetchAll();
     } catch (err) {
       console.error(err);
-      toast("Extraction failed — check backend logs", "error");
+      toast(err instanceof Error && err.message ? err.message : "Extraction failed — check backend logs", "error");
     } finally {
       setExtracting(false);
     }
@@ -396,7 +396,7 @@ export default function MeetingDetailPage() {
         meeting_id: id,
         content: transcriptText,
       });
-      await api.post("/extract/", { transcript_id: res.data.transcript_id });
+      await extractTranscript(res.data.transcript_id);
       setShowUploadModal(false);
       setTranscriptText("");
       await fetchAll();